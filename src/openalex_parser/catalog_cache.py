@@ -0,0 +1,92 @@
+"""Versioned binary cache of the reference TSVs for fast catalog startup."""
+from __future__ import annotations
+
+import csv
+import os
+import pickle
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache"
+
+
+def cache_path_for(source: Path) -> Path:
+    """Return the cache file stored next to the reference TSV *source*."""
+
+    return source.with_name(source.name + CACHE_SUFFIX)
+
+
+def _cache_key(source: Path, id_column: str, value_column: str) -> Tuple[object, ...]:
+    stat = source.stat()
+    return (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, id_column, value_column)
+
+
+def iter_reference_pairs(path: Path, id_column: str, value_column: str) -> Iterator[Tuple[str, int]]:
+    """Yield the ``(value, id)`` rows of a reference TSV in file order, without caching or buffering.
+
+    Rows with a missing value or a non-integer ID are skipped.
+    """
+
+    with path.open(encoding="utf-8-sig", newline="") as handle:
+        sample = handle.read(2048)
+        handle.seek(0)
+        delimiter = "\t" if "\t" in sample else ","
+        reader = csv.DictReader(handle, delimiter=delimiter)
+        for row in reader:
+            raw_id = row.get(id_column)
+            raw_value = row.get(value_column)
+            if not raw_id or not raw_value:
+                continue
+            try:
+                identifier = int(raw_id)
+            except ValueError:
+                continue
+            yield raw_value, identifier
+
+
+def _parse_reference(path: Path, id_column: str, value_column: str) -> Tuple[List[str], array]:
+    values: List[str] = []
+    identifiers = array("q")
+    for value, identifier in iter_reference_pairs(path, id_column, value_column):
+        values.append(value)
+        identifiers.append(identifier)
+    return values, identifiers
+
+
+def read_reference_pairs(path: Path, id_column: str, value_column: str) -> Tuple[List[str], array]:
+    """Return the ``(values, ids)`` rows of a reference TSV in file order.
+
+    Rows with a missing value or a non-integer ID are skipped.  The parsed
+    rows are cached in ``<path>.cache``, keyed by the TSV's size and mtime,
+    the requested columns and :data:`CACHE_VERSION`; the TSV stays the source
+    of truth and a stale or unreadable cache is simply rebuilt.
+    """
+
+    key = _cache_key(path, id_column, value_column)
+    cache_path = cache_path_for(path)
+    try:
+        with cache_path.open("rb") as handle:
+            if pickle.load(handle) == key:
+                values = pickle.load(handle)
+                identifiers = array("q")
+                identifiers.frombytes(pickle.load(handle))
+                return values, identifiers
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        pass
+
+    values, identifiers = _parse_reference(path, id_column, value_column)
+    temporary = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with temporary.open("wb") as handle:
+            pickle.dump(key, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(values, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(identifiers.tobytes(), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cache_path)
+    except OSError:  # pragma: no cover - read-only reference directory
+        temporary.unlink(missing_ok=True)
+    return values, identifiers
+
+
+__all__ = ["CACHE_SUFFIX", "CACHE_VERSION", "cache_path_for", "iter_reference_pairs", "read_reference_pairs"]
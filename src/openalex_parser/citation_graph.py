@@ -0,0 +1,157 @@
+"""Compressed sparse row/column export of the ``work_reference`` citation graph."""
+from __future__ import annotations
+
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping
+
+try:
+    import numpy  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+CITATION_SOURCE_TABLE = "work_reference"
+DEFAULT_RUN_SIZE = 16_000_000
+
+
+def ensure_numpy_available() -> None:
+    """Raise early if the optional ``numpy`` package is missing."""
+
+    if numpy is None:
+        raise RuntimeError("The citation graph export requires the optional 'numpy' package.")
+
+
+class CitationGraphBuilder:
+    """Collect (citing, cited) pairs from ``work_reference`` rows and build CSR/CSC files.
+
+    Pairs are held in compact ``array('q')`` buffers and spilled to disk as
+    sorted runs of at most *run_size* pairs, so peak memory is bounded by one
+    run plus a few arrays with one entry per distinct work.  :meth:`close`
+    writes to *output_dir*:
+
+    - ``work_ids.npy``: sorted OpenAlex work IDs; dense index ``i`` is ``work_ids[i]``.
+    - ``csr_offsets.npy`` / ``csr_neighbors.npy``: works cited by each citing work.
+    - ``csc_offsets.npy`` / ``csc_neighbors.npy``: works citing each cited work.
+
+    Neighbour arrays hold int64 dense indices; the neighbours of node ``i``
+    are ``neighbors[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, output_dir: Path, *, run_size: int = DEFAULT_RUN_SIZE) -> None:
+        ensure_numpy_available()
+        self.output_dir = output_dir
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._run_dir = self.output_dir / "_runs"
+        self._run_dir.mkdir(parents=True, exist_ok=True)
+        self._run_size = max(run_size, 1)
+        self._citing = array("q")
+        self._cited = array("q")
+        self._runs: List[Path] = []
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        if table_name != CITATION_SOURCE_TABLE:
+            return
+        citing = row.get("work_id")
+        cited = row.get("cited_work_id")
+        if citing is None or cited is None:
+            return
+        self._citing.append(citing)
+        self._cited.append(cited)
+        if len(self._citing) >= self._run_size:
+            self._spill()
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        """Runs are spilled by size, not at input boundaries; nothing to do."""
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._spill()
+        self._build()
+        shutil.rmtree(self._run_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    def _spill(self) -> None:
+        if not self._citing:
+            return
+        pairs = numpy.empty((2, len(self._citing)), dtype=numpy.int64)
+        pairs[0] = numpy.frombuffer(self._citing, dtype=numpy.int64)
+        pairs[1] = numpy.frombuffer(self._cited, dtype=numpy.int64)
+        order = numpy.lexsort((pairs[1], pairs[0]))
+        path = self._run_dir / f"run_{len(self._runs):05d}.npy"
+        numpy.save(path, pairs[:, order])
+        self._runs.append(path)
+        self._citing = array("q")
+        self._cited = array("q")
+
+    def _load_runs(self):
+        for path in self._runs:
+            yield numpy.load(path, mmap_mode="r")
+
+    def _build(self) -> None:
+        work_ids = numpy.empty(0, dtype=numpy.int64)
+        edge_count = 0
+        for run in self._load_runs():
+            work_ids = numpy.union1d(work_ids, numpy.unique(numpy.asarray(run)))
+            edge_count += run.shape[1]
+        numpy.save(self.output_dir / "work_ids.npy", work_ids)
+
+        node_count = len(work_ids)
+        out_degree = numpy.zeros(node_count, dtype=numpy.int64)
+        in_degree = numpy.zeros(node_count, dtype=numpy.int64)
+        for run in self._load_runs():
+            out_degree += numpy.bincount(numpy.searchsorted(work_ids, run[0]), minlength=node_count)
+            in_degree += numpy.bincount(numpy.searchsorted(work_ids, run[1]), minlength=node_count)
+
+        self._write_adjacency("csr", work_ids, out_degree, edge_count, source_row=0)
+        self._write_adjacency("csc", work_ids, in_degree, edge_count, source_row=1)
+        print(f"Wrote citation graph with {node_count:,} works and {edge_count:,} citations to {self.output_dir}")
+
+    def _write_adjacency(
+        self,
+        prefix: str,
+        work_ids,
+        degree,
+        edge_count: int,
+        *,
+        source_row: int,
+    ) -> None:
+        offsets = numpy.zeros(len(work_ids) + 1, dtype=numpy.int64)
+        numpy.cumsum(degree, out=offsets[1:])
+        numpy.save(self.output_dir / f"{prefix}_offsets.npy", offsets)
+        if not edge_count:
+            numpy.save(self.output_dir / f"{prefix}_neighbors.npy", numpy.empty(0, dtype=numpy.int64))
+            return
+
+        neighbors = numpy.lib.format.open_memmap(
+            self.output_dir / f"{prefix}_neighbors.npy",
+            mode="w+",
+            dtype=numpy.int64,
+            shape=(edge_count,),
+        )
+        cursor = offsets[:-1].copy()
+        for run in self._load_runs():
+            sources = numpy.searchsorted(work_ids, run[source_row])
+            targets = numpy.searchsorted(work_ids, run[1 - source_row])
+            if source_row:
+                # Runs are spilled sorted by citing work; re-sort for the reverse direction.
+                order = numpy.lexsort((targets, sources))
+                sources = sources[order]
+                targets = targets[order]
+            unique_sources, first_index, counts = numpy.unique(sources, return_index=True, return_counts=True)
+            rank = numpy.arange(len(sources), dtype=numpy.int64) - numpy.repeat(first_index, counts)
+            neighbors[cursor[sources] + rank] = targets
+            cursor[unique_sources] += counts
+        neighbors.flush()
+        del neighbors
+
+
+__all__ = ["CitationGraphBuilder", "ensure_numpy_available"]
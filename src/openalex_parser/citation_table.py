@@ -0,0 +1,225 @@
+"""In-process builder for the CWTS ``citation`` table."""
+from __future__ import annotations
+
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from .citation_graph import ensure_numpy_available, numpy
+
+CITATION_TABLE = "citation"
+DEFAULT_CHUNK_SIZE = 1_000_000
+_AUTHOR_KEY_BITS = 34  # OpenAlex author IDs are well below 2**34
+_SPILL_ITEMS = 1 << 20
+
+
+class _Int64Spill:
+    """Append-only file of int64 values buffered through an ``array('q')``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle = path.open("wb")
+        self._buffer = array("q")
+        self.count = 0
+
+    def extend(self, *values: int) -> None:
+        self._buffer.extend(values)
+        if len(self._buffer) >= _SPILL_ITEMS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._buffer.tofile(self._handle)
+            self.count += len(self._buffer)
+            self._buffer = array("q")
+
+    def close(self):
+        """Flush, close and return the values as a read-only memory map."""
+
+        self.flush()
+        self._handle.close()
+        if not self.count:
+            return numpy.empty(0, dtype=numpy.int64)
+        return numpy.memmap(self.path, dtype=numpy.int64, mode="r")
+
+
+class CitationTableBuilder:
+    """Compute ``citation`` rows in-process from ``work``, ``work_author`` and ``work_reference``.
+
+    During the parse it keeps a compact ``work_id -> pub_year`` index, spills
+    author IDs grouped by work, and spills (citing, seq, cited) reference
+    triples.  :meth:`close` then streams the references in chunks and writes
+    one row per reference to *sink* (or only counts self-citations when
+    *sink* is ``None``):
+
+    - ``pub_year``: publication year of the citing work;
+    - ``cit_window``: citing minus cited publication year;
+    - ``is_self_cit``: whether the citing and cited works share an author.
+
+    ``cit_window`` and ``is_self_cit`` stay NULL when the cited work was not
+    part of the run, so the table is only complete when all works are parsed.
+    ``work_author`` rows of one work must arrive together, as
+    :class:`~openalex_parser.transformers.work.WorkTransformer` emits them.
+    Per-work self-citation counts are kept in :attr:`self_citations` after
+    :meth:`close`.
+    """
+
+    def __init__(self, sink: Optional[Any], work_dir: Path, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        ensure_numpy_available()
+        self._sink = sink
+        self._work_dir = work_dir
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+        self._chunk_size = max(chunk_size, 1)
+        self._work_ids = array("q")
+        self._pub_years = array("h")
+        self._group_work_ids = array("q")
+        self._group_offsets = array("q")
+        self._group_counts = array("q")
+        self._authors = _Int64Spill(self._work_dir / "authors.bin")
+        self._author_total = 0
+        self._references = _Int64Spill(self._work_dir / "references.bin")
+        self._closed = False
+        self.self_citations: Optional[Mapping[str, Any]] = None
+
+    # ------------------------------------------------------------------
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        if table_name == "work_reference":
+            cited = row.get("cited_work_id")
+            self._references.extend(row["work_id"], row["reference_seq"], -1 if cited is None else cited)
+        elif table_name == "work_author":
+            author_id = row.get("author_id")
+            if author_id is None:
+                return
+            work_id = row["work_id"]
+            if not self._group_work_ids or self._group_work_ids[-1] != work_id:
+                self._group_work_ids.append(work_id)
+                self._group_offsets.append(self._author_total)
+                self._group_counts.append(0)
+            self._group_counts[-1] += 1
+            self._authors.extend(author_id)
+            self._author_total += 1
+        elif table_name == "work":
+            pub_year = row.get("pub_year")
+            self._work_ids.append(row["work_id"])
+            self._pub_years.append(-1 if pub_year is None else int(pub_year))
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        """Spills are flushed by size; nothing to do at input boundaries."""
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._build()
+        finally:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    def _build(self) -> None:
+        authors = self._authors.close()
+        references = self._references.close().reshape(-1, 3)
+
+        work_ids = numpy.frombuffer(self._work_ids, dtype=numpy.int64)
+        order = numpy.argsort(work_ids, kind="stable")
+        work_ids = work_ids[order]
+        pub_years = numpy.frombuffer(self._pub_years, dtype=numpy.int16)[order]
+
+        group_ids = numpy.frombuffer(self._group_work_ids, dtype=numpy.int64)
+        order = numpy.argsort(group_ids, kind="stable")
+        group_ids = group_ids[order]
+        group_offsets = numpy.frombuffer(self._group_offsets, dtype=numpy.int64)[order]
+        group_counts = numpy.frombuffer(self._group_counts, dtype=numpy.int64)[order]
+
+        print(f"Building citation table from {len(references):,} references...")
+        self_cited_ids = []
+        for start in range(0, len(references), self._chunk_size):
+            chunk = numpy.asarray(references[start : start + self._chunk_size])
+            citing, seq, cited = chunk[:, 0], chunk[:, 1], chunk[:, 2]
+
+            citing_year = self._lookup(work_ids, pub_years, citing)
+            cited_year = self._lookup(work_ids, pub_years, cited)
+            known = (citing_year >= 0) & (cited_year >= 0)
+            cited_known = cited_year >= 0
+            window = numpy.where(known, citing_year.astype(numpy.int64) - cited_year, 0)
+
+            self_cit = self._self_citations(group_ids, group_offsets, group_counts, authors, citing, cited)
+            self_cited_ids.append(cited[self_cit & cited_known])
+            if self._sink is None:
+                continue
+
+            for citing_id, ref_seq, cited_id, year, has_cited, has_window, win, is_self in zip(
+                citing.tolist(),
+                seq.tolist(),
+                cited.tolist(),
+                citing_year.tolist(),
+                cited_known.tolist(),
+                known.tolist(),
+                window.tolist(),
+                self_cit.tolist(),
+            ):
+                self._sink.write_row(
+                    CITATION_TABLE,
+                    {
+                        "citing_work_id": citing_id,
+                        "reference_seq": ref_seq,
+                        "cited_work_id": cited_id if cited_id >= 0 else None,
+                        "pub_year": year if year >= 0 else None,
+                        "cit_window": win if has_window else None,
+                        "is_self_cit": is_self if has_cited else None,
+                    },
+                )
+
+        if self_cited_ids:
+            counted_ids, counts = numpy.unique(numpy.concatenate(self_cited_ids), return_counts=True)
+        else:
+            counted_ids = numpy.empty(0, dtype=numpy.int64)
+            counts = numpy.empty(0, dtype=numpy.int64)
+        self.self_citations = {"work_ids": counted_ids, "counts": counts}
+
+    @staticmethod
+    def _lookup(sorted_ids, values, keys):
+        """Return ``values`` for *keys* found in *sorted_ids*, or -1 where missing."""
+
+        result = numpy.full(len(keys), -1, dtype=numpy.int64)
+        if not len(sorted_ids):
+            return result
+        index = numpy.searchsorted(sorted_ids, keys)
+        index[index >= len(sorted_ids)] = 0
+        found = sorted_ids[index] == keys
+        result[found] = values[index[found]]
+        return result
+
+    def _expand_authors(self, group_ids, group_offsets, group_counts, authors, works):
+        """Return ``(row_index, author_id)`` keys for every author of each work in *works*."""
+
+        if not len(group_ids):
+            return numpy.empty(0, dtype=numpy.int64)
+        index = numpy.searchsorted(group_ids, works)
+        index[index >= len(group_ids)] = 0
+        found = group_ids[index] == works
+        rows = numpy.nonzero(found)[0]
+        offsets = group_offsets[index[found]]
+        counts = group_counts[index[found]]
+        total = int(counts.sum())
+        if not total:
+            return numpy.empty(0, dtype=numpy.int64)
+        starts = numpy.cumsum(counts) - counts
+        positions = numpy.repeat(offsets, counts) + (numpy.arange(total) - numpy.repeat(starts, counts))
+        return numpy.unique((numpy.repeat(rows, counts) << _AUTHOR_KEY_BITS) + numpy.asarray(authors[positions]))
+
+    def _self_citations(self, group_ids, group_offsets, group_counts, authors, citing, cited):
+        citing_keys = self._expand_authors(group_ids, group_offsets, group_counts, authors, citing)
+        cited_keys = self._expand_authors(group_ids, group_offsets, group_counts, authors, cited)
+        shared = numpy.intersect1d(citing_keys, cited_keys, assume_unique=True)
+        result = numpy.zeros(len(citing), dtype=bool)
+        result[shared >> _AUTHOR_KEY_BITS] = True
+        return result
+
+
+__all__ = ["CITATION_TABLE", "CitationTableBuilder"]
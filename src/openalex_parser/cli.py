@@ -4,17 +4,34 @@ from __future__ import annotations
 import argparse
 import csv
 import gzip
+import shutil
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Mapping, Optional
 
+from .citation_graph import DEFAULT_RUN_SIZE, CitationGraphBuilder, ensure_numpy_available
+from .citation_table import CITATION_TABLE, CitationTableBuilder
+from .collect_cache import CollectCache, fingerprint_ids
+from .compression import COMPRESSION_CHOICES, ensure_compression_available
 from .csv_writer import CsvWriterManager
-from .emitter import TableEmitter
-from .identifiers import StableIdGenerator
+from .emitter import TableEmitter, WriterFanout
+from .identifiers import DEFAULT_HASH_KEY, HashedNamespaceIds, StableIdGenerator, find_hashed_collisions
 from .id_catalog import IdCatalog, NamespaceConfig
 from .json_iter import ProgressReporter, SnapshotReader
+from .load_bundle import DEFAULT_LOAD_SESSIONS, write_load_bundle
+from .npy_writer import NpyWriterManager
+from .parquet_writer import (
+    DEFAULT_ROW_GROUP_SIZE,
+    PARQUET_COMPRESSION_CHOICES,
+    ParquetWriterManager,
+    ensure_parquet_available,
+)
+from .pgcopy_writer import PgCopyWriterManager
+from .postgres_loader import DEFAULT_DEDICATED_TABLES, PostgresWriterManager, ensure_postgres_available
 from .reference import EnumerationConfig, EnumerationRegistry
-from .schema import load_schema
+from .schema import TableDefinition, load_schema
+from .sqlite_writer import SqliteWriterManager
 from .utils import canonical_openalex_id
+from .work_detail import WORK_DETAIL_TABLE, WorkDetailBuilder
 from .transformers import (
     AuthorTransformer,
     ConceptTransformer,
@@ -62,6 +79,20 @@ TRANSFORMER_FACTORIES: Mapping[str, Callable[[TableEmitter, EnumerationRegistry,
     "sources": lambda emitter, enums, ids: SourceTransformer(emitter, enums, ids),
 }
 
+OUTPUT_FORMATS = ("csv", "pgcopy", "postgres", "sqlite", "parquet")
+
+# Tables that are derived downstream in SQL unless explicitly requested.
+DEFAULT_SKIP_TABLES = (WORK_DETAIL_TABLE,)
+WORK_ABSTRACT_TABLE = "work_abstract"
+# Tables that contribute no enumeration or namespace values, so the collect pass never builds them.
+COLLECT_SKIP_TABLES = (*DEFAULT_SKIP_TABLES, WORK_ABSTRACT_TABLE)
+# Tables each side output reads or writes; they must stay selected when --tables/--exclude-tables is used.
+SIDE_OUTPUT_TABLES: Mapping[str, tuple[str, ...]] = {
+    "citation_graph": ("work_reference",),
+    "citation_table": (CITATION_TABLE, "work", "work_author", "work_reference"),
+    "work_detail": (WORK_DETAIL_TABLE, "work", "work_author", "work_reference"),
+}
+
 DEDUPE_KEYS: Mapping[str, tuple[str, ...]] = {
     "country": ("country_iso_alpha2_code",),
     "city": ("geonames_city_id",),
@@ -126,6 +157,13 @@ ENUMERATION_CONFIGS: List[EnumerationConfig] = [
     EnumerationConfig("source_type", "source_type_id", "source_type", bits=6, reference_filename="source_type.csv"),
 ]
 
+# Namespaces each entity's transformer needs; catalogs are only required (and loaded) for these.
+ENTITY_NAMESPACES: Mapping[str, tuple[str, ...]] = {"works": WorkTransformer.NAMESPACES}
+
+HASHED_COLLISIONS_FILENAME = "hashed_id_collisions.tsv"
+# Widest non-negative hashed ID each integer column type can hold.
+HASHED_ID_BITS: Mapping[str, int] = {"int2": 15, "int4": 31, "int8": 63}
+
 NAMESPACE_CONFIGS: List[NamespaceConfig] = [
     NamespaceConfig("keyword", "keyword_ids.csv", "keyword_id", "keyword"),
     NamespaceConfig(
@@ -133,8 +171,15 @@ NAMESPACE_CONFIGS: List[NamespaceConfig] = [
         "raw_affiliation_string_ids.csv",
         "raw_affiliation_string_id",
         "raw_affiliation_string",
+        indexed=True,
+    ),
+    NamespaceConfig(
+        "raw_author_name",
+        "raw_author_name_ids.csv",
+        "raw_author_name_id",
+        "raw_author_name",
+        indexed=True,
     ),
-    NamespaceConfig("raw_author_name", "raw_author_name_ids.csv", "raw_author_name_id", "raw_author_name"),
 ]
 
 
@@ -203,6 +248,138 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         default=None,
         help="Maximum gzip part files per entity (default: unlimited)",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Output backend: delimited text, PostgreSQL binary COPY files, a live PostgreSQL load, "
+        "a SQLite database, or Parquet files (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--npy-table",
+        dest="npy_tables",
+        action="append",
+        help="Also dump the integer/float columns of this table as <output-dir>/npy/<table>/<column>.npy "
+        "(repeatable, e.g. work_reference)",
+    )
+    parser.add_argument(
+        "--citation-graph",
+        action="store_true",
+        help="Also build CSR/CSC citation adjacency arrays from work_reference under <output-dir>/citation_graph "
+        "(requires numpy)",
+    )
+    parser.add_argument(
+        "--citation-graph-run-size",
+        type=int,
+        default=DEFAULT_RUN_SIZE,
+        help="Citation pairs held in memory before a sorted run is spilled to disk (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--citation-table",
+        action="store_true",
+        help="Build the citation table (pub_year, cit_window, is_self_cit) in-process after the parse "
+        "instead of in SQL; needs work, work_author and work_reference in the same run (requires numpy)",
+    )
+    parser.add_argument(
+        "--work-detail",
+        action="store_true",
+        help="Emit the work_detail table during the parse; n_self_cits is filled in by a post-pass over "
+        "self-citation counts (requires numpy)",
+    )
+    parser.add_argument(
+        "--append-catalog",
+        action="store_true",
+        help="Treat the reference catalog as append-only: existing values keep their IDs, new values get the "
+        "next free ID, and values first seen during the parse are appended to the TSVs instead of failing",
+    )
+    parser.add_argument(
+        "--collect-cache",
+        type=Path,
+        help="Directory memoising the values each snapshot part file contributed to the collect pass; "
+        "later collect passes only scan new or changed part files",
+    )
+    parser.add_argument(
+        "--hashed-namespaces",
+        action="store_true",
+        help="Derive keyword, raw_affiliation_string and raw_author_name IDs from a keyed BLAKE2b hash of the "
+        "value instead of the catalog; values sharing an ID are listed in "
+        f"<output-dir>/{HASHED_COLLISIONS_FILENAME}",
+    )
+    parser.add_argument(
+        "--hash-key",
+        default=DEFAULT_HASH_KEY.decode("ascii"),
+        help="Key for --hashed-namespaces, at most 64 bytes; changing it changes every hashed ID "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--namespace-index",
+        action="store_true",
+        help="Serve raw_affiliation_string and raw_author_name IDs from memory-mapped sorted indexes "
+        "(<file>.idx next to the reference TSVs) instead of in-memory dictionaries",
+    )
+    parser.add_argument(
+        "--load-bundle",
+        action="store_true",
+        help="After a csv/pgcopy run, write psql scripts under <output-dir>/load: DDL without keys or indexes, "
+        "parallel COPY scripts sized by row counts, and post-load key/index scripts",
+    )
+    parser.add_argument(
+        "--load-sessions",
+        type=int,
+        default=DEFAULT_LOAD_SESSIONS,
+        help="Parallel psql sessions the load bundle is split into (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--parquet-row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Rows buffered per table before a Parquet row group is written (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--parquet-compression",
+        choices=PARQUET_COMPRESSION_CHOICES,
+        default="snappy",
+        help="Parquet column chunk compression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        type=Path,
+        default=None,
+        help="Database file for --output-format sqlite (default: <output-dir>/openalex.sqlite)",
+    )
+    parser.add_argument(
+        "--pg-dsn",
+        default="",
+        help="libpq connection string for --output-format postgres (default: PG* environment variables)",
+    )
+    parser.add_argument(
+        "--pg-dedicated-table",
+        dest="pg_dedicated_tables",
+        action="append",
+        help="Table streamed over its own connection (repeatable; default: the large work_* tables)",
+    )
+    parser.add_argument(
+        "--pg-pool-size",
+        type=int,
+        default=4,
+        help="Connections shared by all other tables (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pg-buffer-mb",
+        type=int,
+        default=8,
+        help="Per-table buffer shipped to PostgreSQL in one COPY chunk, in MiB (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pg-create-tables",
+        action="store_true",
+        help="Create missing tables without constraints and build keys/indexes after the load",
+    )
+    parser.add_argument(
+        "--pg-unlogged",
+        action="store_true",
+        help="Create tables as UNLOGGED (faster load, not crash-safe; requires --pg-create-tables)",
+    )
     parser.add_argument(
         "--encoding",
         choices=("utf-8", "utf-16le"),
@@ -215,6 +392,61 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         default="\t",
         help="Single-character delimiter for generated CSV files (default: '\\t')",
     )
+    parser.add_argument(
+        "--output-compression",
+        choices=COMPRESSION_CHOICES,
+        default="none",
+        help="Compress generated CSV files on background threads (zstd needs 'zstandard'; default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=None,
+        help="Compression level passed to gzip/zstd (default: library default)",
+    )
+    parser.add_argument(
+        "--compression-threads",
+        type=int,
+        default=0,
+        help="Extra zstd worker threads per table (default: %(default)s, compress on the table thread only)",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        action="extend",
+        metavar="TABLE",
+        help="Only build and write these schema tables; the transformer steps feeding other tables are not run",
+    )
+    parser.add_argument(
+        "--exclude-tables",
+        nargs="+",
+        action="extend",
+        metavar="TABLE",
+        help="Do not build or write these schema tables",
+    )
+    parser.add_argument(
+        "--drop-columns",
+        nargs="+",
+        action="extend",
+        metavar="TABLE.COLUMN",
+        help="Leave these nullable, unconstrained columns out of the output tables",
+    )
+    parser.add_argument(
+        "--skip-abstracts",
+        action="store_true",
+        help="Do not rebuild abstracts or write the work_abstract table",
+    )
+    parser.add_argument(
+        "--abstract-compression",
+        choices=COMPRESSION_CHOICES,
+        help="Write work_abstract on its own writer thread with this compression, independently of "
+        "--output-compression (csv output only)",
+    )
+    parser.add_argument(
+        "--manifest-checksums",
+        action="store_true",
+        help="Hash every table while it is written and record its SHA-256 in manifest.json (csv output only)",
+    )
     parser.add_argument(
         "--progress-interval",
         type=int,
@@ -289,6 +521,15 @@ class NullEmitter:
     def emit(self, table: str, row: Dict[str, object]) -> None:  # pragma: no cover - trivial
         return
 
+    def wants(self, table: str) -> bool:  # pragma: no cover - trivial
+        return table not in COLLECT_SKIP_TABLES
+
+    def wants_column(self, table: str, column: str) -> bool:  # pragma: no cover - trivial
+        return self.wants(table)
+
+    def checkpoint(self) -> None:  # pragma: no cover - trivial
+        return
+
 
 def process_entities(
     phase: str,
@@ -303,15 +544,42 @@ def process_entities(
     max_files: Optional[int],
     max_records: Optional[int],
     progress_interval: int,
+    on_input_complete: Optional[Callable[[str, Path, int, bool], None]] = None,
+    on_input_start: Optional[Callable[[str, Path], bool]] = None,
 ) -> Dict[str, int]:
+    """Run the transformer of every entity over its part files and return per-entity record counts.
+
+    *on_input_complete* is called with ``(entity, part_file, records,
+    truncated)`` after each part file has been processed; *truncated* is
+    ``True`` when *max_records* stopped the file before its end.  *on_input_start* is called with
+    ``(entity, part_file)`` before a part file is read; when it returns
+    ``True`` the file is skipped.
+    """
+
     overall_counts: Dict[str, int] = {}
     for entity in entities:
         dataset = ENTITY_DATASETS[entity]
         transformer = build_transformer(entity, emitter, enums, ids)
+        if transformer.idle:
+            print(f"Skipping {entity}: none of its tables are selected")
+            overall_counts[entity] = 0
+            continue
         reporter = ProgressReporter(f"{phase}-{entity}", interval=max(progress_interval, 1))
         processed = 0
         skipped_merged = 0
         skip_ids = merged_ids.get(entity, set())
+        file_start = 0
+
+        def file_complete(path: Path, truncated: bool) -> None:
+            nonlocal file_start
+            emitter.checkpoint()
+            if on_input_complete is not None:
+                on_input_complete(entity, path, processed - file_start, truncated)
+            file_start = processed
+
+        def skip_file(path: Path) -> bool:
+            return on_input_start is not None and on_input_start(entity, path)
+
         try:
             for record in reader.iter_entity(
                 dataset,
@@ -319,6 +587,8 @@ def process_entities(
                 max_files=max_files,
                 max_records=max_records,
                 progress=reporter,
+                on_file_complete=file_complete,
+                skip_file=skip_file,
             ):
                 record_id = canonical_openalex_id(record.get("id")) if isinstance(record, dict) else None
                 if record_id and record_id in skip_ids:
@@ -338,6 +608,124 @@ def process_entities(
     return overall_counts
 
 
+def build_writer_manager(args: argparse.Namespace, schema: Mapping[str, TableDefinition], primary=None):
+    if primary is None:
+        primary = _build_primary_writer_manager(args, schema)
+    writers = [primary]
+    if args.npy_tables:
+        writers.append(NpyWriterManager(schema, args.output_dir / "npy", args.npy_tables))
+    if args.citation_graph:
+        writers.append(
+            CitationGraphBuilder(args.output_dir / "citation_graph", run_size=args.citation_graph_run_size)
+        )
+    if args.citation_table or args.work_detail:
+        citations = CitationTableBuilder(
+            primary if args.citation_table else None,
+            args.output_dir / "_citation_table",
+        )
+        writers.append(citations)
+        if args.work_detail:
+            writers[0] = WorkDetailBuilder(primary, args.output_dir / "_work_detail", citations)
+    if len(writers) > 1:
+        return WriterFanout(writers)
+    return writers[0]
+
+
+def _build_primary_writer_manager(args: argparse.Namespace, schema: Mapping[str, TableDefinition]):
+    if args.output_format == "parquet":
+        return ParquetWriterManager(
+            schema,
+            args.output_dir,
+            row_group_size=args.parquet_row_group_size,
+            compression=args.parquet_compression,
+        )
+    if args.output_format == "sqlite":
+        return SqliteWriterManager(schema, args.sqlite_path or args.output_dir / "openalex.sqlite")
+    if args.output_format == "postgres":
+        return PostgresWriterManager(
+            schema,
+            args.pg_dsn,
+            dedicated_tables=args.pg_dedicated_tables or DEFAULT_DEDICATED_TABLES,
+            pool_size=args.pg_pool_size,
+            buffer_size=max(args.pg_buffer_mb, 1) << 20,
+            create_tables=args.pg_create_tables,
+            unlogged=args.pg_unlogged,
+        )
+    if args.output_format == "pgcopy":
+        return PgCopyWriterManager(
+            schema,
+            args.output_dir,
+            compression=args.output_compression,
+            compression_level=args.compression_level,
+            compression_threads=args.compression_threads,
+        )
+    abstract_options: Dict[str, object] = {}
+    if args.abstract_compression is not None:
+        abstract_options = {
+            "table_compression": {WORK_ABSTRACT_TABLE: args.abstract_compression},
+            "threaded_tables": (WORK_ABSTRACT_TABLE,),
+        }
+    return CsvWriterManager(
+        schema,
+        args.output_dir,
+        encoding=args.encoding,
+        delimiter=args.delimiter,
+        compression=args.output_compression,
+        compression_level=args.compression_level,
+        compression_threads=args.compression_threads,
+        checksums=args.manifest_checksums,
+        **abstract_options,
+    )
+
+
+def hashed_id_bits(schema: Mapping[str, TableDefinition], configs: Iterable[NamespaceConfig]) -> Dict[str, int]:
+    """Return the hashed ID width of every namespace in *configs*, from the type of its ID column in *schema*."""
+
+    bits: Dict[str, int] = {}
+    for config in configs:
+        table = schema.get(config.namespace)
+        for column in table.columns if table is not None else ():
+            if column.name == config.id_column and column.data_type in HASHED_ID_BITS:
+                bits[config.namespace] = HASHED_ID_BITS[column.data_type]
+    return bits
+
+
+def select_tables(args: argparse.Namespace, schema: Mapping[str, TableDefinition]) -> set[str]:
+    """Return the schema tables selected by ``--tables`` and ``--exclude-tables``.
+
+    Unknown names and side outputs whose tables are not selected abort the run.
+    """
+
+    requested = list(args.tables or ()) + list(args.exclude_tables or ())
+    unknown = sorted(set(requested).difference(schema))
+    if unknown:
+        raise SystemExit(f"Unknown table for --tables/--exclude-tables: {', '.join(unknown)}")
+    selected = set(args.tables) if args.tables else set(schema)
+    selected.difference_update(args.exclude_tables or ())
+    if not selected:
+        raise SystemExit("--tables/--exclude-tables leave no table to write")
+    for option, tables in SIDE_OUTPUT_TABLES.items():
+        missing = sorted(set(tables).difference(selected))
+        if getattr(args, option) and missing:
+            flag = "--" + option.replace("_", "-")
+            raise SystemExit(f"{flag} needs tables excluded by --tables/--exclude-tables: {', '.join(missing)}")
+    return selected
+
+
+def parse_dropped_columns(specs: Iterable[str], schema: Mapping[str, TableDefinition]) -> Dict[str, set[str]]:
+    """Group ``TABLE.COLUMN`` *specs* of ``--drop-columns`` by table."""
+
+    dropped: Dict[str, set[str]] = {}
+    for spec in specs:
+        table, _, column = spec.partition(".")
+        if not column:
+            raise SystemExit(f"--drop-columns expects TABLE.COLUMN, got {spec!r}")
+        if table not in schema:
+            raise SystemExit(f"Unknown table for --drop-columns: {table}")
+        dropped.setdefault(table, set()).add(column)
+    return dropped
+
+
 def build_transformer(name: str, emitter: TableEmitter, enums: EnumerationRegistry, ids: StableIdGenerator):
     factory = TRANSFORMER_FACTORIES[name]
     return factory(emitter, enums, ids)
@@ -345,10 +733,42 @@ def build_transformer(name: str, emitter: TableEmitter, enums: EnumerationRegist
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
+    ensure_compression_available(args.output_compression)
+    ensure_compression_available(args.abstract_compression)
+    if args.abstract_compression is not None and args.output_format != "csv":
+        raise SystemExit("--abstract-compression requires --output-format csv")
+    if args.manifest_checksums and args.output_format != "csv":
+        raise SystemExit("--manifest-checksums requires --output-format csv")
+    if args.output_format == "postgres":
+        ensure_postgres_available()
+    elif args.output_format == "parquet":
+        ensure_parquet_available()
+    if args.citation_graph or args.citation_table or args.work_detail:
+        ensure_numpy_available()
+    if args.load_bundle and args.output_format not in ("csv", "pgcopy"):
+        raise SystemExit("--load-bundle requires --output-format csv or pgcopy")
+    hash_key = args.hash_key.encode("utf-8")
+    if args.hashed_namespaces and not 0 < len(hash_key) <= 64:
+        raise SystemExit("--hash-key must be 1 to 64 bytes long")
 
     entities = expand_entities(args.entity)
 
     schema = load_schema(args.schema)
+    selected_tables = select_tables(args, schema)
+    unknown_npy_tables = sorted(set(args.npy_tables or ()).difference(schema))
+    if unknown_npy_tables:
+        raise SystemExit(f"Unknown --npy-table: {', '.join(unknown_npy_tables)}")
+    unselected_npy_tables = sorted(set(args.npy_tables or ()).difference(selected_tables))
+    if unselected_npy_tables:
+        raise SystemExit(f"--npy-table names tables that are not selected: {', '.join(unselected_npy_tables)}")
+    dropped_columns = parse_dropped_columns(args.drop_columns or (), schema)
+    output_schema = {name: table for name, table in schema.items() if name in selected_tables}
+    try:
+        for name, columns in dropped_columns.items():
+            if name in output_schema:
+                output_schema[name] = output_schema[name].without_columns(columns)
+    except ValueError as exc:
+        raise SystemExit(f"--drop-columns: {exc}") from exc
     args.output_dir.mkdir(parents=True, exist_ok=True)
     args.reference_dir.mkdir(parents=True, exist_ok=True)
 
@@ -364,8 +784,40 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     updated_dates = args.updated_dates
     progress_interval = args.progress_interval
 
-    catalog = IdCatalog(ENUMERATION_CONFIGS, NAMESPACE_CONFIGS)
-    if catalog.load_existing(args.reference_dir):
+    hashed_ids: Optional[HashedNamespaceIds] = None
+    namespace_configs = NAMESPACE_CONFIGS
+    hashed_run_dir = args.output_dir / "_hashed_id_runs"
+    if args.hashed_namespaces:
+        shutil.rmtree(hashed_run_dir, ignore_errors=True)
+        hashed_ids = HashedNamespaceIds(
+            (config.namespace for config in NAMESPACE_CONFIGS),
+            key=hash_key,
+            bits=hashed_id_bits(schema, NAMESPACE_CONFIGS),
+            run_dir=hashed_run_dir,
+        )
+        namespace_configs = []
+
+    collect_cache: Optional[CollectCache] = None
+    if args.collect_cache is not None:
+        if max_records is not None:
+            print("--max-records truncates part files; not using --collect-cache.")
+        else:
+            collect_cache = CollectCache(
+                args.collect_cache,
+                {entity: fingerprint_ids(merged_ids.get(entity, ())) for entity in entities},
+            )
+
+    catalog = IdCatalog(
+        ENUMERATION_CONFIGS,
+        namespace_configs,
+        use_namespace_index=args.namespace_index,
+        append=args.append_catalog,
+        run_dir=args.output_dir / "_catalog_runs",
+        collect_cache=collect_cache,
+    )
+    required_namespaces = {namespace for entity in entities for namespace in ENTITY_NAMESPACES.get(entity, ())}
+    # Append mode assigns enumeration IDs at parse time, so only missing namespaces need a collect pass.
+    if catalog.load_existing(args.reference_dir, required_namespaces, allow_missing_enums=args.append_catalog):
         print(f"Found existing ID catalog under {args.reference_dir}; skipping collection.")
     else:
         print("Collecting enumeration and auxiliary IDs...")
@@ -386,22 +838,41 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             max_files=max_files,
             max_records=max_records,
             progress_interval=progress_interval,
+            on_input_start=catalog.begin_input,
+            on_input_complete=lambda entity, path, _records, _truncated: catalog.end_input(entity, path),
         )
+        if collect_cache is not None:
+            print(f"Collect cache: reused {collect_cache.hits} part files, scanned {collect_cache.misses}")
         catalog.finalize(args.reference_dir)
         print(f"Wrote ID catalog to {args.reference_dir}")
     print("\nStarting full parse...\n")
     reader = SnapshotReader(args.snapshot)
 
-    writers = CsvWriterManager(
-        schema,
-        args.output_dir,
-        encoding=args.encoding,
-        delimiter=args.delimiter,
+    primary = _build_primary_writer_manager(args, output_schema)
+    writers = build_writer_manager(args, output_schema, primary)
+    skip_tables = set(DEFAULT_SKIP_TABLES)
+    if args.work_detail:
+        skip_tables.discard(WORK_DETAIL_TABLE)
+    if args.skip_abstracts:
+        skip_tables.add(WORK_ABSTRACT_TABLE)
+    skip_tables.update(name for name in schema if name not in selected_tables)
+    emitter = TableEmitter(
+        writers,
+        dedupe_keys=DEDUPE_KEYS,
+        skip_tables=skip_tables,
+        dropped_columns=dropped_columns,
+    )
+    enums = EnumerationRegistry(
+        emitter,
+        args.reference_dir,
+        on_missing=catalog.append_enum if args.append_catalog else None,
     )
-    emitter = TableEmitter(writers, dedupe_keys=DEDUPE_KEYS)
-    enums = EnumerationRegistry(emitter, args.reference_dir)
     register_enumerations(enums)
-    id_generator = StableIdGenerator(assignments=catalog.namespace_assignments)
+    id_generator = StableIdGenerator(
+        assignments=catalog.namespace_assignments,
+        on_missing=catalog.append_namespace if args.append_catalog else None,
+        hashed=hashed_ids,
+    )
 
     overall_counts: Dict[str, int] = {}
 
@@ -418,9 +889,30 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             max_files=max_files,
             max_records=max_records,
             progress_interval=progress_interval,
+            on_input_complete=primary.record_input if isinstance(primary, CsvWriterManager) else None,
         )
     finally:
         writers.close()
+        catalog.close()
+        if hashed_ids is not None:
+            hashed_ids.close()
+    if hashed_ids is not None:
+        collisions_path = args.output_dir / HASHED_COLLISIONS_FILENAME
+        shared = find_hashed_collisions(hashed_run_dir, collisions_path)
+        if shared:
+            print(f"Warning: {shared} hashed IDs are shared by several values (see {collisions_path})")
+
+    if args.load_bundle:
+        bundle_dir = write_load_bundle(
+            args.output_dir,
+            output_schema,
+            primary.outputs,
+            file_format=args.output_format,
+            delimiter=args.delimiter,
+            encoding=args.encoding,
+            sessions=args.load_sessions,
+        )
+        print(f"Wrote load bundle to {bundle_dir}")
 
     print("\nProcessing complete:")
     for entity in entities:
@@ -0,0 +1,75 @@
+"""Per-part-file memo of the values the collect pass extracted."""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".values"
+
+# (enumeration values by table, namespace values by namespace)
+Contribution = Tuple[Dict[str, List[str]], Dict[str, List[str]]]
+
+
+def fingerprint_ids(values: Iterable[str]) -> str:
+    """Return a stable digest of a set of IDs, e.g. the merged IDs skipped for an entity."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for value in sorted(values):
+        digest.update(value.encode("utf-8", "surrogatepass"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class CollectCache:
+    """Store the enumeration and namespace values each snapshot part file contributed.
+
+    Entries live under *directory* as ``<entity>/<updated_date=...>/<part>.values``
+    and are keyed by :data:`CACHE_VERSION`, the part file's size and mtime,
+    the per-entity *fingerprints* (which should change whenever the records
+    skipped for an entity change) and a caller-supplied *scope* describing
+    which values were collected.  A stale or unreadable entry is treated as
+    missing, so the part file is simply scanned again.
+    """
+
+    def __init__(self, directory: Path, fingerprints: Optional[Mapping[str, str]] = None) -> None:
+        self.directory = directory
+        self._fingerprints = dict(fingerprints or {})
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, entity: str, part_file: Path) -> Path:
+        return self.directory / entity / part_file.parent.name / (part_file.name + CACHE_SUFFIX)
+
+    def _key(self, entity: str, part_file: Path, scope: object) -> Tuple[object, ...]:
+        stat = part_file.stat()
+        return (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, self._fingerprints.get(entity), scope)
+
+    def load(self, entity: str, part_file: Path, scope: object) -> Optional[Contribution]:
+        """Return the cached contribution of *part_file*, or ``None`` when it must be scanned."""
+
+        try:
+            with self._entry_path(entity, part_file).open("rb") as handle:
+                if pickle.load(handle) == self._key(entity, part_file, scope):
+                    contribution = pickle.load(handle)
+                    self.hits += 1
+                    return contribution
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            pass
+        self.misses += 1
+        return None
+
+    def store(self, entity: str, part_file: Path, scope: object, contribution: Contribution) -> None:
+        path = self._entry_path(entity, part_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        with temporary.open("wb") as handle:
+            pickle.dump(self._key(entity, part_file, scope), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(contribution, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+
+__all__ = ["CACHE_VERSION", "CollectCache", "Contribution", "fingerprint_ids"]
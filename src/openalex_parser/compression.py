@@ -0,0 +1,203 @@
+"""Compressed output streams that compress on dedicated background threads."""
+from __future__ import annotations
+
+import io
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import zstandard  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSION_CHOICES = ("none", "gzip", "zstd")
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_QUEUE_SIZE = 8
+
+_SENTINEL = None
+
+
+def compression_suffix(compression: Optional[str]) -> str:
+    """Return the filename suffix appended for *compression* (e.g. ``.gz``)."""
+
+    return COMPRESSION_SUFFIXES[compression or "none"]
+
+
+def ensure_compression_available(compression: Optional[str]) -> None:
+    """Raise early if *compression* needs an optional package that is missing."""
+
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd output compression requires the optional 'zstandard' package.")
+
+
+def _make_compressor(compression: str, level: Optional[int], threads: int):
+    if compression == "gzip":
+        # wbits=31 makes zlib emit a gzip container readable by gzip/zcat.
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        ensure_compression_available(compression)
+        return zstandard.ZstdCompressor(level=3 if level is None else level, threads=threads).compressobj()
+    raise ValueError(f"Unsupported output compression: {compression}")
+
+
+class DigestingFileWriter(io.RawIOBase):
+    """Raw binary file sink that feeds every byte written to disk into *digest*."""
+
+    def __init__(self, path: Path, digest: Any) -> None:
+        super().__init__()
+        self.path = path
+        self.digest = digest
+        self._file = path.open("wb", buffering=0)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self.digest.update(data)
+        self._file.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._file.close()
+        finally:
+            super().close()
+
+
+def _open_raw(path: Path, digest: Optional[Any]):
+    if digest is None:
+        return path.open("wb")
+    return DigestingFileWriter(path, digest)
+
+
+class BackgroundCompressedWriter(io.RawIOBase):
+    """Binary sink that hands buffers to a thread which compresses and writes them.
+
+    zlib and zstd release the GIL while compressing large buffers, so each
+    table's compression overlaps with JSON parsing on the main thread.  The
+    bounded queue applies back-pressure when compression falls behind.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: str,
+        *,
+        level: Optional[int] = None,
+        threads: int = 0,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        digest: Optional[Any] = None,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self._compressor = _make_compressor(compression, level, threads)
+        self._file = _open_raw(path, digest)
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max(queue_size, 1))
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=f"compress-{path.name}", daemon=True)
+        self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._raise_pending()
+        size = len(data)
+        if size:
+            self._queue.put(bytes(data))
+        return size
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put(_SENTINEL)
+            self._thread.join()
+        finally:
+            self._file.close()
+            super().close()
+        self._raise_pending()
+
+    def _run(self) -> None:
+        finished = False
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is _SENTINEL:
+                    finished = True
+                    break
+                compressed = self._compressor.compress(chunk)
+                if compressed:
+                    self._file.write(compressed)
+            self._file.write(self._compressor.flush())
+        except BaseException as exc:  # pragma: no cover - surfaced on next write/close
+            self._error = exc
+            # Keep draining so the producer never blocks on a full queue.
+            while not finished:
+                finished = self._queue.get() is _SENTINEL
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+def open_binary_output(
+    path: Path,
+    *,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    threads: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    digest: Optional[Any] = None,
+) -> io.BufferedIOBase:
+    """Open *path* for buffered binary output, compressing on a background thread if requested.
+
+    When *digest* (a ``hashlib`` object) is given it is updated with the bytes
+    as they reach the file, i.e. after compression.
+    """
+
+    if not compression or compression == "none":
+        if digest is None:
+            return path.open("wb", buffering=chunk_size)
+        return io.BufferedWriter(DigestingFileWriter(path, digest), buffer_size=chunk_size)
+    raw = BackgroundCompressedWriter(path, compression, level=level, threads=threads, digest=digest)
+    return io.BufferedWriter(raw, buffer_size=chunk_size)
+
+
+def open_text_output(
+    path: Path,
+    *,
+    encoding: str,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    threads: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    digest: Optional[Any] = None,
+) -> io.TextIOBase:
+    """Open *path* for text output, compressing on a background thread if requested."""
+
+    if (not compression or compression == "none") and digest is None:
+        return path.open("w", newline="\n", encoding=encoding)
+    buffered = open_binary_output(
+        path, compression=compression, level=level, threads=threads, chunk_size=chunk_size, digest=digest
+    )
+    return io.TextIOWrapper(buffered, encoding=encoding, newline="\n")
+
+
+__all__ = [
+    "BackgroundCompressedWriter",
+    "COMPRESSION_CHOICES",
+    "COMPRESSION_SUFFIXES",
+    "DigestingFileWriter",
+    "compression_suffix",
+    "ensure_compression_available",
+    "open_binary_output",
+    "open_text_output",
+]
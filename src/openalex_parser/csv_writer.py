@@ -2,13 +2,27 @@
 from __future__ import annotations
 
 import csv
-from datetime import date, datetime
+import hashlib
+import json
+import os
+import queue
+import threading
+from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
+from .compression import compression_suffix, open_text_output
 from .schema import TableDefinition
 
+MANIFEST_FILENAME = "manifest.json"
+CHECKSUM_ALGORITHM = "sha256"
+THREAD_BATCH_SIZE = 1_000
+THREAD_QUEUE_SIZE = 16
+
+_FLUSH = object()
+_CLOSE = object()
+
 
 def _format_cell(value: Any) -> Any:
     """Coerce Python values into CSV-friendly representations."""
@@ -22,8 +36,8 @@ def _format_cell(value: Any) -> Any:
     if isinstance(value, Decimal):
         return format(value, "f")
     if isinstance(value, str):
-        cleaned = " ".join(value.replace("\r", " ").replace("\n", " ").replace("\t", " ").strip().split())
-        return cleaned
+        # str.split() already breaks on \r, \n and \t and drops leading/trailing whitespace.
+        return " ".join(value.split())
     return value
 
 
@@ -37,27 +51,46 @@ class CsvTableWriter:
         *,
         encoding: str = "utf-8",
         delimiter: str = ",",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        compression_threads: int = 0,
+        checksum: bool = False,
     ) -> None:
         self.table = table
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not delimiter or len(delimiter) != 1:
             raise ValueError("CSV delimiter must be a single character.")
-        self._handle = self.path.open("w", newline="\n", encoding=encoding)
+        # Hashing runs on the writing thread over every output byte, so it is opt-in.
+        self.digest = hashlib.new(CHECKSUM_ALGORITHM) if checksum else None
+        self._handle = open_text_output(
+            self.path,
+            encoding=encoding,
+            compression=compression,
+            level=compression_level,
+            threads=compression_threads,
+            digest=self.digest,
+        )
         # self._handle.write("\ufeff")
         self._writer = csv.writer(self._handle, lineterminator="\n", delimiter=delimiter)
-        self._writer.writerow(self.table.column_names)
+        self._columns: List[str] = table.column_names
+        self._writer.writerow(self._columns)
+        self.row_count = 0
 
     def write_row(self, row: Mapping[str, Any]) -> None:
         """Write a single row adhering to the table's column order."""
 
-        ordered_values = [_format_cell(row.get(column)) for column in self.table.column_names]
+        ordered_values = [_format_cell(row.get(column)) for column in self._columns]
         self._writer.writerow(ordered_values)
+        self.row_count += 1
 
     def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
         for row in rows:
             self.write_row(row)
 
+    def flush(self) -> None:
+        self._handle.flush()
+
     def close(self) -> None:
         self._handle.close()
 
@@ -68,8 +101,115 @@ class CsvTableWriter:
         self.close()
 
 
+class ThreadedCsvTableWriter:
+    """:class:`CsvTableWriter` whose formatting, encoding and compression run on a dedicated thread.
+
+    Rows are handed over in batches of *batch_size* through a bounded queue,
+    so a table with very large rows (e.g. ``work_abstract``) does not stall
+    the parse or the other tables.  An error raised on the writer thread
+    stays set and is re-raised by every later write, flush or close, since
+    the rows handed over after it are dropped.
+    """
+
+    def __init__(
+        self,
+        table: TableDefinition,
+        path: Path,
+        *,
+        batch_size: int = THREAD_BATCH_SIZE,
+        queue_size: int = THREAD_QUEUE_SIZE,
+        **writer_options: Any,
+    ) -> None:
+        self._writer = CsvTableWriter(table, path, **writer_options)
+        self.table = table
+        self.path = path
+        self.digest = self._writer.digest
+        self.row_count = 0
+        self._batch_size = max(batch_size, 1)
+        self._batch: List[Mapping[str, Any]] = []
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(queue_size, 1))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"csv-{table.name}", daemon=True)
+        self._thread.start()
+
+    def write_row(self, row: Mapping[str, Any]) -> None:
+        self._batch.append(row)
+        self.row_count += 1
+        if len(self._batch) >= self._batch_size:
+            self._submit()
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self) -> None:
+        """Hand the pending rows to the writer thread and ask it to flush; does not wait."""
+
+        self._submit()
+        self._queue.put(_FLUSH)
+
+    def close(self) -> None:
+        if self._closed:
+            self._raise_pending()
+            return
+        self._closed = True
+        try:
+            self._submit()
+        finally:
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        self._raise_pending()
+
+    def _submit(self) -> None:
+        self._raise_pending()
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def _run(self) -> None:
+        writer = self._writer
+        finished = False
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE:
+                    finished = True
+                    break
+                if item is _FLUSH:
+                    writer.flush()
+                else:
+                    writer.write_rows(item)
+            writer.close()
+        except BaseException as exc:  # pragma: no cover - surfaced on next write/close
+            self._error = exc
+            # Keep draining so the producer never blocks on a full queue.
+            while not finished:
+                finished = self._queue.get() is _CLOSE
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "ThreadedCsvTableWriter":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
 class CsvWriterManager:
-    """Manage multiple CSV writers keyed by table name."""
+    """Manage multiple CSV writers keyed by table name.
+
+    *table_compression* overrides *compression* for individual tables, and
+    tables listed in *threaded_tables* are written by a
+    :class:`ThreadedCsvTableWriter`.  With *checksums* every file is hashed
+    while it is written and its SHA-256 is added to the manifest.
+    """
 
     def __init__(
         self,
@@ -78,24 +218,47 @@ class CsvWriterManager:
         *,
         encoding: str = "utf-8",
         delimiter: str = ",",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        compression_threads: int = 0,
+        table_compression: Optional[Mapping[str, str]] = None,
+        threaded_tables: Collection[str] = (),
+        checksums: bool = False,
     ) -> None:
         self._table_definitions = dict(table_definitions)
         self._output_dir = output_dir
         self._encoding = encoding
         self._delimiter = delimiter
-        self._writers: Dict[str, CsvTableWriter] = {}
+        self._compression = compression
+        self._compression_level = compression_level
+        self._compression_threads = compression_threads
+        self._table_compression = dict(table_compression or {})
+        self._threaded_tables = frozenset(threaded_tables)
+        self._checksums = checksums
+        self._writers: Dict[str, Union[CsvTableWriter, ThreadedCsvTableWriter]] = {}
+        # Table name -> (file path, row count) for every table closed by this manager.
+        self.outputs: Dict[str, Tuple[Path, int]] = {}
+        self._manifest_tables: Dict[str, Dict[str, Any]] = {}
+        self._inputs: Dict[str, Dict[str, Any]] = {}
+        self.manifest_path = output_dir / MANIFEST_FILENAME
 
-    def writer_for(self, table_name: str) -> CsvTableWriter:
+    def writer_for(self, table_name: str) -> Union[CsvTableWriter, ThreadedCsvTableWriter]:
         try:
             return self._writers[table_name]
         except KeyError:
             table = self._table_definitions[table_name]
-            path = self._output_dir / f"{table.name}.csv"
-            writer = CsvTableWriter(
+            compression = self._table_compression.get(table_name, self._compression)
+            path = self._output_dir / f"{table.name}.csv{compression_suffix(compression)}"
+            writer_class = ThreadedCsvTableWriter if table_name in self._threaded_tables else CsvTableWriter
+            writer = writer_class(
                 table=table,
                 path=path,
                 encoding=self._encoding,
                 delimiter=self._delimiter,
+                compression=compression,
+                compression_level=self._compression_level,
+                compression_threads=self._compression_threads,
+                checksum=self._checksums,
             )
             self._writers[table_name] = writer
             return writer
@@ -106,10 +269,67 @@ class CsvWriterManager:
     def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
         self.writer_for(table_name).write_rows(rows)
 
-    def close(self) -> None:
+    def checkpoint(self) -> None:
+        """Flush buffered output at an input boundary."""
+
         for writer in self._writers.values():
-            writer.close()
+            writer.flush()
+
+    def record_input(self, entity: str, path: Path, records: int, truncated: bool = False) -> None:
+        """Note that part file *path* of *entity* was read, yielding *records* records.
+
+        A *truncated* file (cut short by ``--max-records``) is listed under
+        ``truncated`` instead of ``partitions``, which only holds fully read
+        files.
+        """
+
+        entry = self._inputs.setdefault(entity, {"records": 0, "partitions": [], "truncated": []})
+        entry["records"] += records
+        entry["truncated" if truncated else "partitions"].append(f"{path.parent.name}/{path.name}")
+
+    def close(self) -> None:
+        """Close every writer and write the manifest, then re-raise the first writer error.
+
+        Tables whose writer failed are left out of :attr:`outputs` and the manifest.
+        """
+
+        error: Optional[BaseException] = None
+        for table_name, writer in self._writers.items():
+            try:
+                writer.close()
+            except BaseException as exc:
+                error = error or exc
+                continue
+            self.outputs[table_name] = (writer.path, writer.row_count)
+            entry: Dict[str, Any] = {
+                "file": writer.path.name,
+                "rows": writer.row_count,
+                "bytes": writer.path.stat().st_size,
+            }
+            if writer.digest is not None:
+                entry[CHECKSUM_ALGORITHM] = writer.digest.hexdigest()
+            self._manifest_tables[table_name] = entry
         self._writers.clear()
+        self._write_manifest()
+        if error is not None:
+            raise error
+
+    def _write_manifest(self) -> None:
+        """Write ``manifest.json`` describing every table and input covered by this manager."""
+
+        manifest = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "encoding": self._encoding,
+            "delimiter": self._delimiter,
+            "compression": self._compression or "none",
+            "checksum": CHECKSUM_ALGORITHM if self._checksums else None,
+            "tables": dict(sorted(self._manifest_tables.items())),
+            "entities": self._inputs,
+        }
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        temporary = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        temporary.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        os.replace(temporary, self.manifest_path)
 
     def __enter__(self) -> "CsvWriterManager":
         return self
@@ -118,4 +338,4 @@ class CsvWriterManager:
         self.close()
 
 
-__all__ = ["CsvTableWriter", "CsvWriterManager"]
+__all__ = ["MANIFEST_FILENAME", "CsvTableWriter", "CsvWriterManager", "ThreadedCsvTableWriter"]
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, Mapping, MutableMapping, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, MutableMapping, Sequence, Tuple
 
 from .csv_writer import CsvWriterManager
 
@@ -14,15 +14,67 @@ def _build_key(row: Row, fields: KeyFields) -> Tuple[object, ...]:
     return tuple(row.get(field) for field in fields)
 
 
+class WriterFanout:
+    """Forward rows to several writer managers (e.g. CSV plus a side output).
+
+    Managers are closed in reverse order, so side outputs that emit rows into
+    the primary manager when they close (post-parse builders) run first.
+    """
+
+    def __init__(self, writers: Sequence[CsvWriterManager]) -> None:
+        self._writers = list(writers)
+
+    def write_row(self, table_name: str, row: Row) -> None:
+        for writers in self._writers:
+            writers.write_row(table_name, row)
+
+    def write_rows(self, table_name: str, rows: Iterable[Row]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        for writers in self._writers:
+            writers.checkpoint()
+
+    def close(self) -> None:
+        for writers in reversed(self._writers):
+            writers.close()
+
+
 class TableEmitter:
-    """Emit rows to CSV writers while avoiding duplicate dimension rows."""
+    """Emit rows to CSV writers while avoiding duplicate dimension rows.
+
+    Rows for *skip_tables* are dropped, so their writers are never opened.
+    *dropped_columns* maps tables to columns the writers leave out; transformers
+    may skip computing them.
+    """
 
-    def __init__(self, writers: CsvWriterManager, dedupe_keys: Mapping[str, KeyFields] | None = None) -> None:
+    def __init__(
+        self,
+        writers: CsvWriterManager,
+        dedupe_keys: Mapping[str, KeyFields] | None = None,
+        skip_tables: Iterable[str] = (),
+        dropped_columns: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
         self._writers = writers
         self._dedupe_keys: Dict[str, KeyFields] = dict(dedupe_keys or {})
         self._seen: Dict[str, set[Tuple[object, ...]]] = defaultdict(set)
+        self._skip_tables = frozenset(skip_tables)
+        self._dropped_columns = {table: frozenset(columns) for table, columns in (dropped_columns or {}).items()}
+
+    def wants(self, table: str) -> bool:
+        """Return whether rows for *table* are written; transformers may skip building them otherwise."""
+
+        return table not in self._skip_tables
+
+    def wants_column(self, table: str, column: str) -> bool:
+        """Return whether *column* of *table* is written; transformers may leave it unset otherwise."""
+
+        return self.wants(table) and column not in self._dropped_columns.get(table, ())
 
     def emit(self, table: str, row: Row) -> None:
+        if table in self._skip_tables:
+            return
         key_fields = self._dedupe_keys.get(table)
         if key_fields:
             key = _build_key(row, key_fields)
@@ -37,5 +89,22 @@ class TableEmitter:
         for row in rows:
             self.emit(table, row)
 
+    def checkpoint(self) -> None:
+        """Signal an input boundary (end of a part file) to the writers."""
+
+        self._writers.checkpoint()
+
+
+def wanted_steps(emitter: TableEmitter, steps: Sequence[Tuple[Callable, Sequence[str]]]) -> List[Callable]:
+    """Return the step callables of ``(step, tables)`` *steps* that write at least one table *emitter* wants.
+
+    Transformers keep the result as ``self._steps`` and call it in order, so
+    building rows for skipped tables is avoided entirely.  They also set
+    ``self.idle = not self._steps``: an idle transformer writes no table, and
+    the CLI then does not read its entity's files at all.
+    """
+
+    return [step for step, tables in steps if any(emitter.wants(table) for table in tables)]
+
 
-__all__ = ["TableEmitter"]
+__all__ = ["TableEmitter", "WriterFanout", "wanted_steps"]
@@ -2,12 +2,20 @@
 from __future__ import annotations
 
 import csv
+import os
+import shutil
+import tempfile
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, Mapping, MutableMapping, Sequence, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, MutableMapping, Optional, Sequence, Set, TextIO, Tuple
 
+from .catalog_cache import iter_reference_pairs, read_reference_pairs
+from .collect_cache import CollectCache
+from .namespace_index import NamespaceIndex, index_path_for, open_namespace_index
 from .reference import EnumerationConfig
+from .sorted_runs import DEFAULT_RUN_SIZE, SortedValueRuns
 
 
 @dataclass(frozen=True)
@@ -18,85 +26,365 @@ class NamespaceConfig:
     filename: str
     id_column: str
     value_column: str
+    # Large free-text namespaces that may be served from a memory-mapped index.
+    indexed: bool = False
+
+
+class _LazyAssignments(Mapping[str, Mapping[str, int]]):
+    """Name-to-assignments mapping whose entries are loaded on first access."""
+
+    def __init__(self, loaders: Mapping[str, Callable[[], Mapping[str, int]]]) -> None:
+        self._loaders = dict(loaders)
+        self._loaded: Dict[str, Mapping[str, int]] = {}
+
+    def __getitem__(self, name: str) -> Mapping[str, int]:
+        assignments = self._loaded.get(name)
+        if assignments is None:
+            assignments = self._loaded[name] = self._loaders[name]()
+        return assignments
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
 
 
 class IdCatalog:
-    """Collect unique values and assign sequential IDs per configuration."""
+    """Collect unique values and assign sequential IDs per configuration.
+
+    In *append* mode the catalog is stable across snapshots: values already
+    present in the reference TSVs keep their IDs, newly collected values get
+    the next free IDs, and values first met during the parse are assigned on
+    the fly through :meth:`append_enum` / :meth:`append_namespace` and
+    appended to the TSVs instead of failing.
+
+    Namespace values are collected in :class:`SortedValueRuns` that spill
+    sorted runs of *run_size* values to *run_dir* (a temporary directory by
+    default); :meth:`finalize` merges the runs while writing the TSVs.
+
+    With a *collect_cache*, the values recorded between :meth:`begin_input`
+    and :meth:`end_input` are memoised per snapshot part file, and unchanged
+    part files are replayed from the cache instead of being scanned again.
+    """
 
     def __init__(
         self,
         enum_configs: Sequence[EnumerationConfig],
         namespace_configs: Sequence[NamespaceConfig],
+        *,
+        use_namespace_index: bool = False,
+        append: bool = False,
+        run_dir: Optional[Path] = None,
+        run_size: int = DEFAULT_RUN_SIZE,
+        collect_cache: Optional[CollectCache] = None,
     ) -> None:
+        self._use_namespace_index = use_namespace_index
+        self._append = append
+        self._reference_dir: Optional[Path] = None
+        self._appended: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(dict)
+        self._next_ids: Dict[Tuple[str, str], int] = {}
+        self._append_handles: Dict[Path, Tuple[TextIO, Any]] = {}
         self._enum_configs: Dict[str, EnumerationConfig] = {config.table: config for config in enum_configs}
         self._namespace_configs: Dict[str, NamespaceConfig] = {
             config.namespace: config for config in namespace_configs
         }
         self._enum_values: MutableMapping[str, Set[str]] = defaultdict(set)
-        self._namespace_values: MutableMapping[str, Set[str]] = defaultdict(set)
-        self.enum_assignments: Dict[str, Dict[str, int]] = {}
-        self.namespace_assignments: Dict[str, Dict[str, int]] = {}
+        self._run_dir = run_dir
+        self._run_size = run_size
+        self._namespace_values: Dict[str, SortedValueRuns] = {}
+        self._collect_cache = collect_cache
+        self._collect_scope = (tuple(sorted(self._enum_configs)), tuple(sorted(self._namespace_configs)))
+        self._input_enums: Optional[MutableMapping[str, Set[str]]] = None
+        self._input_namespaces: Optional[MutableMapping[str, Set[str]]] = None
+        self.enum_assignments: Mapping[str, Mapping[str, int]] = {}
+        self.namespace_assignments: Mapping[str, Mapping[str, int]] = {}
 
     def record_enum(self, table: str, value: str) -> None:
         if value:
             self._enum_values[table].add(value)
+            if self._input_enums is not None:
+                self._input_enums[table].add(value)
 
     def record_namespace(self, namespace: str, value: str) -> None:
-        if value:
-            self._namespace_values[namespace].add(value)
+        if not value or namespace not in self._namespace_configs:
+            return
+        if self._input_namespaces is not None:
+            self._input_namespaces[namespace].add(value)
+        runs = self._namespace_values.get(namespace)
+        if runs is None:
+            if self._run_dir is None:
+                self._run_dir = Path(tempfile.mkdtemp(prefix="openalex-catalog-"))
+            runs = self._namespace_values[namespace] = SortedValueRuns(
+                self._run_dir / namespace, run_size=self._run_size
+            )
+        runs.add(value)
+
+    def begin_input(self, entity: str, part_file: Path) -> bool:
+        """Start collecting *part_file*; return ``True`` if its values were replayed from the cache.
+
+        A ``True`` result means the caller should skip the file.
+        """
+
+        if self._collect_cache is None:
+            return False
+        cached = self._collect_cache.load(entity, part_file, self._collect_scope)
+        if cached is not None:
+            enum_values, namespace_values = cached
+            for table, values in enum_values.items():
+                self._enum_values[table].update(values)
+            for namespace, values in namespace_values.items():
+                for value in values:
+                    self.record_namespace(namespace, value)
+            return True
+        self._input_enums = defaultdict(set)
+        self._input_namespaces = defaultdict(set)
+        return False
+
+    def end_input(self, entity: str, part_file: Path) -> None:
+        """Memoise the values recorded since :meth:`begin_input` for *part_file*."""
+
+        if self._collect_cache is None or self._input_enums is None or self._input_namespaces is None:
+            return
+        contribution = (
+            {table: list(values) for table, values in self._input_enums.items()},
+            {namespace: list(values) for namespace, values in self._input_namespaces.items()},
+        )
+        self._input_enums = None
+        self._input_namespaces = None
+        self._collect_cache.store(entity, part_file, self._collect_scope, contribution)
 
     def finalize(self, reference_dir: Path) -> None:
         """Assign IDs and write CSV files to *reference_dir*."""
         reference_dir.mkdir(parents=True, exist_ok=True)
-        self.enum_assignments = {}
+        self._reference_dir = reference_dir
+        enum_assignments: Dict[str, Mapping[str, int]] = {}
         for table, config in self._enum_configs.items():
             values = self._enum_values.get(table, set())
-            assignments = self._assign(values)
-            self.enum_assignments[table] = assignments
             filename = config.reference_filename or f"{table}.csv"
             path = reference_dir / filename
+            assignments = self._assign_for(path, config.id_column, config.value_column, values)
+            enum_assignments[table] = assignments
             self._write_records(
                 path,
                 (config.id_column, config.value_column),
                 ({config.id_column: identifier, config.value_column: value} for value, identifier in assignments.items()),
             )
+        self.enum_assignments = enum_assignments
 
-        self.namespace_assignments = {}
+        namespace_assignments: Dict[str, Mapping[str, int]] = {}
         for namespace, config in self._namespace_configs.items():
-            values = self._namespace_values.get(namespace, set())
-            assignments = self._assign(values)
-            self.namespace_assignments[namespace] = assignments
             path = reference_dir / config.filename
-            self._write_records(
-                path,
-                (config.id_column, config.value_column),
-                ({config.id_column: identifier, config.value_column: value} for value, identifier in assignments.items()),
-            )
+            runs = self._namespace_values.pop(namespace, None)
+            try:
+                ordered = runs.sorted_values() if runs is not None else iter(())
+                namespace_assignments[namespace] = self._finalize_namespace(path, config, ordered)
+            finally:
+                if runs is not None:
+                    runs.close()
+        self.namespace_assignments = namespace_assignments
+        if self._run_dir is not None:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+
+    def _finalize_namespace(self, path: Path, config: NamespaceConfig, ordered: Iterator[str]) -> Mapping[str, int]:
+        """Assign IDs to the *ordered* values while streaming them into the TSV at *path*.
+
+        Indexed namespaces are never held as a dictionary: in append mode the
+        existing index answers membership while the existing rows are streamed
+        from the TSV, and the new index is built from the written TSV with an
+        external sort.
+        """
+
+        indexed = self._indexed(config)
+        existing: Mapping[str, int] = {}
+        if self._append and path.exists() and indexed:
+            existing = self._open_index(path, config)
+        elif self._append and path.exists():
+            existing = self._read_assignments(path, config.id_column, config.value_column)
+        assignments: Dict[str, int] = {}
+
+        def records() -> Iterator[Dict[str, object]]:
+            next_id = self._max_id(existing) + 1
+            if isinstance(existing, NamespaceIndex):
+                rows: Iterable[Tuple[str, int]] = iter_reference_pairs(path, config.id_column, config.value_column)
+            else:
+                rows = existing.items()
+            for value, identifier in rows:
+                yield {config.id_column: identifier, config.value_column: value}
+            for value in ordered:
+                if value in existing:
+                    continue
+                if not indexed:
+                    assignments[value] = next_id
+                yield {config.id_column: next_id, config.value_column: value}
+                next_id += 1
+
+        self._write_records(path, (config.id_column, config.value_column), records())
+        if indexed:
+            if isinstance(existing, NamespaceIndex):
+                existing.close()
+            index_path_for(path).unlink(missing_ok=True)
+            return self._open_index(path, config)
+        if existing:
+            merged = dict(existing)
+            merged.update(assignments)
+            return merged
+        return assignments
+
+    def load_existing(
+        self,
+        reference_dir: Path,
+        namespaces: Optional[Iterable[str]] = None,
+        *,
+        allow_missing_enums: bool = False,
+    ) -> bool:
+        """Check for an existing catalog under *reference_dir* and load its assignments on demand.
+
+        Only the namespaces in *namespaces* (all configured ones by default)
+        have to be present.  Nothing is read here: each enumeration and
+        namespace is loaded the first time its assignments are accessed.
 
-    def load_existing(self, reference_dir: Path) -> bool:
-        """Load assignments from an existing reference directory if possible."""
-        if not reference_dir.exists():
+        A catalog missing any required file is reported as absent, also in
+        append mode: the caller then runs a collect pass, and
+        :meth:`finalize` extends the TSVs that do exist, keeping their IDs.
+        With *allow_missing_enums* (append mode only) missing enumeration
+        TSVs do not count, since their values are appended at parse time.
+        """
+        allow_missing_enums = allow_missing_enums and self._append
+        if not reference_dir.exists() and not allow_missing_enums:
             return False
 
-        enum_assignments: Dict[str, Dict[str, int]] = {}
-        for table, config in self._enum_configs.items():
-            filename = config.reference_filename or f"{table}.csv"
-            path = reference_dir / filename
+        required = self._namespace_configs.keys() if namespaces is None else set(namespaces)
+        paths = [
+            reference_dir / config.filename
+            for namespace, config in self._namespace_configs.items()
+            if namespace in required
+        ]
+        if not allow_missing_enums:
+            paths.extend(
+                reference_dir / (config.reference_filename or f"{table}.csv")
+                for table, config in self._enum_configs.items()
+            )
+        if not all(path.exists() for path in paths):
+            return False
+        reference_dir.mkdir(parents=True, exist_ok=True)
+        self._reference_dir = reference_dir
+
+        def load_enum(config: EnumerationConfig) -> Dict[str, int]:
+            path = reference_dir / (config.reference_filename or f"{config.table}.csv")
             if not path.exists():
-                return False
-            enum_assignments[table] = self._read_assignments(path, config.id_column, config.value_column)
+                return {}
+            return self._read_assignments(path, config.id_column, config.value_column)
 
-        namespace_assignments: Dict[str, Dict[str, int]] = {}
-        for namespace, config in self._namespace_configs.items():
+        def load_namespace(config: NamespaceConfig) -> Mapping[str, int]:
             path = reference_dir / config.filename
             if not path.exists():
-                return False
-            namespace_assignments[namespace] = self._read_assignments(path, config.id_column, config.value_column)
+                return {}
+            if self._indexed(config):
+                return self._open_index(path, config)
+            return self._read_assignments(path, config.id_column, config.value_column)
 
-        self.enum_assignments = enum_assignments
-        self.namespace_assignments = namespace_assignments
+        self.enum_assignments = _LazyAssignments(
+            {table: partial(load_enum, config) for table, config in self._enum_configs.items()}
+        )
+        self.namespace_assignments = _LazyAssignments(
+            {namespace: partial(load_namespace, config) for namespace, config in self._namespace_configs.items()}
+        )
         return True
 
+    def append_enum(self, table: str, value: str) -> int:
+        """Return the ID of enumeration *value*, appending it to the catalog if it is new."""
+
+        config = self._enum_configs[table]
+        path = self._require_reference_dir() / (config.reference_filename or f"{table}.csv")
+        return self._append_value(("enum", table), self.enum_assignments.get(table, {}), path, config, value)
+
+    def append_namespace(self, namespace: str, value: str) -> int:
+        """Return the ID of namespace *value*, appending it to the catalog if it is new."""
+
+        config = self._namespace_configs[namespace]
+        path = self._require_reference_dir() / config.filename
+        return self._append_value(
+            ("namespace", namespace), self.namespace_assignments.get(namespace, {}), path, config, value
+        )
+
+    def close(self) -> None:
+        """Close the reference TSVs that received appended values and report them."""
+
+        for handle, _writer in self._append_handles.values():
+            handle.close()
+        self._append_handles.clear()
+        for (_kind, name), values in sorted(self._appended.items()):
+            if values:
+                print(f"Appended {len(values):,} new values to the '{name}' catalog")
+
+    def _require_reference_dir(self) -> Path:
+        if self._reference_dir is None:
+            raise RuntimeError("The ID catalog must be loaded or finalized before values can be appended.")
+        return self._reference_dir
+
+    def _append_value(
+        self,
+        key: Tuple[str, str],
+        existing: Mapping[str, int],
+        path: Path,
+        config: EnumerationConfig | NamespaceConfig,
+        value: str,
+    ) -> int:
+        identifier = existing.get(value)
+        if identifier is not None:
+            return identifier
+        appended = self._appended[key]
+        identifier = appended.get(value)
+        if identifier is not None:
+            return identifier
+        if key not in self._next_ids:
+            self._next_ids[key] = self._max_id(existing) + 1
+        identifier = self._next_ids[key]
+        self._next_ids[key] = identifier + 1
+        appended[value] = identifier
+
+        entry = self._append_handles.get(path)
+        if entry is None:
+            new_file = not path.exists()
+            handle = path.open("a", encoding="utf-8", newline="")
+            writer = csv.writer(handle, delimiter="\t")
+            if new_file:
+                writer.writerow((config.id_column, config.value_column))
+            entry = self._append_handles[path] = (handle, writer)
+        handle, writer = entry
+        writer.writerow((identifier, value))
+        # New values are rare; flush so the TSV never lags behind IDs already written to output.
+        handle.flush()
+        return identifier
+
+    @staticmethod
+    def _max_id(assignments: Mapping[str, int]) -> int:
+        if isinstance(assignments, NamespaceIndex):
+            return assignments.max_id()
+        return max(assignments.values(), default=0)
+
+    def _assign_for(self, path: Path, id_column: str, value_column: str, values: Set[str]) -> Dict[str, int]:
+        """Assign IDs to *values*, keeping the IDs already stored in *path* in append mode."""
+
+        if not self._append or not path.exists():
+            return self._assign(values)
+        assignments = self._read_assignments(path, id_column, value_column)
+        next_id = max(assignments.values(), default=0) + 1
+        new_values = sorted(values.difference(assignments), key=lambda text: (text.casefold(), text))
+        for offset, value in enumerate(new_values):
+            assignments[value] = next_id + offset
+        return assignments
+
+    def _indexed(self, config: NamespaceConfig) -> bool:
+        return self._use_namespace_index and config.indexed
+
+    def _open_index(self, path: Path, config: NamespaceConfig) -> NamespaceIndex:
+        return open_namespace_index(
+            path,
+            lambda: iter_reference_pairs(path, config.id_column, config.value_column),
+        )
+
     @staticmethod
     def _assign(values: Set[str]) -> Dict[str, int]:
         ordered = sorted(values, key=lambda text: (text.casefold(), text))
@@ -105,30 +393,18 @@ class IdCatalog:
     @staticmethod
     def _write_records(path: Path, headers: Iterable[str], records: Iterable[Dict[str, object]]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8", newline="") as handle:
+        # Written beside *path* and swapped in, so *records* may still be streaming the old file.
+        temporary = path.with_name(path.name + ".tmp")
+        with temporary.open("w", encoding="utf-8", newline="") as handle:
             writer = csv.DictWriter(handle, fieldnames=list(headers), delimiter="\t")
             writer.writeheader()
             for row in records:
                 writer.writerow(row)
+        os.replace(temporary, path)
 
     @staticmethod
     def _read_assignments(path: Path, id_column: str, value_column: str) -> Dict[str, int]:
-        assignments: Dict[str, int] = {}
-        with path.open(encoding="utf-8-sig", newline="") as handle:
-            sample = handle.read(2048)
-            handle.seek(0)
-            delimiter = "\t" if "\t" in sample else ","
-            reader = csv.DictReader(handle, delimiter=delimiter)
-            for row in reader:
-                raw_id = row.get(id_column)
-                raw_value = row.get(value_column)
-                if not raw_id or not raw_value:
-                    continue
-                try:
-                    assignments[raw_value] = int(raw_id)
-                except ValueError:
-                    continue
-        return assignments
-
+        values, identifiers = read_reference_pairs(path, id_column, value_column)
+        return dict(zip(values, identifiers))
 
 __all__ = ["IdCatalog", "NamespaceConfig"]
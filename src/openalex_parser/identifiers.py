@@ -1,7 +1,126 @@
 """Deterministic identifier lookup backed by precomputed assignments."""
 from __future__ import annotations
 
-from typing import Callable, Dict, Mapping, Optional
+import csv
+import hashlib
+import shutil
+import uuid
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Mapping, Optional, Set, Tuple
+
+from .sorted_runs import DEFAULT_RUN_SIZE, merge_sorted_runs, write_sorted_run
+
+DEFAULT_HASH_KEY = b"openalex-relational-parser"
+HASH_CACHE_SIZE = 1 << 18
+RUN_SUFFIX = ".pickle"
+
+
+class HashedNamespaceIds:
+    """Derive namespace IDs from a keyed BLAKE2b hash of the value.
+
+    The ID of *value* is the first 8 bytes of ``blake2b(value, key=key)``
+    truncated to the width *bits* gives for its namespace (63 by default); a
+    value hashing to 0 is re-hashed with an increasing salt.  IDs depend only
+    on the value and the key, so every run and every worker computes the same
+    IDs without a collection pass or a shared catalog.
+
+    Values landing on the same ID share it.  With a *run_dir*, every distinct
+    value met is recorded with its ID and a fingerprint (the other 8 bytes of
+    the digest) in sorted runs of at most *run_size* entries, which
+    :func:`find_hashed_collisions` merges across workers afterwards; nothing
+    grows with the number of values in memory.
+    """
+
+    def __init__(
+        self,
+        namespaces: Iterable[str],
+        *,
+        key: bytes = DEFAULT_HASH_KEY,
+        bits: Optional[Mapping[str, int]] = None,
+        run_dir: Optional[Path] = None,
+        run_size: int = DEFAULT_RUN_SIZE,
+    ) -> None:
+        self.namespaces = frozenset(namespaces)
+        self._key = key
+        self._masks = {namespace: (1 << min((bits or {}).get(namespace, 63), 63)) - 1 for namespace in self.namespaces}
+        self._run_dir = run_dir
+        self._run_size = max(run_size, 1)
+        self._worker = uuid.uuid4().hex
+        self._runs = 0
+        self._pending: Set[Tuple[str, int, int, str]] = set()
+        self._cached_id_for = lru_cache(maxsize=HASH_CACHE_SIZE)(self._resolve)
+
+    def _digest(self, value: str, attempt: int) -> bytes:
+        salt = attempt.to_bytes(16, "little") if attempt else b""
+        return hashlib.blake2b(
+            value.encode("utf-8", "surrogatepass"), digest_size=16, key=self._key, salt=salt
+        ).digest()
+
+    def id_for(self, namespace: str, value: str) -> int:
+        return self._cached_id_for(namespace, value)
+
+    def _resolve(self, namespace: str, value: str) -> int:
+        mask = self._masks[namespace]
+        attempt = 0
+        digest = self._digest(value, attempt)
+        while not int.from_bytes(digest[:8], "big") & mask:
+            attempt += 1
+            digest = self._digest(value, attempt)
+        identifier = int.from_bytes(digest[:8], "big") & mask
+        if self._run_dir is not None:
+            # Only cache misses get here, so hot values are recorded once per eviction at most.
+            self._pending.add((namespace, identifier, int.from_bytes(digest[8:], "big"), value))
+            if len(self._pending) >= self._run_size:
+                self._spill()
+        return identifier
+
+    def _spill(self) -> None:
+        if not self._pending:
+            return
+        self._run_dir.mkdir(parents=True, exist_ok=True)
+        write_sorted_run(self._run_dir / f"{self._worker}-{self._runs:05d}{RUN_SUFFIX}", self._pending)
+        self._runs += 1
+        self._pending = set()
+
+    def close(self) -> None:
+        """Write the values recorded since the last run to *run_dir*."""
+
+        if self._run_dir is not None:
+            self._spill()
+
+
+def find_hashed_collisions(run_dir: Path, collisions_path: Path) -> int:
+    """Merge the runs every :class:`HashedNamespaceIds` left in *run_dir* and list IDs shared by several values.
+
+    Each value of a shared ID is written to *collisions_path* (``namespace``,
+    ``hashed_id``, ``value``), which is only created when there is one.
+    Returns the number of shared IDs and removes *run_dir*.
+    """
+
+    collisions_path.unlink(missing_ok=True)
+    collisions = 0
+    handle = None
+    try:
+        runs = sorted(run_dir.glob(f"*{RUN_SUFFIX}")) if run_dir.exists() else []
+        for (namespace, identifier), entries in groupby(merge_sorted_runs(runs), key=itemgetter(0, 1)):
+            values = {fingerprint: value for _namespace, _identifier, fingerprint, value in entries}
+            if len(values) < 2:
+                continue
+            if handle is None:
+                collisions_path.parent.mkdir(parents=True, exist_ok=True)
+                handle = collisions_path.open("w", encoding="utf-8", newline="")
+                writer = csv.writer(handle, delimiter="\t", lineterminator="\n")
+                writer.writerow(("namespace", "hashed_id", "value"))
+            writer.writerows((namespace, identifier, value) for value in sorted(values.values()))
+            collisions += 1
+    finally:
+        if handle is not None:
+            handle.close()
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return collisions
 
 
 class StableIdGenerator:
@@ -11,25 +130,46 @@ class StableIdGenerator:
         self,
         assignments: Optional[Mapping[str, Mapping[str, int]]] = None,
         recorder: Optional[Callable[[str, str], None]] = None,
+        on_missing: Optional[Callable[[str, str], int]] = None,
+        hashed: Optional[HashedNamespaceIds] = None,
     ) -> None:
-        self._assignments: Dict[str, Dict[str, int]] = {
-            namespace: dict(values) for namespace, values in (assignments or {}).items()
-        }
+        # Mappings are shared, not copied: they may be large, memory-mapped or loaded on first use.
+        self._assignments: Mapping[str, Mapping[str, int]] = assignments if assignments is not None else {}
+        self._namespace_maps: Dict[str, Mapping[str, int]] = {}
         self._recorder = recorder
+        # Called instead of raising KeyError for values absent from the assignments (append-only catalogs).
+        self._on_missing = on_missing
+        self._hashed = hashed
 
     def generate(self, namespace: str, value: str, bits: int = 63) -> int:  # bits maintained for compatibility
         if not value:
             raise ValueError("value must be a non-empty string")
+        if self._hashed is not None and namespace in self._hashed.namespaces:
+            return self._hashed.id_for(namespace, value)
         if self._recorder is not None and not self._assignments:
             self._recorder(namespace, value)
             return 0
-        namespace_map = self._assignments.get(namespace)
+        namespace_map = self._namespace_maps.get(namespace)
+        if namespace_map is None:
+            namespace_map = self._assignments.get(namespace)
+            if namespace_map is not None:
+                self._namespace_maps[namespace] = namespace_map
         if namespace_map is None:
+            if self._on_missing is not None:
+                return self._on_missing(namespace, value)
             raise KeyError(f"No assignments available for namespace '{namespace}'")
         try:
             return namespace_map[value]
         except KeyError as exc:  # pragma: no cover - error path
+            if self._on_missing is not None:
+                return self._on_missing(namespace, value)
             raise KeyError(f"Value '{value}' missing from namespace '{namespace}' assignments") from exc
 
 
-__all__ = ["StableIdGenerator"]
+__all__ = [
+    "DEFAULT_HASH_KEY",
+    "HASH_CACHE_SIZE",
+    "HashedNamespaceIds",
+    "StableIdGenerator",
+    "find_hashed_collisions",
+]
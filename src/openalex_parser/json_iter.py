@@ -5,7 +5,7 @@ import gzip
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, Optional
+from typing import Callable, Dict, Iterable, Iterator, Optional
 
 JsonDict = Dict[str, object]
 
@@ -43,6 +43,7 @@ class SnapshotReader:
             raise FileNotFoundError(f"Snapshot root {snapshot_root} does not exist")
         self.snapshot_root = snapshot_root
         self._last_file_count = 0
+        self._last_file_truncated = False
 
     def _resolve_entity_root(self, entity: str) -> Path:
         entity_root = self.snapshot_root / entity
@@ -57,8 +58,17 @@ class SnapshotReader:
         max_files: Optional[int] = None,
         max_records: Optional[int] = None,
         progress: Optional[ProgressReporter] = None,
+        on_file_complete: Optional[Callable[[Path, bool], None]] = None,
+        skip_file: Optional[Callable[[Path], bool]] = None,
     ) -> Iterator[JsonDict]:
-        """Yield parsed JSON documents for the requested entity."""
+        """Yield parsed JSON documents for the requested entity.
+
+        *on_file_complete* is called with each part file's path once the
+        consumer has finished with its last record, and with whether
+        *max_records* stopped the file before its end.  Part files for which
+        *skip_file* returns ``True`` are not read; they still count towards
+        *max_files*.
+        """
 
         entity_root = self._resolve_entity_root(entity)
         if updated_dates:
@@ -79,8 +89,14 @@ class SnapshotReader:
             )
             for part_file in part_files:
                 files_read += 1
+                if skip_file is not None and skip_file(part_file):
+                    if max_files is not None and files_read >= max_files:
+                        return
+                    continue
                 yield from self._iter_file(part_file, max_records, progress, yielded)
                 yielded += self._last_file_count
+                if on_file_complete is not None:
+                    on_file_complete(part_file, self._last_file_truncated)
                 if max_records is not None and yielded >= max_records:
                     return
                 if max_files is not None and files_read >= max_files:
@@ -94,6 +110,7 @@ class SnapshotReader:
         already_yielded: int,
     ) -> Iterator[JsonDict]:
         self._last_file_count = 0
+        self._last_file_truncated = False
         with gzip.open(path, "rt", encoding="utf-8") as handle:
             for line in handle:
                 document = _json_loads(line)
@@ -102,6 +119,7 @@ class SnapshotReader:
                 if progress:
                     progress()
                 if max_records is not None and already_yielded + self._last_file_count >= max_records:
+                    self._last_file_truncated = handle.readline() != ""
                     return
 
 
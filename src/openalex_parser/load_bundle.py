@@ -0,0 +1,184 @@
+"""Generate a ready-to-run ``psql`` load bundle for the produced table files."""
+from __future__ import annotations
+
+import shlex
+import stat
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from .schema import TableDefinition
+
+DEFAULT_LOAD_SESSIONS = 4
+LOAD_BUNDLE_DIRNAME = "load"
+
+_DECOMPRESSORS = {".gz": "gzip -dc", ".zst": "zstd -dc"}
+
+
+def _balance(weights: Mapping[str, int], sessions: int) -> List[List[str]]:
+    """Assign tables to *sessions* groups, largest first, always to the lightest group."""
+
+    groups: List[List[str]] = [[] for _ in range(max(sessions, 1))]
+    totals = [0] * len(groups)
+    for name in sorted(weights, key=lambda key: (-weights[key], key)):
+        target = totals.index(min(totals))
+        groups[target].append(name)
+        totals[target] += max(weights[name], 1)
+    return [group for group in groups if group]
+
+
+def _relative(path: Path, base: Path) -> str:
+    try:
+        return path.relative_to(base).as_posix()
+    except ValueError:
+        return path.resolve().as_posix()
+
+
+def _sql_literal(value: str) -> str:
+    if value == "\t":
+        return "E'\\t'"
+    return "'" + value.replace("'", "''") + "'"
+
+
+def copy_command(
+    table: TableDefinition,
+    path: str,
+    *,
+    file_format: str = "csv",
+    delimiter: str = "\t",
+    encoding: str = "utf-8",
+) -> str:
+    """Return a client-side ``\\copy`` command loading *path* into *table*.
+
+    Compressed files and UTF-16 CSVs are decompressed/transcoded on the
+    client through ``FROM PROGRAM``.
+    """
+
+    columns = ", ".join(table.column_names)
+    programs: List[str] = []
+    for suffix, program in _DECOMPRESSORS.items():
+        if path.endswith(suffix):
+            programs.append(f"{program} {shlex.quote(path)}")
+    if file_format == "csv" and encoding.lower() == "utf-16le":
+        programs.append("iconv -f UTF-16LE -t UTF-8" + ("" if programs else f" {shlex.quote(path)}"))
+    if programs:
+        source = f"PROGRAM {_sql_literal(' | '.join(programs))}"
+    else:
+        source = _sql_literal(path)
+    if file_format == "pgcopy":
+        options = "FORMAT binary"
+    else:
+        options = f"FORMAT csv, HEADER true, DELIMITER {_sql_literal(delimiter)}, ENCODING 'UTF8'"
+    return f"\\copy {table.qualified_name} ({columns}) FROM {source} WITH ({options})"
+
+
+def write_load_bundle(
+    output_dir: Path,
+    table_definitions: Mapping[str, TableDefinition],
+    outputs: Mapping[str, Tuple[Path, int]],
+    *,
+    file_format: str = "csv",
+    delimiter: str = "\t",
+    encoding: str = "utf-8",
+    sessions: int = DEFAULT_LOAD_SESSIONS,
+) -> Path:
+    """Write DDL, COPY and post-load index scripts plus a ``load.sh`` driver.
+
+    *outputs* maps table names to the produced file and its row count.  The
+    bundle contains:
+
+    - ``01_create_tables.sql``: every schema table, without keys or indexes;
+    - ``02_copy_<n>.sql``: COPY commands, largest tables first, spread over
+      *sessions* scripts with similar row totals;
+    - ``03_index_<n>.sql``: primary keys, constraints, indexes and ``ANALYZE``,
+      grouped by table so each script can run in its own session;
+    - ``load.sh``: runs the scripts against ``$DATABASE_URL`` with the COPY
+      and index scripts in parallel.
+
+    The bundle is written to ``<output_dir>/load``; file paths in it are
+    relative to *output_dir*, which ``load.sh`` changes into.
+    """
+
+    bundle_dir = output_dir / LOAD_BUNDLE_DIRNAME
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    for stale in bundle_dir.glob("0[23]_*.sql"):
+        stale.unlink()
+
+    create_lines = ["\\set ON_ERROR_STOP on", ""]
+    for table in table_definitions.values():
+        create_lines.append(table.create_statement(with_constraints=False))
+    (bundle_dir / "01_create_tables.sql").write_text("\n".join(create_lines) + "\n", encoding="utf-8")
+
+    loaded: Dict[str, int] = {
+        name: count for name, (_path, count) in outputs.items() if count > 0 and name in table_definitions
+    }
+    copy_scripts: List[str] = []
+    for number, group in enumerate(_balance(loaded, sessions), start=1):
+        lines = ["\\set ON_ERROR_STOP on", ""]
+        for name in group:
+            path, count = outputs[name]
+            lines.append(f"-- {name}: {count:,} rows")
+            lines.append(
+                copy_command(
+                    table_definitions[name],
+                    _relative(Path(path), output_dir),
+                    file_format=file_format,
+                    delimiter=delimiter,
+                    encoding=encoding,
+                )
+            )
+        script = f"02_copy_{number}.sql"
+        (bundle_dir / script).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        copy_scripts.append(script)
+
+    index_weights = {
+        name: loaded.get(name, 0) * (len(table.constraints) + len(table.indexes))
+        for name, table in table_definitions.items()
+    }
+    index_scripts: List[str] = []
+    for number, group in enumerate(_balance(index_weights, sessions), start=1):
+        lines = ["\\set ON_ERROR_STOP on", ""]
+        for name in group:
+            table = table_definitions[name]
+            lines.append(f"-- {name}")
+            lines.extend(table.constraint_statements())
+            lines.extend(table.indexes)
+            lines.append(f"ANALYZE {table.qualified_name};")
+        script = f"03_index_{number}.sql"
+        (bundle_dir / script).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        index_scripts.append(script)
+
+    driver = bundle_dir / "load.sh"
+    driver.write_text(_driver_script(LOAD_BUNDLE_DIRNAME, copy_scripts, index_scripts))
+    driver.chmod(driver.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bundle_dir
+
+
+def _driver_script(bundle: str, copy_scripts: Sequence[str], index_scripts: Sequence[str]) -> str:
+    def parallel(scripts: Sequence[str]) -> List[str]:
+        lines = ['pids=""']
+        lines.extend(f'psql "$DATABASE_URL" -q -f {bundle}/{script} & pids="$pids $!"' for script in scripts)
+        lines.append("wait_all $pids")
+        return lines
+
+    lines = [
+        "#!/bin/sh",
+        "# Usage: DATABASE_URL=postgresql://... ./load.sh",
+        "set -eu",
+        ': "${DATABASE_URL:?set DATABASE_URL to the target database}"',
+        'cd "$(dirname "$0")/.."',
+        "",
+        "wait_all() {",
+        "    status=0",
+        '    for pid in "$@"; do wait "$pid" || status=1; done',
+        '    return "$status"',
+        "}",
+        "",
+        f'psql "$DATABASE_URL" -q -f {bundle}/01_create_tables.sql',
+        *parallel(copy_scripts),
+        *parallel(index_scripts),
+        "",
+    ]
+    return "\n".join(lines)
+
+
+__all__ = ["DEFAULT_LOAD_SESSIONS", "LOAD_BUNDLE_DIRNAME", "copy_command", "write_load_bundle"]
@@ -0,0 +1,216 @@
+"""Memory-mapped, sorted on-disk index mapping namespace values to IDs."""
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .sorted_runs import DEFAULT_RUN_SIZE, sorted_items
+
+INDEX_MAGIC = b"OAXNSIX1"
+INDEX_SUFFIX = ".idx"
+DEFAULT_CACHE_SIZE = 1 << 16
+
+# magic, value count, arena size, source file size, source file mtime (ns); the
+# header and the offset/ID tables use native byte order, like the memory map.
+_HEADER = struct.Struct("=8sQQqq")
+_ENCODING = "utf-8"
+_ERRORS = "surrogatepass"
+_FLUSH_SIZE = 65_536
+
+
+def index_path_for(source: Path) -> Path:
+    """Return the index file stored next to the reference TSV *source*."""
+
+    return source.with_name(source.name + INDEX_SUFFIX)
+
+
+def _source_stamp(source: Optional[Path]) -> Tuple[int, int]:
+    if source is None:
+        return -1, -1
+    stat = source.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _flush(values: array, handle: BinaryIO) -> None:
+    values.tofile(handle)
+    del values[:]
+
+
+def build_namespace_index(
+    path: Path,
+    items: Iterable[Tuple[str, int]],
+    *,
+    source: Optional[Path] = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> None:
+    """Write an index for ``(value, id)`` *items* to *path*.
+
+    Values are stored UTF-8 encoded in one arena sorted by their bytes, which
+    is also code-point order, followed by the matching offsets and IDs.  The
+    size and mtime of *source* are recorded so stale indexes can be detected.
+
+    *items* is consumed once and sorted externally in runs of *run_size*
+    pairs; the offset, ID and arena sections are spilled to files next to
+    *path* and concatenated, so memory stays bounded by *run_size*.
+    """
+
+    source_size, source_mtime = _source_stamp(source)
+    parts: List[Path] = [path.with_name(f"{path.name}.{section}.tmp") for section in ("offsets", "ids", "arena")]
+    temporary = path.with_name(path.name + ".tmp")
+    encoded = ((value.encode(_ENCODING, _ERRORS), identifier) for value, identifier in items)
+    try:
+        count = 0
+        end = 0
+        offsets = array("Q", [0])
+        identifiers = array("q")
+        with parts[0].open("wb") as offsets_handle, parts[1].open("wb") as ids_handle, parts[2].open(
+            "wb"
+        ) as arena_handle:
+            for value, identifier in sorted_items(encoded, path.with_name(path.name + ".runs"), run_size=run_size):
+                arena_handle.write(value)
+                end += len(value)
+                offsets.append(end)
+                identifiers.append(identifier)
+                count += 1
+                if len(identifiers) >= _FLUSH_SIZE:
+                    _flush(offsets, offsets_handle)
+                    _flush(identifiers, ids_handle)
+            _flush(offsets, offsets_handle)
+            _flush(identifiers, ids_handle)
+        with temporary.open("wb") as handle:
+            handle.write(_HEADER.pack(INDEX_MAGIC, count, end, source_size, source_mtime))
+            for part in parts:
+                with part.open("rb") as section:
+                    shutil.copyfileobj(section, handle)
+        os.replace(temporary, path)
+    finally:
+        for part in parts:
+            part.unlink(missing_ok=True)
+
+
+class NamespaceIndex(Mapping[str, int]):
+    """Read-only ``Mapping[str, int]`` served from a memory-mapped index file.
+
+    Lookups binary-search the sorted arena; an LRU cache of *cache_size*
+    entries sits in front for hot values.  The file is mapped read-only, so
+    several worker processes opening the same index share one copy in the
+    page cache, and instances pickle by path.
+    """
+
+    def __init__(self, path: Path, *, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.path = path
+        self._cache_size = cache_size
+        with path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, arena_size, self._source_size, self._source_mtime = _HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a namespace index")
+        self._count = count
+        view = memoryview(self._mmap)
+        start = _HEADER.size
+        offsets_end = start + 8 * (count + 1)
+        ids_end = offsets_end + 8 * count
+        self._offsets = view[start:offsets_end].cast("Q")
+        self._ids = view[offsets_end:ids_end].cast("q")
+        self._arena = view[ids_end : ids_end + arena_size]
+        self._lookup = lru_cache(maxsize=cache_size)(self._search)
+
+    def is_current(self, source: Path) -> bool:
+        """Return whether the index was built from *source* in its current state."""
+
+        return (self._source_size, self._source_mtime) == _source_stamp(source)
+
+    def max_id(self) -> int:
+        """Return the largest ID in the index (0 when empty)."""
+
+        return max(self._ids, default=0)
+
+    def _value_at(self, position: int) -> bytes:
+        return self._arena[self._offsets[position] : self._offsets[position + 1]].tobytes()
+
+    def _search(self, value: str) -> Optional[int]:
+        key = value.encode(_ENCODING, _ERRORS)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._value_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._value_at(low) == key:
+            return self._ids[low]
+        return None
+
+    def __getitem__(self, value: str) -> int:
+        identifier = self._lookup(value)
+        if identifier is None:
+            raise KeyError(value)
+        return identifier
+
+    def get(self, value: str, default: Optional[int] = None) -> Optional[int]:  # type: ignore[override]
+        identifier = self._lookup(value)
+        return default if identifier is None else identifier
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, str) and self._lookup(value) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._count):
+            yield self._value_at(position).decode(_ENCODING, _ERRORS)
+
+    def close(self) -> None:
+        self._lookup.cache_clear()
+        for view in (self._offsets, self._ids, self._arena):
+            view.release()
+        self._mmap.close()
+
+    def __reduce__(self):
+        return (_reopen, (str(self.path), self._cache_size))
+
+
+def _reopen(path: str, cache_size: int) -> NamespaceIndex:
+    return NamespaceIndex(Path(path), cache_size=cache_size)
+
+
+def open_namespace_index(
+    source: Path,
+    loader: Callable[[], Iterable[Tuple[str, int]]],
+    *,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> NamespaceIndex:
+    """Open the index next to *source*, (re)building it from ``loader()`` if missing or stale.
+
+    *loader* returns the ``(value, id)`` pairs held in *source*; they are
+    streamed into :func:`build_namespace_index`, so it may be a generator.
+    """
+
+    path = index_path_for(source)
+    if path.exists():
+        try:
+            index = NamespaceIndex(path, cache_size=cache_size)
+        except (ValueError, struct.error):
+            index = None
+        if index is not None:
+            if index.is_current(source):
+                return index
+            index.close()
+    build_namespace_index(path, loader(), source=source)
+    return NamespaceIndex(path, cache_size=cache_size)
+
+
+__all__ = [
+    "INDEX_SUFFIX",
+    "NamespaceIndex",
+    "build_namespace_index",
+    "index_path_for",
+    "open_namespace_index",
+]
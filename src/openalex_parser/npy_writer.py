@@ -0,0 +1,206 @@
+"""Column-wise ``.npy`` dumps of numeric table columns, written with the stdlib only."""
+from __future__ import annotations
+
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .schema import ColumnDefinition, TableDefinition
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# Fixed header size (magic + length + dict) so the shape can be rewritten in place at close.
+NPY_HEADER_SIZE = 128
+DEFAULT_CHUNK_ITEMS = 1 << 16
+
+# SQL type -> (array typecode, numpy descr, NULL sentinel)
+_NUMERIC_TYPES = {
+    "int2": ("h", "<i2", -1),
+    "smallint": ("h", "<i2", -1),
+    "int4": ("i", "<i4", -1),
+    "integer": ("i", "<i4", -1),
+    "int8": ("q", "<i8", -1),
+    "bigint": ("q", "<i8", -1),
+    "bool": ("b", "|i1", -1),
+    "boolean": ("b", "|i1", -1),
+    "float4": ("f", "<f4", float("nan")),
+    "real": ("f", "<f4", float("nan")),
+    "float8": ("d", "<f8", float("nan")),
+}
+
+DEFAULT_NPY_TABLES: Sequence[str] = ("work_reference", "work_author", "work_concept", "work_topic")
+
+
+def npy_header(descr: str, length: int) -> bytes:
+    """Return a version 1.0 ``.npy`` header for a 1-D array, padded to :data:`NPY_HEADER_SIZE`."""
+
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({length},), }}"
+    padding = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"npy header too long for {descr} with {length} items")
+    text = (header + " " * padding + "\n").encode("latin-1")
+    return NPY_MAGIC + len(text).to_bytes(2, "little") + text
+
+
+def is_numeric_column(column: ColumnDefinition) -> bool:
+    return column.data_type in _NUMERIC_TYPES
+
+
+class _NpyColumnFile:
+    """Append-only 1-D ``.npy`` file whose header is rewritten with the final length."""
+
+    def __init__(self, path: Path, column: ColumnDefinition, chunk_items: int) -> None:
+        self.path = path
+        self.column = column
+        typecode, self._descr, self._null = _NUMERIC_TYPES[column.data_type]
+        self._is_float = typecode in ("f", "d")
+        self._buffer = array(typecode)
+        self._chunk_items = chunk_items
+        self._length = 0
+        self._handle = path.open("wb")
+        self._handle.write(npy_header(self._descr, 0))
+
+    def append(self, value: Any) -> None:
+        if value is None or value == "":
+            value = self._null
+        elif self._is_float:
+            value = float(value)
+        elif not isinstance(value, int):
+            value = int(value)
+        self._buffer.append(value)
+        if len(self._buffer) >= self._chunk_items:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if sys.byteorder == "big":
+            self._buffer.byteswap()
+        self._buffer.tofile(self._handle)
+        self._length += len(self._buffer)
+        del self._buffer[:]
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.flush()
+        self._handle.seek(0)
+        self._handle.write(npy_header(self._descr, self._length))
+        self._handle.close()
+
+
+class NpyTableWriter:
+    """Write every numeric column of one table to ``<dir>/<column>.npy``."""
+
+    def __init__(self, table: TableDefinition, directory: Path, *, chunk_items: int = DEFAULT_CHUNK_ITEMS) -> None:
+        self.table = table
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: List[_NpyColumnFile] = [
+            _NpyColumnFile(directory / f"{column.name}.npy", column, chunk_items)
+            for column in table.columns
+            if is_numeric_column(column)
+        ]
+        if not self._files:
+            raise ValueError(f"Table {table.name} has no integer or float columns to dump as .npy")
+
+    def write_row(self, row: Mapping[str, Any]) -> None:
+        for column_file in self._files:
+            value = row.get(column_file.column.name)
+            try:
+                column_file.append(value)
+            except (TypeError, ValueError, OverflowError) as exc:
+                raise ValueError(
+                    f"Cannot store value {value!r} for {self.table.name}.{column_file.column.name} in .npy"
+                ) from exc
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self) -> None:
+        for column_file in self._files:
+            column_file.flush()
+
+    def close(self) -> None:
+        for column_file in self._files:
+            column_file.close()
+
+    def __enter__(self) -> "NpyTableWriter":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+class NpyWriterManager:
+    """Dump the numeric columns of selected tables; rows for other tables are ignored.
+
+    NULLs are stored as ``-1`` in integer/bool columns and ``NaN`` in float
+    columns.  Files are valid ``.npy`` arrays after :meth:`close` and can be
+    opened with ``numpy.load(path, mmap_mode="r")``.
+    """
+
+    def __init__(
+        self,
+        table_definitions: Mapping[str, TableDefinition],
+        output_dir: Path,
+        tables: Iterable[str] = DEFAULT_NPY_TABLES,
+        *,
+        chunk_items: int = DEFAULT_CHUNK_ITEMS,
+    ) -> None:
+        self._table_definitions = dict(table_definitions)
+        self._output_dir = output_dir
+        self._tables = set(tables)
+        unknown = self._tables.difference(self._table_definitions)
+        if unknown:
+            raise ValueError(f"Unknown tables requested for .npy output: {', '.join(sorted(unknown))}")
+        self._chunk_items = chunk_items
+        self._writers: Dict[str, Optional[NpyTableWriter]] = {}
+
+    def writer_for(self, table_name: str) -> Optional[NpyTableWriter]:
+        try:
+            return self._writers[table_name]
+        except KeyError:
+            writer = None
+            if table_name in self._tables:
+                table = self._table_definitions[table_name]
+                writer = NpyTableWriter(table, self._output_dir / table.name, chunk_items=self._chunk_items)
+            self._writers[table_name] = writer
+            return writer
+
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        writer = self.writer_for(table_name)
+        if writer is not None:
+            writer.write_row(row)
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        writer = self.writer_for(table_name)
+        if writer is not None:
+            writer.write_rows(rows)
+
+    def checkpoint(self) -> None:
+        for writer in self._writers.values():
+            if writer is not None:
+                writer.flush()
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            if writer is not None:
+                writer.close()
+        self._writers.clear()
+
+    def __enter__(self) -> "NpyWriterManager":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "DEFAULT_NPY_TABLES",
+    "NpyTableWriter",
+    "NpyWriterManager",
+    "is_numeric_column",
+    "npy_header",
+]
@@ -0,0 +1,259 @@
+"""Optional Parquet output backend with typed, row-group batched columns."""
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from .schema import ColumnDefinition, TableDefinition
+from .utils import collapse_whitespace, strict_bool, strict_int
+
+try:
+    import pyarrow  # type: ignore[import-untyped]
+    import pyarrow.parquet  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+PARQUET_COMPRESSION_CHOICES = ("snappy", "zstd", "gzip", "none")
+DEFAULT_ROW_GROUP_SIZE = 250_000
+
+# Column types that hold few distinct values (enumeration IDs, sequence numbers,
+# flags, fixed-width codes) and therefore benefit from dictionary encoding.
+_DICTIONARY_TYPES = {"int2", "smallint", "bool", "boolean", "bpchar", "char"}
+
+
+def ensure_parquet_available() -> None:
+    """Raise early if the optional ``pyarrow`` package is missing."""
+
+    if pyarrow is None:
+        raise RuntimeError("Parquet output requires the optional 'pyarrow' package.")
+
+
+def _arrow_type(column: ColumnDefinition):
+    data_type = column.data_type
+    if data_type in ("int2", "smallint"):
+        return pyarrow.int16()
+    if data_type in ("int4", "integer"):
+        return pyarrow.int32()
+    if data_type in ("int8", "bigint"):
+        return pyarrow.int64()
+    if data_type in ("float4", "real"):
+        return pyarrow.float32()
+    if data_type == "float8":
+        return pyarrow.float64()
+    if data_type in ("bool", "boolean"):
+        return pyarrow.bool_()
+    if data_type == "timestamp":
+        return pyarrow.timestamp("us")
+    if data_type == "date":
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return strict_int(value)
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    if value is None or value == "":
+        return None
+    return strict_bool(value)
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return collapse_whitespace(value) or None
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def _same_family(inferred_type, arrow_type) -> bool:
+    if pyarrow.types.is_null(inferred_type):
+        return True
+    if pyarrow.types.is_integer(arrow_type):
+        return pyarrow.types.is_integer(inferred_type)
+    if pyarrow.types.is_boolean(arrow_type):
+        return pyarrow.types.is_boolean(inferred_type)
+    return False
+
+
+def _coercer(arrow_type) -> Callable[[Any], Any]:
+    if pyarrow.types.is_integer(arrow_type):
+        return _as_int
+    if pyarrow.types.is_floating(arrow_type):
+        return _as_float
+    if pyarrow.types.is_boolean(arrow_type):
+        return _as_bool
+    return _as_text
+
+
+class ParquetTableWriter:
+    """Buffer one table's rows column-wise and write them as Parquet row groups."""
+
+    def __init__(
+        self,
+        table: TableDefinition,
+        path: Path,
+        *,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+    ) -> None:
+        ensure_parquet_available()
+        self.table = table
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._columns: List[str] = table.column_names
+        self._types = [_arrow_type(column) for column in table.columns]
+        self._coercers = [_coercer(arrow_type) for arrow_type in self._types]
+        self._schema = pyarrow.schema(
+            [pyarrow.field(name, arrow_type) for name, arrow_type in zip(self._columns, self._types)]
+        )
+        dictionary_columns = [column.name for column in table.columns if column.data_type in _DICTIONARY_TYPES]
+        self._row_group_size = max(row_group_size, 1)
+        self._buffers: List[List[Any]] = [[] for _ in self._columns]
+        self._buffered = 0
+        self._writer = pyarrow.parquet.ParquetWriter(
+            str(self.path),
+            self._schema,
+            compression=None if compression == "none" else compression,
+            use_dictionary=dictionary_columns,
+        )
+
+    def write_row(self, row: Mapping[str, Any]) -> None:
+        for column, buffer in zip(self._columns, self._buffers):
+            buffer.append(row.get(column))
+        self._buffered += 1
+        if self._buffered >= self._row_group_size:
+            self._flush()
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    def _column_array(self, index: int):
+        values = self._buffers[index]
+        arrow_type = self._types[index]
+        if pyarrow.types.is_timestamp(arrow_type) or pyarrow.types.is_date(arrow_type):
+            return pyarrow.array([_as_text(value) for value in values], pyarrow.string()).cast(arrow_type)
+        if pyarrow.types.is_string(arrow_type):
+            return pyarrow.array([_as_text(value) for value in values], arrow_type)
+        column = self._columns[index]
+        try:
+            if pyarrow.types.is_floating(arrow_type):
+                return pyarrow.array(values, arrow_type)
+            # Converting straight to an integer type would truncate floats, so only
+            # columns already holding ints (or bools) take the checked cast.
+            inferred = pyarrow.array(values)
+            if _same_family(inferred.type, arrow_type):
+                return inferred.cast(arrow_type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError):
+            pass
+        coerce = self._coercers[index]
+        coerced = []
+        for value in values:
+            try:
+                coerced.append(coerce(value))
+            except (TypeError, ValueError, OverflowError) as exc:
+                raise ValueError(f"Cannot convert value {value!r} for {self.table.name}.{column}") from exc
+        try:
+            return pyarrow.array(coerced, arrow_type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as exc:
+            raise ValueError(f"Cannot convert values for {self.table.name}.{column}: {exc}") from exc
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        arrays = [self._column_array(index) for index in range(len(self._columns))]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self._schema))
+        self._buffers = [[] for _ in self._columns]
+        self._buffered = 0
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+
+    def __enter__(self) -> "ParquetTableWriter":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+class ParquetWriterManager:
+    """Manage one Parquet file per table keyed by table name."""
+
+    def __init__(
+        self,
+        table_definitions: Mapping[str, TableDefinition],
+        output_dir: Path,
+        *,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+    ) -> None:
+        ensure_parquet_available()
+        self._table_definitions = dict(table_definitions)
+        self._output_dir = output_dir
+        self._row_group_size = row_group_size
+        self._compression = compression
+        self._writers: Dict[str, ParquetTableWriter] = {}
+
+    def writer_for(self, table_name: str) -> ParquetTableWriter:
+        try:
+            return self._writers[table_name]
+        except KeyError:
+            table = self._table_definitions[table_name]
+            writer = ParquetTableWriter(
+                table,
+                self._output_dir / f"{table.name}.parquet",
+                row_group_size=self._row_group_size,
+                compression=self._compression,
+            )
+            self._writers[table_name] = writer
+            return writer
+
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        self.writer_for(table_name).write_row(row)
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        self.writer_for(table_name).write_rows(rows)
+
+    def checkpoint(self) -> None:
+        """Row groups are sized by row count, not by input boundaries; nothing to do."""
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def __enter__(self) -> "ParquetWriterManager":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "PARQUET_COMPRESSION_CHOICES",
+    "ParquetTableWriter",
+    "ParquetWriterManager",
+    "ensure_parquet_available",
+]
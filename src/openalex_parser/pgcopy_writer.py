@@ -0,0 +1,256 @@
+"""PostgreSQL binary COPY writers aligned with the CWTS schema column types."""
+from __future__ import annotations
+
+import struct
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .compression import compression_suffix, open_binary_output
+from .schema import ColumnDefinition, TableDefinition
+from .utils import collapse_whitespace, strict_bool, strict_int
+
+PGCOPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+PGCOPY_HEADER = PGCOPY_SIGNATURE + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+PGCOPY_SUFFIX = ".pgcopy"
+
+_NULL = struct.pack(">i", -1)
+_FIELD_COUNT = struct.Struct(">h")
+_LENGTH = struct.Struct(">i")
+_INT2 = struct.Struct(">ih")
+_INT4 = struct.Struct(">ii")
+_INT8 = struct.Struct(">iq")
+_FLOAT4 = struct.Struct(">if")
+_FLOAT8 = struct.Struct(">id")
+_BOOL_TRUE = struct.pack(">i?", 1, True)
+_BOOL_FALSE = struct.pack(">i?", 1, False)
+
+_PG_EPOCH_DATE = date(2000, 1, 1)
+_PG_EPOCH = datetime(2000, 1, 1)
+
+Encoder = Callable[[Any], bytes]
+
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1]
+    return datetime.fromisoformat(text).replace(tzinfo=None)
+
+
+def _encode_text(value: Any) -> bytes:
+    if isinstance(value, str):
+        text = collapse_whitespace(value)
+    elif isinstance(value, bool):
+        text = "1" if value else "0"
+    elif isinstance(value, (datetime, date)):
+        text = value.isoformat()
+    elif isinstance(value, Decimal):
+        text = format(value, "f")
+    else:
+        text = str(value)
+    data = text.encode("utf-8")
+    if not data:
+        return _NULL
+    return _LENGTH.pack(len(data)) + data
+
+
+def _encode_bool(value: Any) -> bytes:
+    return _BOOL_TRUE if strict_bool(value) else _BOOL_FALSE
+
+
+def _encode_timestamp(value: Any) -> bytes:
+    delta = _as_datetime(value) - _PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return _INT8.pack(8, micros)
+
+
+def _encode_date(value: Any) -> bytes:
+    days = (_as_datetime(value).date() - _PG_EPOCH_DATE).days
+    return _INT4.pack(4, days)
+
+
+_ENCODERS: Dict[str, Encoder] = {
+    "int2": lambda value: _INT2.pack(2, strict_int(value)),
+    "smallint": lambda value: _INT2.pack(2, strict_int(value)),
+    "int4": lambda value: _INT4.pack(4, strict_int(value)),
+    "integer": lambda value: _INT4.pack(4, strict_int(value)),
+    "int8": lambda value: _INT8.pack(8, strict_int(value)),
+    "bigint": lambda value: _INT8.pack(8, strict_int(value)),
+    "float4": lambda value: _FLOAT4.pack(4, float(value)),
+    "real": lambda value: _FLOAT4.pack(4, float(value)),
+    "float8": lambda value: _FLOAT8.pack(8, float(value)),
+    "bool": _encode_bool,
+    "boolean": _encode_bool,
+    "timestamp": _encode_timestamp,
+    "date": _encode_date,
+    "text": _encode_text,
+    "varchar": _encode_text,
+    "bpchar": _encode_text,
+    "char": _encode_text,
+}
+
+
+def encoder_for(column: ColumnDefinition) -> Encoder:
+    """Return the binary COPY field encoder for *column* based on its SQL type."""
+
+    try:
+        return _ENCODERS[column.data_type]
+    except KeyError as exc:
+        raise ValueError(
+            f"Unsupported column type '{column.data_type}' for binary COPY column {column.name}"
+        ) from exc
+
+
+class PgCopyRowEncoder:
+    """Encode rows of one table as binary COPY tuples."""
+
+    def __init__(self, table: TableDefinition) -> None:
+        self.table = table
+        self._columns: List[str] = table.column_names
+        self._encoders: List[Encoder] = [encoder_for(column) for column in table.columns]
+        self._field_count = _FIELD_COUNT.pack(len(self._columns))
+
+    def encode(self, row: Mapping[str, Any]) -> bytes:
+        parts = [self._field_count]
+        for column, encode in zip(self._columns, self._encoders):
+            value = row.get(column)
+            if value is None or value == "":
+                parts.append(_NULL)
+                continue
+            try:
+                parts.append(encode(value))
+            except (TypeError, ValueError, OverflowError, struct.error) as exc:
+                raise ValueError(
+                    f"Cannot encode value {value!r} for {self.table.name}.{column}"
+                ) from exc
+        return b"".join(parts)
+
+
+class PgCopyTableWriter:
+    """Writer producing a single ``COPY ... WITH (FORMAT binary)`` file."""
+
+    def __init__(
+        self,
+        table: TableDefinition,
+        path: Path,
+        *,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        compression_threads: int = 0,
+    ) -> None:
+        self.table = table
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._encoder = PgCopyRowEncoder(table)
+        self._handle = open_binary_output(
+            self.path,
+            compression=compression,
+            level=compression_level,
+            threads=compression_threads,
+        )
+        self._handle.write(PGCOPY_HEADER)
+        self.row_count = 0
+
+    def write_row(self, row: Mapping[str, Any]) -> None:
+        """Write a single tuple adhering to the table's column order."""
+
+        self._handle.write(self._encoder.encode(row))
+        self.row_count += 1
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.write(PGCOPY_TRAILER)
+        self._handle.close()
+
+    def __enter__(self) -> "PgCopyTableWriter":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+class PgCopyWriterManager:
+    """Manage multiple binary COPY writers keyed by table name."""
+
+    def __init__(
+        self,
+        table_definitions: Mapping[str, TableDefinition],
+        output_dir: Path,
+        *,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        compression_threads: int = 0,
+    ) -> None:
+        self._table_definitions = dict(table_definitions)
+        self._output_dir = output_dir
+        self._compression = compression
+        self._compression_level = compression_level
+        self._compression_threads = compression_threads
+        self._writers: Dict[str, PgCopyTableWriter] = {}
+        # Table name -> (file path, row count) for every table closed by this manager.
+        self.outputs: Dict[str, Tuple[Path, int]] = {}
+
+    def writer_for(self, table_name: str) -> PgCopyTableWriter:
+        try:
+            return self._writers[table_name]
+        except KeyError:
+            table = self._table_definitions[table_name]
+            path = self._output_dir / f"{table.name}{PGCOPY_SUFFIX}{compression_suffix(self._compression)}"
+            writer = PgCopyTableWriter(
+                table=table,
+                path=path,
+                compression=self._compression,
+                compression_level=self._compression_level,
+                compression_threads=self._compression_threads,
+            )
+            self._writers[table_name] = writer
+            return writer
+
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        self.writer_for(table_name).write_row(row)
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        self.writer_for(table_name).write_rows(rows)
+
+    def checkpoint(self) -> None:
+        """Flush buffered output at an input boundary."""
+
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        for table_name, writer in self._writers.items():
+            writer.close()
+            self.outputs[table_name] = (writer.path, writer.row_count)
+        self._writers.clear()
+
+    def __enter__(self) -> "PgCopyWriterManager":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "PGCOPY_HEADER",
+    "PGCOPY_TRAILER",
+    "PgCopyRowEncoder",
+    "PgCopyTableWriter",
+    "PgCopyWriterManager",
+    "encoder_for",
+]
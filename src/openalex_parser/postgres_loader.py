@@ -0,0 +1,280 @@
+"""Stream rows straight into PostgreSQL through parallel binary ``COPY FROM STDIN``."""
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .pgcopy_writer import PGCOPY_HEADER, PGCOPY_TRAILER, PgCopyRowEncoder
+from .schema import TableDefinition
+
+try:
+    import psycopg  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = None
+
+# Tables large enough in a full works run to deserve their own connection.
+DEFAULT_DEDICATED_TABLES: Sequence[str] = (
+    "work",
+    "work_abstract",
+    "work_affiliation",
+    "work_affiliation_institution",
+    "work_author",
+    "work_author_affiliation",
+    "work_concept",
+    "work_location",
+    "work_reference",
+    "work_related",
+    "work_title",
+    "work_topic",
+)
+DEFAULT_POOL_SIZE = 4
+DEFAULT_BUFFER_SIZE = 8 << 20
+DEFAULT_QUEUE_DEPTH = 4
+
+
+def ensure_postgres_available() -> None:
+    """Raise early if the optional ``psycopg`` package is missing."""
+
+    if psycopg is None:
+        raise RuntimeError("PostgreSQL output requires the optional 'psycopg' (v3) package.")
+
+
+def copy_statement(table: TableDefinition) -> str:
+    columns = ", ".join(f'"{name}"' for name in table.column_names)
+    return f"COPY {table.qualified_name} ({columns}) FROM STDIN WITH (FORMAT binary)"
+
+
+class _CopyConnection:
+    """Worker thread that owns one connection and at most one active COPY.
+
+    Buffers arrive through a bounded queue, so the parser blocks (back-pressure)
+    when the server cannot keep up instead of growing memory without limit.
+    Once the worker fails, its error is raised by every later send, commit
+    and close: the rows queued after it were dropped, so the connection
+    accepts no further writes.
+    """
+
+    def __init__(self, dsn: str, name: str, queue_depth: int = DEFAULT_QUEUE_DEPTH) -> None:
+        self.name = name
+        self._connection = psycopg.connect(dsn)
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(queue_depth, 1))
+        self._error: Optional[BaseException] = None
+        self._active_table: Optional[TableDefinition] = None
+        self._copy_context = None
+        self._copy = None
+        self._thread = threading.Thread(target=self._run, name=f"pg-copy-{name}", daemon=True)
+        self._thread.start()
+
+    def send(self, table: TableDefinition, data: bytes) -> None:
+        self._raise_pending()
+        self._queue.put(("data", table, data))
+
+    def commit(self) -> None:
+        self._raise_pending()
+        done = threading.Event()
+        self._queue.put(("commit", done))
+        done.wait()
+        self._raise_pending()
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(("stop",))
+        self._thread.join()
+        self._raise_pending()
+
+    def _run(self) -> None:
+        while True:
+            message = self._queue.get()
+            kind = message[0]
+            try:
+                if self._error is None:
+                    if kind == "data":
+                        self._write(message[1], message[2])
+                    elif kind in ("commit", "stop"):
+                        self._finish_copy()
+                        self._connection.commit()
+            except BaseException as exc:  # pragma: no cover - surfaced on the producer side
+                self._error = exc
+            if kind == "commit":
+                message[1].set()
+            elif kind == "stop":
+                self._connection.close()
+                return
+
+    def _write(self, table: TableDefinition, data: bytes) -> None:
+        if self._active_table is not table:
+            self._finish_copy()
+            cursor = self._connection.cursor()
+            self._copy_context = cursor.copy(copy_statement(table))
+            self._copy = self._copy_context.__enter__()
+            self._copy.write(PGCOPY_HEADER)
+            self._active_table = table
+        self._copy.write(data)
+
+    def _finish_copy(self) -> None:
+        if self._copy_context is None:
+            return
+        context, self._copy_context = self._copy_context, None
+        self._copy.write(PGCOPY_TRAILER)
+        self._copy = None
+        self._active_table = None
+        context.__exit__(None, None, None)
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+class PostgresWriterManager:
+    """Stream rows into PostgreSQL tables instead of writing files.
+
+    Tables listed in *dedicated_tables* get their own connection; all other
+    tables share a pool of *pool_size* connections.  Rows are encoded in the
+    binary COPY format, buffered per table and shipped in *buffer_size* chunks.
+    :meth:`checkpoint` (called at part-file boundaries) commits every open
+    transaction.
+    """
+
+    def __init__(
+        self,
+        table_definitions: Mapping[str, TableDefinition],
+        dsn: str,
+        *,
+        dedicated_tables: Iterable[str] = DEFAULT_DEDICATED_TABLES,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        create_tables: bool = False,
+        unlogged: bool = False,
+    ) -> None:
+        ensure_postgres_available()
+        self._table_definitions = dict(table_definitions)
+        self._dsn = dsn
+        self._dedicated_tables = set(dedicated_tables)
+        self._pool_size = max(pool_size, 1)
+        self._buffer_size = max(buffer_size, 1)
+        self._encoders: Dict[str, PgCopyRowEncoder] = {}
+        self._buffers: Dict[str, bytearray] = {}
+        self._routes: Dict[str, _CopyConnection] = {}
+        self._dedicated: Dict[str, _CopyConnection] = {}
+        self._pool: List[_CopyConnection] = []
+        self._next_pool_slot = 0
+        self._created_tables: List[TableDefinition] = []
+        if create_tables:
+            self._create_tables(unlogged=unlogged)
+
+    # ------------------------------------------------------------------
+    def _create_tables(self, *, unlogged: bool) -> None:
+        """Create missing tables without constraints; indexes follow in :meth:`close`."""
+
+        with psycopg.connect(self._dsn, autocommit=True) as connection:
+            for table in self._table_definitions.values():
+                exists = connection.execute("SELECT to_regclass(%s)", (table.qualified_name,)).fetchone()[0]
+                if exists is not None:
+                    continue
+                connection.execute(table.create_statement(unlogged=unlogged, with_constraints=False))
+                self._created_tables.append(table)
+        if self._created_tables:
+            print(f"Created {len(self._created_tables)} tables{' (unlogged)' if unlogged else ''}; indexes deferred.")
+
+    def _connection_for(self, table_name: str) -> _CopyConnection:
+        try:
+            return self._routes[table_name]
+        except KeyError:
+            pass
+        if table_name in self._dedicated_tables:
+            connection = _CopyConnection(self._dsn, table_name)
+            self._dedicated[table_name] = connection
+        elif len(self._pool) < self._pool_size:
+            connection = _CopyConnection(self._dsn, f"pool-{len(self._pool) + 1}")
+            self._pool.append(connection)
+        else:
+            connection = self._pool[self._next_pool_slot % len(self._pool)]
+            self._next_pool_slot += 1
+        self._routes[table_name] = connection
+        return connection
+
+    def _flush(self, table_name: str) -> None:
+        buffer = self._buffers[table_name]
+        if not buffer:
+            return
+        self._connection_for(table_name).send(self._table_definitions[table_name], bytes(buffer))
+        buffer.clear()
+
+    def _connections(self) -> List[_CopyConnection]:
+        return list(self._dedicated.values()) + self._pool
+
+    # ------------------------------------------------------------------
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        try:
+            encoder = self._encoders[table_name]
+        except KeyError:
+            encoder = PgCopyRowEncoder(self._table_definitions[table_name])
+            self._encoders[table_name] = encoder
+            self._buffers[table_name] = bytearray()
+        buffer = self._buffers[table_name]
+        buffer += encoder.encode(row)
+        if len(buffer) >= self._buffer_size:
+            self._flush(table_name)
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        """Ship every buffered row and commit all open transactions."""
+
+        for table_name in self._buffers:
+            self._flush(table_name)
+        for connection in self._connections():
+            connection.commit()
+
+    def close(self) -> None:
+        try:
+            self.checkpoint()
+        finally:
+            error: Optional[BaseException] = None
+            for connection in self._connections():
+                try:
+                    connection.close()
+                except BaseException as exc:
+                    error = error or exc
+            self._dedicated.clear()
+            self._pool.clear()
+            self._routes.clear()
+            if error is not None:
+                raise error
+        if self._created_tables:
+            self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Add constraints and indexes to the tables created by this run, in parallel sessions."""
+
+        print(f"Building constraints and indexes for {len(self._created_tables)} tables...")
+
+        def build(table: TableDefinition) -> None:
+            with psycopg.connect(self._dsn, autocommit=True) as connection:
+                for statement in table.constraint_statements() + list(table.indexes):
+                    connection.execute(statement)
+                connection.execute(f"ANALYZE {table.qualified_name}")
+
+        with ThreadPoolExecutor(max_workers=self._pool_size) as executor:
+            for future in [executor.submit(build, table) for table in self._created_tables]:
+                future.result()
+        self._created_tables = []
+
+    def __enter__(self) -> "PostgresWriterManager":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "DEFAULT_DEDICATED_TABLES",
+    "PostgresWriterManager",
+    "copy_statement",
+    "ensure_postgres_available",
+]
@@ -1,11 +1,11 @@
 """Helpers to load and manage reference enumeration data."""
 from __future__ import annotations
 
-import csv
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
+from .catalog_cache import read_reference_pairs
 from .emitter import TableEmitter
 
 
@@ -20,25 +20,37 @@ class EnumerationConfig:
 
 
 class EnumerationRegistry:
-    """Manage enumerations such as work types or licenses."""
+    """Manage enumerations such as work types or licenses.
+
+    :meth:`id_for` memoises its answer per distinct raw value, so repeated
+    values skip normalisation.  With a *collector*, every lookup is reported
+    to it (not only the first one per value), so callers can attribute the
+    values to the input they came from; lookups then return 0.
+    """
 
     def __init__(
         self,
         emitter: TableEmitter,
         reference_dir: Optional[Path] = None,
         collector: Optional[Callable[[str, str], None]] = None,
+        on_missing: Optional[Callable[[str, str], int]] = None,
     ) -> None:
         self._emitter = emitter
         self._reference_dir = reference_dir
         self._collector = collector
+        self._on_missing = on_missing
         self._configs: Dict[str, EnumerationConfig] = {}
         self._value_to_id: Dict[str, Dict[str, int]] = {}
         self._id_to_value: Dict[str, Dict[int, str]] = {}
+        self._raw_to_id: Dict[str, Dict[str, Optional[int]]] = {}
+        self._raw_to_value: Dict[str, Dict[str, str]] = {}
 
     def register(self, config: EnumerationConfig) -> None:
         self._configs[config.table] = config
         self._value_to_id.setdefault(config.table, {})
         self._id_to_value.setdefault(config.table, {})
+        self._raw_to_id[config.table] = {}
+        self._raw_to_value[config.table] = {}
         if config.reference_filename and self._reference_dir:
             self._load_reference(config)
 
@@ -46,31 +58,41 @@ class EnumerationRegistry:
         path = self._reference_dir / config.reference_filename
         if not path.exists():
             return
-        with path.open(encoding="utf-8-sig", newline="") as handle:
-            sample = handle.read(2048)
-            handle.seek(0)
-            delimiter = "\t" if "\t" in sample else ","
-            reader = csv.DictReader(handle, delimiter=delimiter)
-            for row in reader:
-                raw_id = row.get(config.id_column)
-                raw_value = row.get(config.value_column)
-                if not raw_id or not raw_value:
-                    continue
-                try:
-                    identifier = int(raw_id)
-                except ValueError:
-                    continue
-                value = self._normalise(config, raw_value)
-                if not value:
-                    continue
-                self._value_to_id[config.table][value] = identifier
-                self._id_to_value[config.table][identifier] = value
-                emit_row = {config.id_column: identifier, config.value_column: value}
-                self._emitter.emit(config.table, emit_row)
+        values, identifiers = read_reference_pairs(path, config.id_column, config.value_column)
+        for raw_value, identifier in zip(values, identifiers):
+            value = self._normalise(config, raw_value)
+            if not value:
+                continue
+            self._value_to_id[config.table][value] = identifier
+            self._id_to_value[config.table][identifier] = value
+            emit_row = {config.id_column: identifier, config.value_column: value}
+            self._emitter.emit(config.table, emit_row)
 
     def id_for(self, table: str, raw_value: Optional[str]) -> Optional[int]:
         if raw_value is None:
             return None
+        if self._collector is not None:
+            return self._collect(table, raw_value)
+        resolved = self._raw_to_id[table]
+        try:
+            return resolved[raw_value]
+        except KeyError:
+            pass
+        identifier = self._resolve(table, raw_value)
+        resolved[raw_value] = identifier
+        return identifier
+
+    def _collect(self, table: str, raw_value: str) -> Optional[int]:
+        normalised = self._raw_to_value[table]
+        value = normalised.get(raw_value)
+        if value is None:
+            value = normalised[raw_value] = self._normalise(self._configs[table], raw_value)
+        if not value:
+            return None
+        self._collector(table, value)
+        return 0
+
+    def _resolve(self, table: str, raw_value: str) -> Optional[int]:
         config = self._configs[table]
         value = self._normalise(config, raw_value)
         if not value:
@@ -78,10 +100,12 @@ class EnumerationRegistry:
         table_map = self._value_to_id[table]
         if value in table_map:
             return table_map[value]
-        if self._collector is not None:
-            self._collector(table, value)
-            table_map[value] = 0
-            return 0
+        if self._on_missing is not None:
+            identifier = self._on_missing(table, value)
+            table_map[value] = identifier
+            self._id_to_value[table][identifier] = value
+            self._emitter.emit(table, {config.id_column: identifier, config.value_column: value})
+            return identifier
         raise KeyError(f"Value '{value}' not found in enumeration '{table}' assignments.")
 
     @staticmethod
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, List
+from typing import Collection, Dict, List
 
 
 @dataclass(frozen=True)
@@ -14,6 +14,15 @@ class ColumnDefinition:
     name: str
     raw_definition: str
 
+    @property
+    def data_type(self) -> str:
+        """Return the lower-cased base SQL type (e.g. ``int8`` or ``varchar``)."""
+
+        parts = self.raw_definition.split()
+        if len(parts) < 2:
+            return ""
+        return parts[1].split("(", 1)[0].lower()
+
 
 @dataclass(frozen=True)
 class TableDefinition:
@@ -21,6 +30,8 @@ class TableDefinition:
 
     name: str
     columns: List[ColumnDefinition]
+    constraints: List[str] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
 
     @property
     def column_names(self) -> List[str]:
@@ -28,6 +39,58 @@ class TableDefinition:
 
         return [column.name for column in self.columns]
 
+    @property
+    def qualified_name(self) -> str:
+        return f"public.{self.name}"
+
+    def create_statement(self, *, unlogged: bool = False, with_constraints: bool = True) -> str:
+        """Return a ``CREATE TABLE`` statement, optionally without inline constraints."""
+
+        lines = [column.raw_definition for column in self.columns]
+        if with_constraints:
+            lines.extend(self.constraints)
+        body = ",\n\t".join(lines)
+        prefix = "CREATE UNLOGGED TABLE" if unlogged else "CREATE TABLE"
+        return f"{prefix} IF NOT EXISTS {self.qualified_name} (\n\t{body}\n);"
+
+    def constraint_statements(self) -> List[str]:
+        """Return ``ALTER TABLE`` statements that add the table constraints after loading."""
+
+        return [f"ALTER TABLE {self.qualified_name} ADD {constraint};" for constraint in self.constraints]
+
+    def without_columns(self, names: Collection[str]) -> "TableDefinition":
+        """Return a copy of the table without the columns *names* and the indexes that use them.
+
+        Raises :class:`ValueError` for unknown columns and for columns that are
+        ``NOT NULL`` or part of a constraint, since loading a table without them
+        would fail.
+        """
+
+        known = set(self.column_names)
+        unknown = sorted(set(names).difference(known))
+        if unknown:
+            raise ValueError(f"Table {self.name} has no column {', '.join(unknown)}")
+        patterns = {name: re.compile(rf"\b{re.escape(name)}\b") for name in names}
+        for column in self.columns:
+            if column.name in patterns and _NOT_NULL_PATTERN.search(column.raw_definition):
+                raise ValueError(f"Column {self.name}.{column.name} is NOT NULL and cannot be dropped")
+        for constraint in self.constraints:
+            for name, pattern in patterns.items():
+                if pattern.search(constraint):
+                    raise ValueError(f"Column {self.name}.{name} is part of a constraint and cannot be dropped")
+        return replace(
+            self,
+            columns=[column for column in self.columns if column.name not in patterns],
+            indexes=[
+                index
+                for index in self.indexes
+                if not any(pattern.search(index[index.find("("):]) for pattern in patterns.values())
+            ],
+        )
+
+
+_NOT_NULL_PATTERN = re.compile(r"\bNOT\s+NULL\b", re.IGNORECASE)
+
 
 def _normalise_identifier(identifier: str) -> str:
     """Remove schema qualifiers or double quotes from an identifier."""
@@ -45,10 +108,12 @@ def parse_schema(sql: str) -> Dict[str, TableDefinition]:
 
     table_start_pattern = re.compile(r"CREATE TABLE\s+public\.([\"A-Za-z0-9_]+)\s*\(", re.IGNORECASE)
     column_pattern = re.compile(r'^("?[A-Za-z0-9_]+"?)')
+    index_pattern = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b.*?\sON\s+(?:ONLY\s+)?([\"A-Za-z0-9_.]+)", re.IGNORECASE)
 
     tables: Dict[str, TableDefinition] = {}
     current_table_name: str | None = None
     current_columns: List[ColumnDefinition] = []
+    current_constraints: List[str] = []
 
     for original_line in sql.splitlines():
         line = original_line.strip()
@@ -64,20 +129,32 @@ def parse_schema(sql: str) -> Dict[str, TableDefinition]:
                 )
             current_table_name = _normalise_identifier(table_match.group(1))
             current_columns = []
+            current_constraints = []
             continue
 
         if current_table_name is None:
-            # Ignore everything until we hit the next CREATE TABLE statement.
+            # Keep index definitions; ignore everything else until the next CREATE TABLE.
+            index_match = index_pattern.match(line)
+            if index_match:
+                table_name = _normalise_identifier(index_match.group(1))
+                if table_name in tables:
+                    tables[table_name].indexes.append(line)
             continue
 
         if line.startswith(")"):
-            tables[current_table_name] = TableDefinition(name=current_table_name, columns=current_columns)
+            tables[current_table_name] = TableDefinition(
+                name=current_table_name,
+                columns=current_columns,
+                constraints=current_constraints,
+            )
             current_table_name = None
             current_columns = []
+            current_constraints = []
             continue
 
         upper_line = line.upper()
         if upper_line.startswith("CONSTRAINT") or upper_line.startswith("PRIMARY KEY") or upper_line.startswith("UNIQUE") or upper_line.startswith("FOREIGN KEY"):
+            current_constraints.append(line.rstrip(","))
             continue
 
         # Attempt to parse a column definition.
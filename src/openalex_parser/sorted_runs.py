@@ -0,0 +1,140 @@
+"""External sorts: large string sets in catalog order (casefold, then code point) and tuple streams."""
+from __future__ import annotations
+
+import heapq
+import pickle
+import shutil
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+DEFAULT_RUN_SIZE = 1_000_000
+_BATCH_SIZE = 65_536
+
+_Item = TypeVar("_Item", bound=tuple)
+
+
+def catalog_order(values: Set[str]) -> List[Tuple[str, str]]:
+    """Return ``(casefold, value)`` pairs for *values* in catalog order."""
+
+    return sorted([(value.casefold(), value) for value in values])
+
+
+def _write_run(path: Path, items: List[tuple]) -> None:
+    with path.open("wb") as handle:
+        for start in range(0, len(items), _BATCH_SIZE):
+            pickle.dump(items[start : start + _BATCH_SIZE], handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_run(path: Path) -> Iterator[tuple]:
+    with path.open("rb") as handle:
+        while True:
+            try:
+                batch = pickle.load(handle)
+            except EOFError:
+                return
+            yield from batch
+
+
+def write_sorted_run(path: Path, items: Iterable[tuple]) -> None:
+    """Sort *items* and write them to *path* as one run for :func:`merge_sorted_runs`."""
+
+    _write_run(path, sorted(items))
+
+
+def merge_sorted_runs(paths: Iterable[Path]) -> Iterator[tuple]:
+    """Yield the tuples of the sorted runs at *paths* as one sorted stream."""
+
+    return heapq.merge(*(_read_run(path) for path in paths))
+
+
+def sorted_items(items: Iterable[_Item], run_dir: Path, *, run_size: int = DEFAULT_RUN_SIZE) -> Iterator[_Item]:
+    """Yield the tuples *items* in sorted order, holding at most *run_size* of them in memory.
+
+    Sorted runs are spilled to *run_dir*, which is removed once the merge is
+    exhausted or closed.
+    """
+
+    run_size = max(run_size, 1)
+    buffered: List[_Item] = []
+    runs: List[Path] = []
+    try:
+        for item in items:
+            buffered.append(item)
+            if len(buffered) >= run_size:
+                run_dir.mkdir(parents=True, exist_ok=True)
+                buffered.sort()
+                runs.append(run_dir / f"run-{len(runs):05d}.pickle")
+                _write_run(runs[-1], buffered)
+                buffered = []
+        buffered.sort()
+        if not runs:
+            yield from buffered
+            return
+        yield from heapq.merge(buffered, *(_read_run(path) for path in runs))
+    finally:
+        if runs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+class SortedValueRuns:
+    """Collect distinct strings and yield them in catalog order with bounded memory.
+
+    Values are buffered in a set; once it holds *run_size* values it is
+    sorted by ``(value.casefold(), value)`` and spilled to *run_dir* as a
+    pickled run of ``(casefold, value)`` pairs, so the key is computed once
+    per value.  :meth:`sorted_values` streams a k-way merge of the runs and
+    the remaining buffer, dropping duplicates across runs.  The order is the
+    one produced by ``sorted(values, key=lambda text: (text.casefold(), text))``.
+    """
+
+    def __init__(self, run_dir: Path, *, run_size: int = DEFAULT_RUN_SIZE) -> None:
+        self._run_dir = run_dir
+        self._run_size = max(run_size, 1)
+        self._values: Set[str] = set()
+        self._runs: List[Path] = []
+
+    def add(self, value: str) -> None:
+        values = self._values
+        values.add(value)
+        if len(values) >= self._run_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        self._run_dir.mkdir(parents=True, exist_ok=True)
+        path = self._run_dir / f"run-{len(self._runs):05d}.pickle"
+        pairs = catalog_order(self._values)
+        self._values = set()
+        _write_run(path, pairs)
+        self._runs.append(path)
+
+    def sorted_values(self) -> Iterator[str]:
+        """Yield every distinct value once, in catalog order."""
+
+        buffered = catalog_order(self._values)
+        self._values = set()
+        if not self._runs:
+            for _key, value in buffered:
+                yield value
+            return
+        previous: Optional[str] = None
+        for _key, value in heapq.merge(buffered, *(_read_run(path) for path in self._runs)):
+            if value != previous:
+                yield value
+                previous = value
+
+    def close(self) -> None:
+        """Drop the buffer and delete the spilled runs."""
+
+        self._values = set()
+        self._runs = []
+        shutil.rmtree(self._run_dir, ignore_errors=True)
+
+
+__all__ = [
+    "DEFAULT_RUN_SIZE",
+    "SortedValueRuns",
+    "catalog_order",
+    "merge_sorted_runs",
+    "sorted_items",
+    "write_sorted_run",
+]
@@ -0,0 +1,227 @@
+"""SQLite output backend translating the CWTS schema to a local database."""
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from .schema import TableDefinition
+from .utils import collapse_whitespace
+
+DEFAULT_BATCH_SIZE = 50_000
+DEFAULT_CACHE_MB = 1024
+
+_SQLITE_TYPES = {
+    "int2": "INTEGER",
+    "int4": "INTEGER",
+    "int8": "INTEGER",
+    "smallint": "INTEGER",
+    "integer": "INTEGER",
+    "bigint": "INTEGER",
+    "bool": "INTEGER",
+    "boolean": "INTEGER",
+    "float4": "REAL",
+    "float8": "REAL",
+    "real": "REAL",
+}
+
+_INDEX_PATTERN = re.compile(
+    r"CREATE\s+(UNIQUE\s+)?INDEX\s+(\S+)\s+ON\s+(?:ONLY\s+)?\S+\s+(?:USING\s+\w+\s+)?\((.*)\)\s*;?\s*$",
+    re.IGNORECASE,
+)
+_KEY_PATTERN = re.compile(
+    r"(?:CONSTRAINT\s+(\S+)\s+)?(PRIMARY\s+KEY|UNIQUE)\s*\((.*)\)",
+    re.IGNORECASE,
+)
+
+
+def _quote(identifier: str) -> str:
+    return f'"{identifier}"'
+
+
+def _sqlite_value(value: Any) -> Any:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        return collapse_whitespace(value) or None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def create_table_sql(table: TableDefinition) -> str:
+    """Translate a CWTS table definition into a constraint-free SQLite ``CREATE TABLE``."""
+
+    columns = ", ".join(
+        f"{_quote(column.name)} {_SQLITE_TYPES.get(column.data_type, 'TEXT')}" for column in table.columns
+    )
+    return f"CREATE TABLE IF NOT EXISTS {_quote(table.name)} ({columns})"
+
+
+def index_sql(table: TableDefinition) -> List[str]:
+    """Translate the table's keys and btree indexes into SQLite ``CREATE INDEX`` statements.
+
+    SQLite cannot add a primary key after the fact, so keys become unique indexes.
+    """
+
+    statements: List[str] = []
+    for constraint in table.constraints:
+        match = _KEY_PATTERN.search(constraint)
+        if not match:
+            continue
+        name = match.group(1) or f"{table.name}_key{len(statements) + 1}"
+        statements.append(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {_quote(table.name)} ({match.group(3)})"
+        )
+    for statement in table.indexes:
+        match = _INDEX_PATTERN.match(statement)
+        if not match:
+            continue
+        unique = "UNIQUE " if match.group(1) else ""
+        statements.append(
+            f"CREATE {unique}INDEX IF NOT EXISTS {match.group(2)} ON {_quote(table.name)} ({match.group(3)})"
+        )
+    return statements
+
+
+class SqliteWriterManager:
+    """Insert rows into a single SQLite database, one table per schema table.
+
+    Rows are batched per table and inserted with ``executemany`` inside large
+    transactions that are committed at part-file boundaries.  The database is
+    tuned for bulk loading (WAL, ``synchronous=OFF``, large page cache) and
+    indexes are only created in :meth:`close`, which raises
+    :class:`sqlite3.IntegrityError` if duplicate keys prevent any of them.
+    """
+
+    def __init__(
+        self,
+        table_definitions: Mapping[str, TableDefinition],
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache_mb: int = DEFAULT_CACHE_MB,
+    ) -> None:
+        self._table_definitions = dict(table_definitions)
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = max(batch_size, 1)
+        self._connection = sqlite3.connect(str(path), isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(f"PRAGMA cache_size=-{max(cache_mb, 1) * 1024}")
+        self._connection.execute("PRAGMA temp_store=MEMORY")
+        existing = {
+            name for (name,) in self._connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        self._created_tables: List[TableDefinition] = []
+        for table in self._table_definitions.values():
+            if table.name in existing:
+                continue
+            self._connection.execute(create_table_sql(table))
+            self._created_tables.append(table)
+        self._statements: Dict[str, Tuple[str, List[str]]] = {}
+        self._pending: Dict[str, List[tuple]] = {}
+        self._row_counts: Dict[str, int] = {}
+        self._insert_seconds: Dict[str, float] = {}
+        self._in_transaction = False
+
+    def _statement_for(self, table_name: str) -> Tuple[str, List[str]]:
+        try:
+            return self._statements[table_name]
+        except KeyError:
+            table = self._table_definitions[table_name]
+            columns = table.column_names
+            placeholders = ", ".join("?" for _ in columns)
+            column_list = ", ".join(_quote(column) for column in columns)
+            statement = f"INSERT INTO {_quote(table.name)} ({column_list}) VALUES ({placeholders})"
+            self._statements[table_name] = (statement, columns)
+            self._pending[table_name] = []
+            self._row_counts[table_name] = 0
+            self._insert_seconds[table_name] = 0.0
+            return self._statements[table_name]
+
+    def _flush(self, table_name: str) -> None:
+        pending = self._pending[table_name]
+        if not pending:
+            return
+        if not self._in_transaction:
+            self._connection.execute("BEGIN")
+            self._in_transaction = True
+        started = time.perf_counter()
+        self._connection.executemany(self._statements[table_name][0], pending)
+        self._insert_seconds[table_name] += time.perf_counter() - started
+        self._row_counts[table_name] += len(pending)
+        pending.clear()
+
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        _statement, columns = self._statement_for(table_name)
+        pending = self._pending[table_name]
+        pending.append(tuple(_sqlite_value(row.get(column)) for column in columns))
+        if len(pending) >= self._batch_size:
+            self._flush(table_name)
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        """Insert all pending rows and commit the running transaction."""
+
+        for table_name in self._pending:
+            self._flush(table_name)
+        if self._in_transaction:
+            self._connection.execute("COMMIT")
+            self._in_transaction = False
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        failures: List[str] = []
+        try:
+            self.checkpoint()
+            if self._created_tables:
+                failures = self._build_indexes()
+            self._connection.execute("PRAGMA optimize")
+        finally:
+            self._connection.close()
+            self._connection = None
+        self._report()
+        if failures:
+            raise sqlite3.IntegrityError("Could not build SQLite indexes:\n" + "\n".join(failures))
+
+    def _build_indexes(self) -> List[str]:
+        """Create the indexes of the tables created by this manager and return the ones that failed."""
+
+        print(f"Building SQLite indexes for {len(self._created_tables)} tables...")
+        failures: List[str] = []
+        for table in self._created_tables:
+            for statement in index_sql(table):
+                try:
+                    self._connection.execute(statement)
+                except sqlite3.IntegrityError as exc:
+                    failures.append(f"  {table.name}: {exc} ({statement})")
+        self._created_tables = []
+        return failures
+
+    def _report(self) -> None:
+        for table_name in sorted(self._row_counts):
+            count = self._row_counts[table_name]
+            seconds = self._insert_seconds[table_name]
+            rate = count / seconds if seconds > 0 else float("inf")
+            print(f"  sqlite {table_name}: {count:,} rows ({rate:,.0f} rows/s)")
+
+    def __enter__(self) -> "SqliteWriterManager":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+__all__ = ["SqliteWriterManager", "create_table_sql", "index_sql"]
@@ -3,10 +3,11 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..identifiers import StableIdGenerator
 from ..reference import EnumerationRegistry
 from ..utils import (
+    cached_numeric_openalex_id,
     canonical_openalex_id,
     canonical_orcid,
     extract_scopus_author_id,
@@ -29,15 +30,23 @@ class AuthorTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_author, ("author",)),
+                (self._emit_alternative_names, ("author_alternative_name",)),
+                (self._emit_affiliations, ("author_institution", "author_institution_year")),
+                (self._emit_last_known_institutions, ("author_last_known_institution",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         author_id = numeric_openalex_id(record.get("id"))
         if author_id is None:
             return
-        self._emit_author(author_id, record)
-        self._emit_alternative_names(author_id, record)
-        self._emit_affiliations(author_id, record)
-        self._emit_last_known_institutions(author_id, record)
+        for step in self._steps:
+            step(author_id, record)
 
     # ------------------------------------------------------------------
     def _emit_author(self, author_id: int, record: Dict[str, object]) -> None:
@@ -83,7 +92,7 @@ class AuthorTransformer:
         inst_seq = 0
         for affiliation in affiliations:
             institution = affiliation.get("institution") if isinstance(affiliation, dict) else None
-            institution_id = numeric_openalex_id(institution.get("id")) if institution else None
+            institution_id = cached_numeric_openalex_id(institution.get("id")) if institution else None
             if institution_id is None:
                 continue
             inst_seq += 1
@@ -126,7 +135,7 @@ class AuthorTransformer:
         seen_ids: set[int] = set()
         seq = 0
         for institution in institutions:
-            institution_id = numeric_openalex_id(institution.get("id"))
+            institution_id = cached_numeric_openalex_id(institution.get("id"))
             if institution_id is None or institution_id in seen_ids:
                 continue
             seen_ids.add(institution_id)
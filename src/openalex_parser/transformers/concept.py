@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..reference import EnumerationRegistry
 from ..identifiers import StableIdGenerator
 from ..utils import (
@@ -28,16 +28,24 @@ class ConceptTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_concept, ("concept",)),
+                (self._emit_ancestors, ("concept_ancestor",)),
+                (self._emit_international, ("concept_international_name", "concept_international_description")),
+                (self._emit_related, ("concept_related",)),
+                (self._emit_umls, ("concept_umls_aui", "concept_umls_cui")),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         concept_id = numeric_openalex_id(record.get("id"))
         if concept_id is None:
             return
-        self._emit_concept(concept_id, record)
-        self._emit_ancestors(concept_id, record)
-        self._emit_international(concept_id, record)
-        self._emit_related(concept_id, record)
-        self._emit_umls(concept_id, record)
+        for step in self._steps:
+            step(concept_id, record)
 
     # ------------------------------------------------------------------
     def _emit_concept(self, concept_id: int, record: Dict[str, object]) -> None:
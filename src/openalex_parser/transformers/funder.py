@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..reference import EnumerationRegistry
 from ..identifiers import StableIdGenerator
 from ..utils import (
@@ -27,14 +27,22 @@ class FunderTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_funder, ("funder",)),
+                (self._emit_alternative_names, ("funder_alternative_name",)),
+                (self._emit_publishers, ("funder_publisher",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         funder_id = numeric_openalex_id(record.get("id"))
         if funder_id is None:
             return
-        self._emit_funder(funder_id, record)
-        self._emit_alternative_names(funder_id, record)
-        self._emit_publishers(funder_id, record)
+        for step in self._steps:
+            step(funder_id, record)
 
     # ------------------------------------------------------------------
     def _emit_funder(self, funder_id: int, record: Dict[str, object]) -> None:
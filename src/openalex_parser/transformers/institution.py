@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..identifiers import StableIdGenerator
 from ..reference import EnumerationRegistry
 from ..utils import (
@@ -30,19 +30,27 @@ class InstitutionTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_institution, ("institution", "city", "country")),
+                (self._emit_acronyms, ("institution_acronym",)),
+                (self._emit_alternative_names, ("institution_alternative_name",)),
+                (self._emit_international_names, ("institution_international_name",)),
+                (self._emit_associated, ("institution_associated",)),
+                (self._emit_roles, ("institution_funder", "institution_publisher")),
+                (self._emit_repositories, ("institution_repository",)),
+                (self._emit_lineage, ("institution_lineage",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         institution_id = numeric_openalex_id(record.get("id"))
         if institution_id is None:
             return
-        self._emit_institution(institution_id, record)
-        self._emit_acronyms(institution_id, record)
-        self._emit_alternative_names(institution_id, record)
-        self._emit_international_names(institution_id, record)
-        self._emit_associated(institution_id, record)
-        self._emit_roles(institution_id, record)
-        self._emit_repositories(institution_id, record)
-        self._emit_lineage(institution_id, record)
+        for step in self._steps:
+            step(institution_id, record)
 
     # ------------------------------------------------------------------
     def _emit_institution(self, institution_id: int, record: Dict[str, object]) -> None:
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..reference import EnumerationRegistry
 from ..identifiers import StableIdGenerator
 from ..utils import (
@@ -27,14 +27,22 @@ class PublisherTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_publisher, ("publisher",)),
+                (self._emit_alternative_names, ("publisher_alternative_name",)),
+                (self._emit_countries, ("publisher_country",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         publisher_id = numeric_openalex_id(record.get("id"))
         if publisher_id is None:
             return
-        self._emit_publisher(publisher_id, record)
-        self._emit_alternative_names(publisher_id, record)
-        self._emit_countries(publisher_id, record)
+        for step in self._steps:
+            step(publisher_id, record)
 
     # ------------------------------------------------------------------
     def _emit_publisher(self, publisher_id: int, record: Dict[str, object]) -> None:
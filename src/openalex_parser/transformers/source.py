@@ -4,7 +4,7 @@ from __future__ import annotations
 import re
 from typing import Dict
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..reference import EnumerationRegistry
 from ..identifiers import StableIdGenerator
 from ..utils import (
@@ -32,16 +32,24 @@ class SourceTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_source, ("source",)),
+                (self._emit_alternative_titles, ("source_alternative_title",)),
+                (self._emit_apc_prices, ("source_apc_price",)),
+                (self._emit_issn, ("source_issn",)),
+                (self._emit_societies, ("source_society",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         source_id = numeric_openalex_id(record.get("id"))
         if source_id is None:
             return
-        self._emit_source(source_id, record)
-        self._emit_alternative_titles(source_id, record)
-        self._emit_apc_prices(source_id, record)
-        self._emit_issn(source_id, record)
-        self._emit_societies(source_id, record)
+        for step in self._steps:
+            step(source_id, record)
 
     # ------------------------------------------------------------------
     def _emit_source(self, source_id: int, record: Dict[str, object]) -> None:
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..utils import (
     canonical_wikidata_id,
     numeric_openalex_id,
@@ -15,11 +15,25 @@ from ..utils import (
 class DomainTransformer:
     def __init__(self, emitter: TableEmitter) -> None:
         self._emitter = emitter
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_domain, ("domain",)),
+                (self._emit_alternative_names, ("domain_alternative_name",)),
+                (self._emit_fields, ("domain_field",)),
+                (self._emit_siblings, ("domain_sibling",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         domain_id = numeric_openalex_id(record.get("id"))
         if domain_id is None:
             return
+        for step in self._steps:
+            step(domain_id, record)
+
+    def _emit_domain(self, domain_id: int, record: Dict[str, object]) -> None:
         ids = record.get("ids") or {}
         wikidata_id = canonical_wikidata_id(ids.get("wikidata"))
         wikipedia_url = ids.get("wikipedia")
@@ -36,9 +50,6 @@ class DomainTransformer:
                 "created_date": parse_iso_date(record.get("created_date")),
             },
         )
-        self._emit_alternative_names(domain_id, record)
-        self._emit_fields(domain_id, record)
-        self._emit_siblings(domain_id, record)
 
     def _emit_alternative_names(self, domain_id: int, record: Dict[str, object]) -> None:
         names = record.get("display_name_alternatives") or []
@@ -96,11 +107,25 @@ class DomainTransformer:
 class FieldTransformer:
     def __init__(self, emitter: TableEmitter) -> None:
         self._emitter = emitter
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_field, ("field",)),
+                (self._emit_alternative_names, ("field_alternative_name",)),
+                (self._emit_subfields, ("field_subfield",)),
+                (self._emit_siblings, ("field_sibling",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         field_id = numeric_openalex_id(record.get("id"))
         if field_id is None:
             return
+        for step in self._steps:
+            step(field_id, record)
+
+    def _emit_field(self, field_id: int, record: Dict[str, object]) -> None:
         ids = record.get("ids") or {}
         domain = record.get("domain") or {}
         domain_id = numeric_openalex_id(domain.get("id"))
@@ -121,9 +146,6 @@ class FieldTransformer:
                 "created_date": parse_iso_date(record.get("created_date")),
             },
         )
-        self._emit_alternative_names(field_id, record)
-        self._emit_subfields(field_id, record)
-        self._emit_siblings(field_id, record)
 
     def _emit_alternative_names(self, field_id: int, record: Dict[str, object]) -> None:
         names = record.get("display_name_alternatives") or []
@@ -181,11 +203,25 @@ class FieldTransformer:
 class SubfieldTransformer:
     def __init__(self, emitter: TableEmitter) -> None:
         self._emitter = emitter
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_subfield, ("subfield",)),
+                (self._emit_alternative_names, ("subfield_alternative_name",)),
+                (self._emit_topics, ("subfield_topic",)),
+                (self._emit_siblings, ("subfield_sibling",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         subfield_id = numeric_openalex_id(record.get("id"))
         if subfield_id is None:
             return
+        for step in self._steps:
+            step(subfield_id, record)
+
+    def _emit_subfield(self, subfield_id: int, record: Dict[str, object]) -> None:
         ids = record.get("ids") or {}
         domain = record.get("domain") or {}
         field = record.get("field") or {}
@@ -209,9 +245,6 @@ class SubfieldTransformer:
                 "created_date": parse_iso_date(record.get("created_date")),
             },
         )
-        self._emit_alternative_names(subfield_id, record)
-        self._emit_topics(subfield_id, record)
-        self._emit_siblings(subfield_id, record)
 
     def _emit_alternative_names(self, subfield_id: int, record: Dict[str, object]) -> None:
         names = record.get("display_name_alternatives") or []
@@ -269,11 +302,24 @@ class SubfieldTransformer:
 class TopicTransformer:
     def __init__(self, emitter: TableEmitter) -> None:
         self._emitter = emitter
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_topic, ("topic",)),
+                (self._emit_keywords, ("topic_keyword",)),
+                (self._emit_siblings, ("topic_sibling",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         topic_id = numeric_openalex_id(record.get("id"))
         if topic_id is None:
             return
+        for step in self._steps:
+            step(topic_id, record)
+
+    def _emit_topic(self, topic_id: int, record: Dict[str, object]) -> None:
         domain = record.get("domain") or {}
         field = record.get("field") or {}
         subfield = record.get("subfield") or {}
@@ -296,8 +342,6 @@ class TopicTransformer:
                 "created_date": parse_iso_date(record.get("created_date")),
             },
         )
-        self._emit_keywords(topic_id, record)
-        self._emit_siblings(topic_id, record)
 
     def _emit_keywords(self, topic_id: int, record: Dict[str, object]) -> None:
         keywords = record.get("keywords") or []
@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-from ..emitter import TableEmitter
+from ..emitter import TableEmitter, wanted_steps
 from ..identifiers import StableIdGenerator
 from ..reference import EnumerationRegistry
 from ..utils import (
     bool_from_flag,
+    cached_numeric_openalex_id,
     canonical_openalex_id,
     extract_numeric_id,
     normalise_language_code,
     numeric_openalex_id,
+    numeric_openalex_ids,
     parse_iso_date,
     parse_iso_datetime,
     safe_int,
@@ -28,9 +31,7 @@ def _normalise_doi(value: Optional[str]) -> Optional[str]:
     return value
 
 
-def _abstract_from_inverted_index(index: Optional[Dict[str, Sequence[int]]]) -> Optional[str]:
-    if not index:
-        return None
+def _abstract_from_positions(index: Dict[str, Sequence[int]]) -> Optional[str]:
     reverse: Dict[int, str] = {}
     for token, positions in index.items():
         for position in positions:
@@ -41,6 +42,34 @@ def _abstract_from_inverted_index(index: Optional[Dict[str, Sequence[int]]]) ->
     return _normalise_text(text)
 
 
+def _abstract_from_inverted_index(index: Optional[Dict[str, Sequence[int]]]) -> Optional[str]:
+    """Rebuild an abstract from OpenAlex's ``{token: [positions]}`` inverted index.
+
+    Tokens are placed into a list sized by the largest position and the text
+    is whitespace-normalised once.  Unusual indexes (negative, non-integer or
+    very sparse positions) use the general sort-based rebuild; both give the
+    same text, with the last token winning a shared position.
+    """
+
+    if not index:
+        return None
+    try:
+        flat = list(chain.from_iterable(index.values()))
+        if not flat:
+            return None
+        highest = max(flat)
+        if min(flat) < 0 or highest >= 2 * len(flat) + 64:
+            return _abstract_from_positions(index)
+        words: List[Optional[str]] = [None] * (highest + 1)
+        for token, positions in index.items():
+            for position in positions:
+                words[position] = token
+    except (TypeError, ValueError, IndexError):
+        return _abstract_from_positions(index)
+    text = " ".join(filter(None, words))
+    return " ".join(text.split()) or None
+
+
 def _sdg_id_from_url(url: Optional[str]) -> Optional[int]:
     if not url:
         return None
@@ -58,9 +87,76 @@ def _normalise_text(value: Optional[str]) -> Optional[str]:
     return " ".join(tokens)
 
 
+class _Authorships:
+    """The authorships of one work with their affiliation strings normalised once.
+
+    ``affiliation_strings[i]`` holds the cleaned raw affiliation strings of
+    ``items[i]``; every distinct string is normalised only once per work.
+    """
+
+    __slots__ = ("items", "affiliation_strings", "_normalised")
+
+    def __init__(self, authorships: Sequence[Dict[str, object]]) -> None:
+        self.items = authorships
+        self._normalised: Dict[str, Optional[str]] = {}
+        self.affiliation_strings = [
+            self._extract_affiliation_strings(authorship) for authorship in authorships
+        ]
+
+    def normalise(self, value: Optional[str]) -> Optional[str]:
+        if value.__class__ is not str:
+            return _normalise_text(value)
+        try:
+            return self._normalised[value]
+        except KeyError:
+            normalised = self._normalised[value] = _normalise_text(value)
+            return normalised
+
+    def _extract_affiliation_strings(self, authorship: Dict[str, object]) -> List[str]:
+        raw_strings = authorship.get("raw_affiliation_strings") or []
+        cleaned = []
+        for value in raw_strings:
+            normalised = self.normalise(value)
+            if normalised:
+                cleaned.append(normalised)
+        if cleaned:
+            return cleaned
+        raw = authorship.get("raw_affiliation_string")
+        if raw:
+            parts = []
+            for part in raw.replace("\r", " ").replace("\n", " ").split(";"):
+                normalised = self.normalise(part)
+                if normalised:
+                    parts.append(normalised)
+            if parts:
+                return parts
+        return []
+
+    def affiliation_sequence(self) -> Dict[str, int]:
+        """Number the distinct affiliation strings of the work in order of appearance."""
+
+        affiliation_seq: Dict[str, int] = {}
+        for raw_list in self.affiliation_strings:
+            for raw in raw_list:
+                if raw not in affiliation_seq:
+                    affiliation_seq[raw] = len(affiliation_seq) + 1
+        return affiliation_seq
+
+
 class WorkTransformer:
     """Map OpenAlex work JSON documents to relational rows."""
 
+    # Auxiliary ID namespaces looked up through the StableIdGenerator.
+    NAMESPACES = ("keyword", "raw_affiliation_string", "raw_author_name")
+    AFFILIATION_TABLES = ("raw_affiliation_string", "work_affiliation")
+    AUTHOR_TABLES = (
+        "raw_author_name",
+        "work_author",
+        "work_author_affiliation",
+        "work_affiliation_institution",
+        "work_author_country",
+    )
+
     def __init__(
         self,
         emitter: TableEmitter,
@@ -70,28 +166,45 @@ class WorkTransformer:
         self._emitter = emitter
         self._enums = enums
         self._ids = id_generator
+        self._emits_affiliations = any(emitter.wants(table) for table in self.AFFILIATION_TABLES)
+        self._emits_authors = any(emitter.wants(table) for table in self.AUTHOR_TABLES)
+        # Derived values left unset when --drop-columns removes their column.
+        self._wants_work_doi = emitter.wants_column("work", "doi")
+        self._wants_detail_doi = emitter.wants_column("work_detail", "doi")
+        self._wants_author_et_al = emitter.wants_column("work_detail", "author_et_al")
+        self._wants_institution_et_al = emitter.wants_column("work_detail", "institution_et_al")
+        self._steps = wanted_steps(
+            emitter,
+            (
+                (self._emit_work, ("work",)),
+                (self._emit_work_title, ("work_title",)),
+                (self._emit_work_abstract, ("work_abstract",)),
+                (self._emit_work_concepts, ("work_concept",)),
+                (self._emit_work_topics, ("work_topic",)),
+                (
+                    self._emit_work_sustainable_development_goals,
+                    ("sustainable_development_goal", "work_sustainable_development_goal"),
+                ),
+                (self._emit_work_keywords, ("keyword", "work_keyword")),
+                (self._emit_work_mesh, ("mesh_descriptor", "mesh_qualifier", "work_mesh")),
+                (self._emit_work_locations, ("work_location",)),
+                (self._emit_work_authorships, self.AFFILIATION_TABLES + self.AUTHOR_TABLES),
+                (self._emit_work_data_sources, ("work_data_source",)),
+                (self._emit_work_grants, ("work_grant",)),
+                (self._emit_work_references, ("work_reference",)),
+                (self._emit_work_related, ("work_related",)),
+                # Work detail rows are populated downstream unless explicitly requested.
+                (self._emit_work_detail, ("work_detail",)),
+            ),
+        )
+        self.idle = not self._steps
 
     def transform(self, record: Dict[str, object]) -> None:
         work_id = numeric_openalex_id(record.get("id"))
         if work_id is None:
             return
-        self._emit_work(work_id, record)
-        self._emit_work_title(work_id, record)
-        self._emit_work_abstract(work_id, record)
-        self._emit_work_concepts(work_id, record)
-        self._emit_work_topics(work_id, record)
-        self._emit_work_sustainable_development_goals(work_id, record)
-        self._emit_work_keywords(work_id, record)
-        self._emit_work_mesh(work_id, record)
-        self._emit_work_locations(work_id, record)
-        affiliation_map = self._emit_work_affiliations(work_id, record)
-        self._emit_work_authors(work_id, record, affiliation_map)
-        self._emit_work_data_sources(work_id, record)
-        self._emit_work_grants(work_id, record)
-        self._emit_work_references(work_id, record)
-        self._emit_work_related(work_id, record)
-        # Work detail rows are populated downstream; skip emission during parsing.
-        # self._emit_work_detail(work_id, record)
+        for step in self._steps:
+            step(work_id, record)
 
     def _emit_work(self, work_id: int, record: Dict[str, object]) -> None:
         type_name = (record.get("type") or "other").replace("_", "-")
@@ -110,7 +223,7 @@ class WorkTransformer:
         )
 
         ids = record.get("ids") or {}
-        doi = _normalise_doi(ids.get("doi") or record.get("doi"))
+        doi = _normalise_doi(ids.get("doi") or record.get("doi")) if self._wants_work_doi else None
         mag_id = safe_int(ids.get("mag"))
         pmid = extract_numeric_id(ids.get("pmid"))
         pmcid = extract_numeric_id(ids.get("pmcid"))
@@ -190,7 +303,7 @@ class WorkTransformer:
     def _emit_work_concepts(self, work_id: int, record: Dict[str, object]) -> None:
         concepts = record.get("concepts") or []
         for idx, concept in enumerate(concepts, start=1):
-            concept_id = numeric_openalex_id(concept.get("id"))
+            concept_id = cached_numeric_openalex_id(concept.get("id"))
             if concept_id is None:
                 continue
             self._emitter.emit(
@@ -206,7 +319,7 @@ class WorkTransformer:
     def _emit_work_topics(self, work_id: int, record: Dict[str, object]) -> None:
         topics = record.get("topics") or []
         for idx, topic in enumerate(topics, start=1):
-            topic_id = numeric_openalex_id(topic.get("id"))
+            topic_id = cached_numeric_openalex_id(topic.get("id"))
             if topic_id is None:
                 continue
             self._emitter.emit(
@@ -318,39 +431,40 @@ class WorkTransformer:
                 },
             )
 
-    def _emit_work_affiliations(self, work_id: int, record: Dict[str, object]) -> Dict[str, int]:
-        affiliation_seq: Dict[str, int] = {}
-        authorships = record.get("authorships") or []
-        for authorship in authorships:
-            raw_list = self._extract_affiliation_strings(authorship)
-            for raw in raw_list:
-                if raw not in affiliation_seq:
-                    raw_id = self._ids.generate("raw_affiliation_string", raw, bits=40)
-                    seq = len(affiliation_seq) + 1
-                    affiliation_seq[raw] = seq
-                    self._emitter.emit(
-                        "raw_affiliation_string",
-                        {"raw_affiliation_string_id": raw_id, "raw_affiliation_string": raw},
-                    )
-                    self._emitter.emit(
-                        "work_affiliation",
-                        {"work_id": work_id, "affiliation_seq": seq, "raw_affiliation_string_id": raw_id},
-                    )
-        return affiliation_seq
+    def _emit_work_authorships(self, work_id: int, record: Dict[str, object]) -> None:
+        authorships = _Authorships(record.get("authorships") or [])
+        affiliation_seq = authorships.affiliation_sequence()
+        if self._emits_affiliations:
+            self._emit_work_affiliations(work_id, affiliation_seq)
+        if self._emits_authors:
+            self._emit_work_authors(work_id, authorships, affiliation_seq)
+
+    def _emit_work_affiliations(self, work_id: int, affiliation_seq: Dict[str, int]) -> None:
+        for raw, seq in affiliation_seq.items():
+            raw_id = self._ids.generate("raw_affiliation_string", raw, bits=40)
+            self._emitter.emit(
+                "raw_affiliation_string",
+                {"raw_affiliation_string_id": raw_id, "raw_affiliation_string": raw},
+            )
+            self._emitter.emit(
+                "work_affiliation",
+                {"work_id": work_id, "affiliation_seq": seq, "raw_affiliation_string_id": raw_id},
+            )
 
     def _emit_work_authors(
         self,
         work_id: int,
-        record: Dict[str, object],
+        authorships: _Authorships,
         affiliation_seq: Dict[str, int],
     ) -> None:
-        authorships = record.get("authorships") or []
-        inst_seen: Dict[int, List[int]] = defaultdict(list)
-        for idx, authorship in enumerate(authorships, start=1):
+        inst_seen: Dict[int, Set[int]] = defaultdict(set)
+        for idx, (authorship, raw_strings) in enumerate(
+            zip(authorships.items, authorships.affiliation_strings), start=1
+        ):
             author = authorship.get("author") or {}
             author_id = numeric_openalex_id(author.get("id"))
             raw_name_value = authorship.get("raw_author_name") or author.get("display_name")
-            normalised_raw_name = _normalise_text(raw_name_value)
+            normalised_raw_name = authorships.normalise(raw_name_value)
             raw_id = None
             if normalised_raw_name:
                 raw_id = self._ids.generate("raw_author_name", normalised_raw_name, bits=48)
@@ -372,7 +486,6 @@ class WorkTransformer:
                 },
             )
 
-            raw_strings = self._extract_affiliation_strings(authorship)
             for raw in raw_strings:
                 seq = affiliation_seq.get(raw)
                 if seq is None:
@@ -383,7 +496,7 @@ class WorkTransformer:
                 )
 
             self._emit_work_affiliation_institution_links(
-                work_id, authorship, affiliation_seq, inst_seen
+                work_id, authorship, raw_strings, affiliation_seq, inst_seen, authorships.normalise
             )
 
             countries = authorship.get("countries") or []
@@ -403,12 +516,14 @@ class WorkTransformer:
         self,
         work_id: int,
         authorship: Dict[str, object],
+        raw_strings: List[str],
         affiliation_seq: Dict[str, int],
-        inst_seen: Dict[int, List[int]],
+        inst_seen: Dict[int, Set[int]],
+        normalise: Callable[[Optional[str]], Optional[str]],
     ) -> None:
         emitted = False
         for affiliation in authorship.get("affiliations") or []:
-            raw_value = _normalise_text(affiliation.get("raw_affiliation_string"))
+            raw_value = normalise(affiliation.get("raw_affiliation_string"))
             if not raw_value:
                 continue
             seq = affiliation_seq.get(raw_value)
@@ -416,10 +531,10 @@ class WorkTransformer:
                 continue
             seen_for_seq = inst_seen[seq]
             for inst_ref in affiliation.get("institution_ids") or []:
-                inst_id = numeric_openalex_id(inst_ref)
+                inst_id = cached_numeric_openalex_id(inst_ref)
                 if inst_id is None or inst_id in seen_for_seq:
                     continue
-                seen_for_seq.append(inst_id)
+                seen_for_seq.add(inst_id)
                 self._emitter.emit(
                     "work_affiliation_institution",
                     {
@@ -437,7 +552,6 @@ class WorkTransformer:
         institutions = authorship.get("institutions") or []
         if not institutions:
             return
-        raw_strings = self._extract_affiliation_strings(authorship)
         pairs: List[Tuple[str, Dict[str, object]]] = []
         if raw_strings and len(raw_strings) == len(institutions):
             pairs = list(zip(raw_strings, institutions))
@@ -462,10 +576,10 @@ class WorkTransformer:
         for seq, inst_list in grouped.items():
             seen_for_seq = inst_seen[seq]
             for inst in inst_list:
-                inst_id = numeric_openalex_id(inst.get("id"))
+                inst_id = cached_numeric_openalex_id(inst.get("id"))
                 if inst_id is None or inst_id in seen_for_seq:
                     continue
-                seen_for_seq.append(inst_id)
+                seen_for_seq.add(inst_id)
                 self._emitter.emit(
                     "work_affiliation_institution",
                     {
@@ -511,7 +625,7 @@ class WorkTransformer:
     def _emit_work_grants(self, work_id: int, record: Dict[str, object]) -> None:
         grants = record.get("grants") or []
         for idx, grant in enumerate(grants, start=1):
-            funder_id = numeric_openalex_id(grant.get("funder"))
+            funder_id = cached_numeric_openalex_id(grant.get("funder"))
             self._emitter.emit(
                 "work_grant",
                 {
@@ -524,8 +638,7 @@ class WorkTransformer:
 
     def _emit_work_references(self, work_id: int, record: Dict[str, object]) -> None:
         references = record.get("referenced_works") or []
-        for idx, reference in enumerate(references, start=1):
-            cited_id = numeric_openalex_id(reference)
+        for idx, cited_id in enumerate(numeric_openalex_ids(references), start=1):
             self._emitter.emit(
                 "work_reference",
                 {"work_id": work_id, "reference_seq": idx, "cited_work_id": cited_id},
@@ -545,13 +658,13 @@ class WorkTransformer:
 
     def _emit_work_related(self, work_id: int, record: Dict[str, object]) -> None:
         related = record.get("related_works") or []
-        for idx, related_id in enumerate(related, start=1):
+        for idx, related_id in enumerate(numeric_openalex_ids(related), start=1):
             self._emitter.emit(
                 "work_related",
                 {
                     "work_id": work_id,
                     "related_work_seq": idx,
-                    "related_work_id": numeric_openalex_id(related_id),
+                    "related_work_id": related_id,
                 },
             )
 
@@ -566,14 +679,16 @@ class WorkTransformer:
                 first_author.get("raw_author_name")
                 or (first_author.get("author") or {}).get("display_name")
             )
-        other_names = [
-            auth.get("raw_author_name") or (auth.get("author") or {}).get("display_name")
-            for auth in other_authors
-            if auth.get("raw_author_name") or (auth.get("author") or {}).get("display_name")
-        ]
-        if len(other_names) > 4:
-            other_names = other_names[:3] + ["..."] + [other_names[-1]]
-        author_et_al = "; ".join(other_names)
+        author_et_al = None
+        if self._wants_author_et_al:
+            other_names = [
+                auth.get("raw_author_name") or (auth.get("author") or {}).get("display_name")
+                for auth in other_authors
+                if auth.get("raw_author_name") or (auth.get("author") or {}).get("display_name")
+            ]
+            if len(other_names) > 4:
+                other_names = other_names[:3] + ["..."] + [other_names[-1]]
+            author_et_al = "; ".join(other_names)
 
         first_institution = None
         institution_et_al = ""
@@ -581,7 +696,7 @@ class WorkTransformer:
             institutions = first_author.get("institutions") or []
             if institutions:
                 first_institution = institutions[0].get("display_name")
-                if len(institutions) > 1:
+                if len(institutions) > 1 and self._wants_institution_et_al:
                     institution_et_al = "; ".join(
                         filter(None, [inst.get("display_name") for inst in institutions[1:]])
                     )
@@ -595,55 +710,34 @@ class WorkTransformer:
 
         ids = record.get("ids") or {}
         title_value = _normalise_text(record.get("title") or record.get("display_name"))
-        # Work detail rows are generated downstream, so skip emitting them during parsing.
-        # self._emitter.emit(
-        #     "work_detail",
-        #     {
-        #         "work_id": work_id,
-        #         "author_first": author_first,
-        #         "author_et_al": author_et_al,
-        #         "institution_first": first_institution,
-        #         "institution_et_al": institution_et_al,
-        #         "title": title_value,
-        #         "source": ((record.get("primary_location") or {}).get("source") or {}).get("display_name"),
-        #         "pub_year": record.get("publication_year"),
-        #         "volume": biblio.get("volume"),
-        #         "issue": biblio.get("issue"),
-        #         "pages": pages,
-        #         "doi": _normalise_doi(ids.get("doi") or record.get("doi")),
-        #         "pmid": extract_numeric_id(ids.get("pmid")),
-        #         "work_type": record.get("type"),
-        #         "n_cits": record.get("cited_by_count"),
-        #         "n_self_cits": None,
-        #     },
-        # )
+        self._emitter.emit(
+            "work_detail",
+            {
+                "work_id": work_id,
+                "author_first": author_first,
+                "author_et_al": author_et_al,
+                "institution_first": first_institution,
+                "institution_et_al": institution_et_al,
+                "title": title_value,
+                "source": ((record.get("primary_location") or {}).get("source") or {}).get("display_name"),
+                "pub_year": record.get("publication_year"),
+                "volume": biblio.get("volume"),
+                "issue": biblio.get("issue"),
+                "pages": pages,
+                "doi": _normalise_doi(ids.get("doi") or record.get("doi")) if self._wants_detail_doi else None,
+                "pmid": extract_numeric_id(ids.get("pmid")),
+                "work_type": record.get("type"),
+                "n_cits": record.get("cited_by_count"),
+                "n_self_cits": None,  # filled in by WorkDetailBuilder
+            },
+        )
 
     @staticmethod
     def _extract_source_id(source: Optional[Dict[str, object]]) -> Optional[int]:
         if not source:
             return None
-        return numeric_openalex_id(source.get("id"))
+        return cached_numeric_openalex_id(source.get("id"))
 
-    @staticmethod
-    def _extract_affiliation_strings(authorship: Dict[str, object]) -> List[str]:
-        raw_strings = authorship.get("raw_affiliation_strings") or []
-        cleaned = []
-        for value in raw_strings:
-            normalised = _normalise_text(value)
-            if normalised:
-                cleaned.append(normalised)
-        if cleaned:
-            return cleaned
-        raw = authorship.get("raw_affiliation_string")
-        if raw:
-            parts = []
-            for part in raw.replace("\r", " ").replace("\n", " ").split(";"):
-                normalised = _normalise_text(part)
-                if normalised:
-                    parts.append(normalised)
-            if parts:
-                return parts
-        return []
 
 
 __all__ = ["WorkTransformer"]
@@ -2,10 +2,20 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
-from typing import Any, Mapping, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping, Optional
 
 ISO_DATE_FORMATS = ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]
+OPENALEX_URL_PREFIX = "https://openalex.org/"
+ID_CACHE_SIZE = 1 << 18
+DATE_CACHE_SIZE = 1 << 16
+
+_PREFIX_LENGTH = len(OPENALEX_URL_PREFIX)
+_DIGITS_OFFSET = _PREFIX_LENGTH + 1  # after the one-letter entity prefix
+_TRUE_STRINGS = frozenset({"true", "t", "1", "yes", "y", "on"})
+_FALSE_STRINGS = frozenset({"false", "f", "0", "no", "n", "off"})
 
 
 def canonical_openalex_id(identifier: Optional[str]) -> Optional[str]:
@@ -14,14 +24,12 @@ def canonical_openalex_id(identifier: Optional[str]) -> Optional[str]:
     if not identifier:
         return None
     identifier = identifier.strip()
-    if identifier.startswith("https://openalex.org/"):
-        identifier = identifier.split("/", maxsplit=3)[-1]
+    if identifier.startswith(OPENALEX_URL_PREFIX):
+        identifier = identifier[_PREFIX_LENGTH:]
     return identifier or None
 
 
-def numeric_openalex_id(identifier: Optional[str]) -> Optional[int]:
-    """Extract the numeric component from an OpenAlex identifier."""
-
+def _parse_numeric_openalex_id(identifier: Optional[str]) -> Optional[int]:
     short_id = canonical_openalex_id(identifier)
     if not short_id:
         return None
@@ -31,6 +39,47 @@ def numeric_openalex_id(identifier: Optional[str]) -> Optional[int]:
     return None
 
 
+def numeric_openalex_id(identifier: Optional[str]) -> Optional[int]:
+    """Extract the numeric component from an OpenAlex identifier.
+
+    URLs of the usual ``https://openalex.org/W123`` shape are sliced at a
+    fixed offset; anything else goes through the general parser.
+    """
+
+    if identifier.__class__ is str and identifier.startswith(OPENALEX_URL_PREFIX):
+        digits = identifier[_DIGITS_OFFSET:]
+        if digits.isdigit() and digits.isascii() and not identifier[_PREFIX_LENGTH].isdigit():
+            return int(digits)
+    return _parse_numeric_openalex_id(identifier)
+
+
+# For entity families whose IDs repeat across millions of records (institutions,
+# sources, concepts, topics, funders); works and authors rarely repeat and would
+# only churn the cache.
+cached_numeric_openalex_id = lru_cache(maxsize=ID_CACHE_SIZE)(numeric_openalex_id)
+
+
+def numeric_openalex_ids(identifiers: Iterable[Optional[str]]) -> List[Optional[int]]:
+    """Return :func:`numeric_openalex_id` of every identifier in *identifiers*."""
+
+    result: List[Optional[int]] = []
+    append = result.append
+    for identifier in identifiers:
+        if identifier.__class__ is str and identifier.startswith(OPENALEX_URL_PREFIX):
+            digits = identifier[_DIGITS_OFFSET:]
+            if digits.isdigit() and digits.isascii() and not identifier[_PREFIX_LENGTH].isdigit():
+                append(int(digits))
+                continue
+        append(_parse_numeric_openalex_id(identifier))
+    return result
+
+
+def collapse_whitespace(value: str) -> str:
+    """Collapse runs of whitespace (including tabs and newlines) into single spaces."""
+
+    return " ".join(value.split())
+
+
 def lookup_id(ids: Mapping[str, Any], key: str) -> Optional[str]:
     """Look up a value from an OpenAlex ids mapping in a safe way."""
 
@@ -42,11 +91,42 @@ def lookup_id(ids: Mapping[str, Any], key: str) -> Optional[str]:
     return str(value)
 
 
-def parse_iso_datetime(value: Optional[str]) -> Optional[str]:
-    """Coerce timestamps to ISO8601 date/time strings."""
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _checked_day(day: str) -> Optional[str]:
+    """Return *day* (``YYYY-MM-DD``) if it is a valid calendar date."""
 
-    if not value:
+    if not (day.isascii() and day[:4].isdigit() and day[5:7].isdigit() and day[8:].isdigit()):
+        return None
+    try:
+        date(int(day[:4]), int(day[5:7]), int(day[8:]))
+    except ValueError:
         return None
+    return day
+
+
+def _fast_iso_date(value: str) -> Optional[str]:
+    """Return the date of ``YYYY-MM-DD[THH:MM:SS[.ffffff]]`` values by slicing, or ``None`` for other shapes."""
+
+    length = len(value)
+    if length < 10 or value[4] != "-" or value[7] != "-":
+        return None
+    if length > 10:
+        if length < 19 or value[10] != "T" or value[13] != ":" or value[16] != ":":
+            return None
+        clock = value[11:13] + value[14:16] + value[17:19]
+        if not (clock.isascii() and clock.isdigit()):
+            return None
+        if clock[:2] > "23" or clock[2:4] > "59" or clock[4:] > "59":
+            return None
+        if length > 19:
+            fraction = value[20:]
+            if value[19] != "." or length > 26 or not (fraction.isascii() and fraction.isdigit()):
+                return None
+    return _checked_day(value[:10])
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_iso_datetime(value: str) -> str:
     for fmt in ISO_DATE_FORMATS:
         try:
             dt = datetime.strptime(value, fmt)
@@ -59,6 +139,23 @@ def parse_iso_datetime(value: Optional[str]) -> Optional[str]:
     return value
 
 
+def parse_iso_datetime(value: Optional[str]) -> Optional[str]:
+    """Coerce timestamps to ISO8601 date/time strings.
+
+    The usual OpenAlex shapes are validated and sliced directly; other values
+    go through ``strptime`` with :data:`ISO_DATE_FORMATS`, and are returned
+    unchanged when no format matches.
+    """
+
+    if not value:
+        return None
+    if value.__class__ is str:
+        parsed = _fast_iso_date(value)
+        if parsed is not None:
+            return parsed
+    return _parse_iso_datetime(value)
+
+
 def parse_iso_date(value: Optional[str]) -> Optional[str]:
     """Return YYYY-MM-DD if possible."""
 
@@ -146,15 +243,58 @@ def bool_from_flag(value: Any) -> Optional[bool]:
     return None
 
 
+def strict_int(value: Any) -> int:
+    """Return *value* as an ``int`` for a typed integer column.
+
+    Unlike ``int()``, fractional floats and decimals are rejected instead of
+    truncated; anything that is not integral raises ``ValueError``.
+    """
+
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Decimal) and value.is_finite() and value == value.to_integral_value():
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    raise ValueError(f"{value!r} is not an integer")
+
+
+def strict_bool(value: Any) -> bool:
+    """Return *value* as a ``bool`` for a typed boolean column.
+
+    Accepts booleans, 0 and 1, and the true/false spellings PostgreSQL
+    accepts; anything else raises ``ValueError`` instead of becoming False.
+    """
+
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
 __all__ = [
     "canonical_openalex_id",
     "numeric_openalex_id",
+    "cached_numeric_openalex_id",
+    "numeric_openalex_ids",
+    "collapse_whitespace",
     "lookup_id",
     "parse_iso_date",
     "parse_iso_datetime",
     "safe_int",
     "safe_float",
     "bool_from_flag",
+    "strict_bool",
+    "strict_int",
     "extract_numeric_id",
     "normalise_language_code",
 ]
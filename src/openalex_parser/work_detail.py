@@ -0,0 +1,117 @@
+"""In-process builder for the CWTS ``work_detail`` table."""
+from __future__ import annotations
+
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from .citation_graph import ensure_numpy_available, numpy
+from .citation_table import CitationTableBuilder
+
+WORK_DETAIL_TABLE = "work_detail"
+DEFAULT_BATCH_SIZE = 100_000
+
+
+class WorkDetailBuilder:
+    """Wrap the primary writer manager and hold ``work_detail`` rows back until the end of the run.
+
+    Every other table is forwarded to *primary* unchanged.  ``work_detail``
+    rows, which :class:`~openalex_parser.transformers.work.WorkTransformer`
+    emits without ``n_self_cits``, are pickled to disk in batches.  At
+    :meth:`close` the *citations* builder is closed first to obtain per-work
+    self-citation counts; the held rows are then written to *primary* with
+    ``n_self_cits`` set to the number of self-citations each work received
+    (0 when it received none), and *primary* is closed.
+    """
+
+    def __init__(
+        self,
+        primary,
+        work_dir: Path,
+        citations: CitationTableBuilder,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        ensure_numpy_available()
+        self._primary = primary
+        self._work_dir = work_dir
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+        self._citations = citations
+        self._batch_size = max(batch_size, 1)
+        self._columns: Optional[Tuple[str, ...]] = None
+        self._pending: List[tuple] = []
+        self._spill_path = self._work_dir / "work_detail.pickle"
+        self._spill = self._spill_path.open("wb")
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def write_row(self, table_name: str, row: Mapping[str, Any]) -> None:
+        if table_name != WORK_DETAIL_TABLE:
+            self._primary.write_row(table_name, row)
+            return
+        if self._columns is None:
+            self._columns = tuple(row)
+        self._pending.append(tuple(row.get(column) for column in self._columns))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+
+    def write_rows(self, table_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        for row in rows:
+            self.write_row(table_name, row)
+
+    def checkpoint(self) -> None:
+        self._primary.checkpoint()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._flush()
+            self._spill.close()
+            self._citations.close()
+            self._write_rows()
+        finally:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+            self._primary.close()
+
+    # ------------------------------------------------------------------
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pickle.dump(self._pending, self._spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self._pending = []
+
+    def _batches(self):
+        with self._spill_path.open("rb") as handle:
+            while True:
+                try:
+                    yield pickle.load(handle)
+                except EOFError:
+                    return
+
+    def _write_rows(self) -> None:
+        if self._columns is None:
+            return
+        counts = self._citations.self_citations or {}
+        counted_ids = counts.get("work_ids", numpy.empty(0, dtype=numpy.int64))
+        counted = counts.get("counts", numpy.empty(0, dtype=numpy.int64))
+        columns = self._columns
+        id_index = columns.index("work_id")
+        print("Writing work_detail rows with self-citation counts...")
+        for batch in self._batches():
+            work_ids = numpy.fromiter((values[id_index] for values in batch), dtype=numpy.int64, count=len(batch))
+            n_self_cits = numpy.zeros(len(batch), dtype=numpy.int64)
+            if len(counted_ids):
+                index = numpy.searchsorted(counted_ids, work_ids)
+                index[index >= len(counted_ids)] = 0
+                found = counted_ids[index] == work_ids
+                n_self_cits[found] = counted[index[found]]
+            for values, count in zip(batch, n_self_cits.tolist()):
+                row = dict(zip(columns, values))
+                row["n_self_cits"] = count
+                self._primary.write_row(WORK_DETAIL_TABLE, row)
+
+
+__all__ = ["WORK_DETAIL_TABLE", "WorkDetailBuilder"]
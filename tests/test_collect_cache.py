@@ -0,0 +1,48 @@
+"""Replaying collect-cache entries must reproduce every value a part file uses."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from openalex_parser.collect_cache import CollectCache
+from openalex_parser.id_catalog import IdCatalog
+from openalex_parser.reference import EnumerationConfig, EnumerationRegistry
+
+WORK_TYPE = EnumerationConfig("work_type", "work_type_id", "work_type", bits=15, reference_filename="work_type.csv")
+
+
+class _NullEmitter:
+    def emit(self, table, row):
+        return
+
+
+def _part_file(root: Path, updated_date: str) -> Path:
+    path = root / "works" / f"updated_date={updated_date}" / "part_000.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return path
+
+
+def _collect(cache: CollectCache, parts, values) -> IdCatalog:
+    catalog = IdCatalog([WORK_TYPE], [], collect_cache=cache)
+    registry = EnumerationRegistry(_NullEmitter(), collector=catalog.record_enum)
+    registry.register(WORK_TYPE)
+    for part in parts:
+        if not catalog.begin_input("works", part):
+            for value in values:
+                registry.id_for("work_type", value)
+            catalog.end_input("works", part)
+    return catalog
+
+
+def test_replayed_part_file_keeps_values_seen_in_earlier_files(tmp_path):
+    first = _part_file(tmp_path / "snapshot", "2024-01-01")
+    second = _part_file(tmp_path / "snapshot", "2024-01-02")
+    cache = CollectCache(tmp_path / "cache")
+    _collect(cache, [first, second], ["article", "book"]).finalize(tmp_path / "reference_full")
+
+    replay_cache = CollectCache(tmp_path / "cache")
+    catalog = _collect(replay_cache, [second], [])
+    catalog.finalize(tmp_path / "reference_second")
+
+    assert replay_cache.hits == 1
+    assert dict(catalog.enum_assignments["work_type"]) == {"article": 1, "book": 2}
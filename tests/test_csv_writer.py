@@ -0,0 +1,44 @@
+"""A failure on a threaded writer must surface on every later call and never lose other tables."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from openalex_parser.csv_writer import CsvWriterManager, ThreadedCsvTableWriter
+from openalex_parser.schema import ColumnDefinition, TableDefinition
+
+WORK = TableDefinition("work", [ColumnDefinition("work_id", "work_id int8 NOT NULL")])
+AUTHOR = TableDefinition("author", [ColumnDefinition("author_id", "author_id int8 NOT NULL")])
+
+
+class _FailingRow(dict):
+    def get(self, key, default=None):
+        raise RuntimeError("boom")
+
+
+def test_threaded_writer_keeps_its_error(tmp_path):
+    writer = ThreadedCsvTableWriter(WORK, tmp_path / "work.csv", batch_size=1)
+    writer.write_row(_FailingRow())
+    with pytest.raises(RuntimeError, match="boom"):
+        for work_id in range(100):
+            writer.write_row({"work_id": work_id})
+    with pytest.raises(RuntimeError, match="boom"):
+        writer.write_row({"work_id": 1})
+    with pytest.raises(RuntimeError, match="boom"):
+        writer.close()
+    assert not writer._thread.is_alive()
+    with pytest.raises(RuntimeError, match="boom"):
+        writer.close()
+
+
+def test_manager_closes_every_writer_and_writes_the_manifest(tmp_path):
+    manager = CsvWriterManager({"work": WORK, "author": AUTHOR}, tmp_path, threaded_tables=("work",))
+    manager.write_row("work", _FailingRow())
+    manager.write_row("author", {"author_id": 7})
+    with pytest.raises(RuntimeError, match="boom"):
+        manager.close()
+
+    assert (tmp_path / "author.csv").read_text(encoding="utf-8").splitlines() == ["author_id", "7"]
+    manifest = json.loads(manager.manifest_path.read_text(encoding="utf-8"))
+    assert sorted(manifest["tables"]) == ["author"]
@@ -0,0 +1,49 @@
+"""Append mode: which partial catalogs need a collect pass, and extending them keeps existing IDs."""
+from __future__ import annotations
+
+from openalex_parser.id_catalog import IdCatalog, NamespaceConfig
+from openalex_parser.reference import EnumerationConfig
+
+WORK_TYPE = EnumerationConfig("work_type", "work_type_id", "work_type", bits=15, reference_filename="work_type.csv")
+KEYWORD = NamespaceConfig("keyword", "keyword_ids.csv", "keyword_id", "keyword")
+
+
+def test_append_mode_collects_and_extends_a_partial_catalog(tmp_path):
+    reference_dir = tmp_path / "reference"
+    reference_dir.mkdir()
+    (reference_dir / "work_type.csv").write_text("work_type_id\twork_type\n1\tbook\n", encoding="utf-8")
+
+    catalog = IdCatalog([WORK_TYPE], [KEYWORD], append=True)
+    # The keyword TSV is missing, so the catalog must be collected instead of being loaded as is.
+    assert not catalog.load_existing(reference_dir, {"keyword"})
+
+    for value in ("article", "book"):
+        catalog.record_enum("work_type", value)
+    catalog.record_namespace("keyword", "graphs")
+    catalog.finalize(reference_dir)
+
+    assert dict(catalog.enum_assignments["work_type"]) == {"book": 1, "article": 2}
+    assert dict(catalog.namespace_assignments["keyword"]) == {"graphs": 1}
+    assert (reference_dir / "work_type.csv").read_text(encoding="utf-8").splitlines() == [
+        "work_type_id\twork_type",
+        "1\tbook",
+        "2\tarticle",
+    ]
+
+    reloaded = IdCatalog([WORK_TYPE], [KEYWORD], append=True)
+    assert reloaded.load_existing(reference_dir, {"keyword"})
+    assert dict(reloaded.enum_assignments["work_type"]) == {"book": 1, "article": 2}
+
+
+def test_append_mode_skips_collect_when_only_enumerations_are_missing(tmp_path):
+    reference_dir = tmp_path / "reference"
+    catalog = IdCatalog([WORK_TYPE], [KEYWORD], append=True)
+    assert not catalog.load_existing(reference_dir, {"keyword"}, allow_missing_enums=True)
+    assert catalog.load_existing(reference_dir, set(), allow_missing_enums=True)
+
+    assert catalog.append_enum("work_type", "article") == 1
+    catalog.close()
+    assert (reference_dir / "work_type.csv").read_text(encoding="utf-8").splitlines() == [
+        "work_type_id\twork_type",
+        "1\tarticle",
+    ]
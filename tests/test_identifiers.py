@@ -0,0 +1,54 @@
+"""Hashed namespace IDs: order independence and collision detection across workers."""
+from __future__ import annotations
+
+import csv
+from collections import defaultdict
+
+from openalex_parser.identifiers import HashedNamespaceIds, find_hashed_collisions
+
+VALUES = [f"value {index}" for index in range(40)]
+
+
+def test_ids_depend_only_on_the_value():
+    forward = HashedNamespaceIds(["keyword"], bits={"keyword": 8})
+    backward = HashedNamespaceIds(["keyword"], bits={"keyword": 8})
+    ids = {value: forward.id_for("keyword", value) for value in VALUES}
+
+    assert {value: backward.id_for("keyword", value) for value in reversed(VALUES)} == ids
+    assert all(0 < identifier < 1 << 8 for identifier in ids.values())
+
+
+def test_collisions_are_found_across_workers(tmp_path):
+    run_dir = tmp_path / "runs"
+    ids = {}
+    for half in (VALUES[::2], VALUES[1::2]):
+        worker = HashedNamespaceIds(["keyword"], bits={"keyword": 8}, run_dir=run_dir, run_size=3)
+        for value in half + half:
+            ids[value] = worker.id_for("keyword", value)
+        worker.close()
+    expected = defaultdict(set)
+    for value, identifier in ids.items():
+        expected[identifier].add(value)
+    expected = {identifier: values for identifier, values in expected.items() if len(values) > 1}
+    assert expected
+
+    path = tmp_path / "collisions.tsv"
+    assert find_hashed_collisions(run_dir, path) == len(expected)
+    found = defaultdict(set)
+    with path.open(encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle, delimiter="\t"):
+            assert row["namespace"] == "keyword"
+            found[int(row["hashed_id"])].add(row["value"])
+    assert found == expected
+    assert not run_dir.exists()
+
+
+def test_no_collision_file_without_collisions(tmp_path):
+    run_dir = tmp_path / "runs"
+    hashed = HashedNamespaceIds(["keyword"], run_dir=run_dir)
+    for value in VALUES:
+        hashed.id_for("keyword", value)
+    hashed.close()
+
+    assert find_hashed_collisions(run_dir, tmp_path / "collisions.tsv") == 0
+    assert not (tmp_path / "collisions.tsv").exists()
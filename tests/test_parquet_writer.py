@@ -0,0 +1,53 @@
+"""Parquet columns must hold the input values exactly or fail naming the column."""
+from __future__ import annotations
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.parquet  # noqa: E402
+
+from openalex_parser.parquet_writer import ParquetTableWriter  # noqa: E402
+from openalex_parser.schema import ColumnDefinition, TableDefinition  # noqa: E402
+
+WORK = TableDefinition(
+    "work",
+    [
+        ColumnDefinition("work_id", "work_id int8 NOT NULL"),
+        ColumnDefinition("volume", "volume int2 NULL"),
+        ColumnDefinition("is_retracted", "is_retracted bool NULL"),
+    ],
+)
+
+
+def _write(path, rows):
+    with ParquetTableWriter(WORK, path) as writer:
+        writer.write_rows(rows)
+    return pyarrow.parquet.read_table(path).to_pylist()
+
+
+def test_integral_values_and_known_flags_are_written(tmp_path):
+    rows = [
+        {"work_id": 1, "volume": 3, "is_retracted": True},
+        {"work_id": "2", "volume": 4.0, "is_retracted": "f"},
+        {"work_id": 3, "volume": "", "is_retracted": None},
+    ]
+    assert _write(tmp_path / "work.parquet", rows) == [
+        {"work_id": 1, "volume": 3, "is_retracted": True},
+        {"work_id": 2, "volume": 4, "is_retracted": False},
+        {"work_id": 3, "volume": None, "is_retracted": None},
+    ]
+
+
+@pytest.mark.parametrize(
+    "row, column",
+    [
+        ({"work_id": 7.5}, "work_id"),
+        ({"work_id": "7.0"}, "work_id"),
+        ({"work_id": 1, "volume": 1 << 20}, "volume"),
+        ({"work_id": 1, "is_retracted": "maybe"}, "is_retracted"),
+        ({"work_id": 1, "is_retracted": 2}, "is_retracted"),
+    ],
+)
+def test_invalid_values_raise_naming_the_column(tmp_path, row, column):
+    with pytest.raises(ValueError, match=f"work.{column}"):
+        _write(tmp_path / "work.parquet", [row])
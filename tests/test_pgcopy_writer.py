@@ -0,0 +1,42 @@
+"""Binary COPY encoding must reject values that COPY of the CSV output would reject."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from openalex_parser.pgcopy_writer import PgCopyRowEncoder
+from openalex_parser.schema import ColumnDefinition, TableDefinition
+
+WORK = TableDefinition(
+    "work",
+    [
+        ColumnDefinition("work_id", "work_id int8 NOT NULL"),
+        ColumnDefinition("volume", "volume int2 NULL"),
+        ColumnDefinition("is_retracted", "is_retracted bool NULL"),
+    ],
+)
+
+
+def test_integral_values_and_known_flags_are_encoded():
+    encoder = PgCopyRowEncoder(WORK)
+    expected = encoder.encode({"work_id": 7, "volume": 3, "is_retracted": True})
+
+    assert encoder.encode({"work_id": "7", "volume": 3.0, "is_retracted": "t"}) == expected
+    assert encoder.encode({"work_id": Decimal("7"), "volume": "3", "is_retracted": 1}) == expected
+
+
+@pytest.mark.parametrize(
+    "row, column",
+    [
+        ({"work_id": 7.5}, "work_id"),
+        ({"work_id": Decimal("7.5")}, "work_id"),
+        ({"work_id": "7.0"}, "work_id"),
+        ({"work_id": 1, "volume": 1 << 20}, "volume"),
+        ({"work_id": 1, "is_retracted": "maybe"}, "is_retracted"),
+        ({"work_id": 1, "is_retracted": 2}, "is_retracted"),
+    ],
+)
+def test_invalid_values_raise_naming_the_column(row, column):
+    with pytest.raises(ValueError, match=f"work.{column}"):
+        PgCopyRowEncoder(WORK).encode(row)
@@ -0,0 +1,201 @@
+"""Streaming into PostgreSQL must load exactly what the CSV output holds.
+
+These tests need a throwaway server: set ``OPENALEX_PARSER_TEST_PG_DSN`` to a
+DSN whose user may create databases (e.g. ``host=localhost user=postgres``).
+Each test creates its own databases and drops them afterwards.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+DSN = os.environ.get("OPENALEX_PARSER_TEST_PG_DSN")
+if not DSN:
+    pytest.skip("OPENALEX_PARSER_TEST_PG_DSN is not set", allow_module_level=True)
+psycopg = pytest.importorskip("psycopg")
+from psycopg.conninfo import make_conninfo  # noqa: E402
+
+from openalex_parser.cli import main  # noqa: E402
+from openalex_parser.postgres_loader import PostgresWriterManager  # noqa: E402
+from openalex_parser.schema import ColumnDefinition, TableDefinition, load_schema  # noqa: E402
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "data" / "reference" / "openalex_cwts_schema.sql"
+
+
+@pytest.fixture
+def databases():
+    """Return a factory of empty UTF-8 databases, dropped at teardown."""
+
+    created = []
+
+    def create() -> str:
+        name = f"openalex_test_{uuid.uuid4().hex[:12]}"
+        with psycopg.connect(DSN, autocommit=True) as connection:
+            connection.execute(f"CREATE DATABASE {name} TEMPLATE template0 ENCODING 'UTF8'")
+        created.append(name)
+        return make_conninfo(DSN, dbname=name)
+
+    yield create
+    with psycopg.connect(DSN, autocommit=True) as connection:
+        for name in created:
+            connection.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+
+
+def _write_part(root: Path, entity: str, records) -> None:
+    directory = root / entity / "updated_date=2024-01-01"
+    directory.mkdir(parents=True, exist_ok=True)
+    with gzip.open(directory / "part_000.gz", "wt", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+
+
+def _work(index: int) -> dict:
+    institution = {"id": f"https://openalex.org/I{100 + index % 3}", "display_name": f"Inst {index % 3}"}
+    raw_affiliation = f"Dept {index % 4}, Univ {index % 2}"
+    source = {"id": f"https://openalex.org/S{1 + index % 2}", "display_name": "Journal", "is_in_doaj": index % 2 == 0}
+    location = {
+        "source": source,
+        "landing_page_url": f"https://example.org/{index}",
+        "pdf_url": f"https://example.org/{index}.pdf",
+        "version": "publishedVersion",
+        "license": "cc-by",
+        "is_oa": True,
+    }
+    return {
+        "id": f"https://openalex.org/W{index}",
+        "doi": f"https://doi.org/10.1/{index}",
+        "title": f"Title  {index}",
+        "display_name": f"Title {index}",
+        "publication_year": 2000 + index,
+        "publication_date": f"{2000 + index}-01-1{index % 9}",
+        "type": "article" if index % 2 else "book-chapter",
+        "language": "en",
+        "primary_location": location,
+        "best_oa_location": location,
+        "locations": [location],
+        "open_access": {"is_oa": True, "oa_status": "gold", "oa_url": "https://oa", "any_repository_has_fulltext": False},
+        "authorships": [
+            {
+                "author_position": "first",
+                "author": {"id": f"https://openalex.org/A{index % 5}", "display_name": f"Author {index % 5}"},
+                "raw_author_name": f"Author\t{index % 5}",
+                "is_corresponding": True,
+                "institutions": [institution],
+                "countries": ["NL"],
+                "raw_affiliation_strings": [raw_affiliation],
+                "affiliations": [{"raw_affiliation_string": raw_affiliation, "institution_ids": [institution["id"]]}],
+            }
+        ],
+        "biblio": {"volume": "1", "issue": "2", "first_page": "10", "last_page": None},
+        "is_retracted": False,
+        "is_paratext": False,
+        "keywords": [{"keyword": f"keyword {index % 3}", "score": 0.3}],
+        "concepts": [{"id": "https://openalex.org/C1", "score": 0.5}],
+        "referenced_works": [f"https://openalex.org/W{other}" for other in range(1, index)],
+        "abstract_inverted_index": {"An": [0], "abstract": [1]},
+        "cited_by_count": index,
+        "updated_date": "2024-05-01T12:00:00.123456",
+        "created_date": "2020-01-01",
+    }
+
+
+@pytest.fixture(scope="module")
+def snapshot(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("snapshot") / "data"
+    _write_part(root, "works", [_work(index) for index in range(1, 13)])
+    _write_part(
+        root,
+        "institutions",
+        [
+            {"id": f"https://openalex.org/I{100 + index}", "display_name": f"Inst {index}", "type": "education"}
+            for index in range(3)
+        ],
+    )
+    return root
+
+
+def _run(snapshot: Path, output_dir: Path, *options: str) -> None:
+    arguments = ["--entity", "works", "--entity", "institutions", "--snapshot", str(snapshot)]
+    arguments += ["--schema", str(SCHEMA_PATH), "--output-dir", str(output_dir)]
+    assert main(arguments + list(options)) == 0
+
+
+def _load_csv(dsn: str, csv_dir: Path, tables) -> None:
+    with psycopg.connect(dsn) as connection:
+        for table in tables:
+            path = csv_dir / f"{table.name}.csv"
+            connection.execute(table.create_statement(with_constraints=False))
+            if not path.exists():
+                continue
+            columns = ", ".join(f'"{name}"' for name in table.column_names)
+            options = "FORMAT csv, HEADER true, DELIMITER E'\\t'"
+            with connection.cursor().copy(f"COPY {table.qualified_name} ({columns}) FROM STDIN WITH ({options})") as copy:
+                copy.write(path.read_bytes())
+
+
+def _contents(dsn: str, tables):
+    with psycopg.connect(dsn) as connection:
+        return {
+            table.name: sorted(map(repr, connection.execute(f"SELECT * FROM {table.qualified_name}").fetchall()))
+            for table in tables
+        }
+
+
+@pytest.mark.parametrize(
+    "options",
+    [(), ("--pg-create-tables",), ("--pg-create-tables", "--pg-unlogged")],
+    ids=["existing-tables", "create-tables", "unlogged"],
+)
+def test_postgres_output_matches_the_csv_output(tmp_path, snapshot, databases, options):
+    tables = list(load_schema(SCHEMA_PATH).values())
+    reference_dir = tmp_path / "reference"
+    _run(snapshot, tmp_path / "csv", "--reference-dir", str(reference_dir))
+    expected_dsn = databases()
+    _load_csv(expected_dsn, tmp_path / "csv", tables)
+
+    dsn = databases()
+    if "--pg-create-tables" not in options:
+        with psycopg.connect(dsn) as connection:
+            for table in tables:
+                connection.execute(table.create_statement())
+    _run(
+        snapshot,
+        tmp_path / "postgres",
+        "--reference-dir",
+        str(reference_dir),
+        "--output-format",
+        "postgres",
+        "--pg-dsn",
+        dsn,
+        "--pg-pool-size",
+        "2",
+        *options,
+    )
+
+    expected = _contents(expected_dsn, tables)
+    assert any(expected[name] for name in ("work", "work_author", "work_reference", "institution"))
+    assert _contents(dsn, tables) == expected
+    with psycopg.connect(dsn) as connection:
+        persistence = connection.execute("SELECT relpersistence FROM pg_class WHERE relname = 'work'").fetchone()[0]
+        indexes = connection.execute("SELECT count(*) FROM pg_indexes WHERE tablename = 'work'").fetchone()[0]
+    assert persistence == ("u" if "--pg-unlogged" in options else "p")
+    assert indexes > 0
+
+
+def test_failed_copy_refuses_further_writes(databases):
+    missing = TableDefinition("missing_table", [ColumnDefinition("missing_id", "missing_id int8 NOT NULL")])
+    manager = PostgresWriterManager({"missing_table": missing}, databases(), dedicated_tables=())
+    manager.write_row("missing_table", {"missing_id": 1})
+    with pytest.raises(psycopg.errors.UndefinedTable):
+        manager.checkpoint()
+    manager.write_row("missing_table", {"missing_id": 2})
+    with pytest.raises(psycopg.errors.UndefinedTable):
+        manager.checkpoint()
+    with pytest.raises(psycopg.errors.UndefinedTable):
+        manager.close()
+    assert not manager._connections()
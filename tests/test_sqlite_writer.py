@@ -0,0 +1,35 @@
+"""The SQLite backend must fail when duplicate keys prevent a unique index."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from openalex_parser.schema import ColumnDefinition, TableDefinition
+from openalex_parser.sqlite_writer import SqliteWriterManager
+
+WORK = TableDefinition(
+    "work",
+    [ColumnDefinition("work_id", "work_id int8 NOT NULL")],
+    constraints=["CONSTRAINT work_pkey PRIMARY KEY (work_id)"],
+)
+
+
+def test_duplicate_keys_fail_at_close(tmp_path):
+    manager = SqliteWriterManager({"work": WORK}, tmp_path / "openalex.sqlite")
+    manager.write_rows("work", [{"work_id": 1}, {"work_id": 1}])
+    with pytest.raises(sqlite3.IntegrityError, match="work_pkey"):
+        manager.close()
+
+    with sqlite3.connect(tmp_path / "openalex.sqlite") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM work").fetchone() == (2,)
+
+
+def test_unique_keys_build_the_index(tmp_path):
+    manager = SqliteWriterManager({"work": WORK}, tmp_path / "openalex.sqlite")
+    manager.write_rows("work", [{"work_id": 1}, {"work_id": 2}])
+    manager.close()
+
+    with sqlite3.connect(tmp_path / "openalex.sqlite") as connection:
+        indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "work_pkey" in indexes